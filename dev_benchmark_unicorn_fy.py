@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# File: dev_benchmark_unicorn_fy.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# Author: Oliver Zehentleitner
+#         https://about.me/oliver-zehentleitner
+#
+# Copyright (c) 2019-2020, Oliver Zehentleitner
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+
+from unicorn_fy.unicorn_fy import UnicornFy
+from unicorn_fy.unicorn_fy_bars import UnicornFyBarAggregator
+from unicorn_fy.unicorn_fy_conflation import UnicornFyConflationBuffer
+from unicorn_fy.unicorn_fy_precision import UnicornFyPrecision
+from unicorn_fy.unicorn_fy_schema import BINANCE_CONVERTERS, BINANCE_SCHEMAS
+from unicorn_fy.unicorn_fy_shared_memory import UnicornFySharedRingBuffer, UnicornFySharedRingBufferReader
+from unicorn_fy.unicorn_fy_sniffer import UnicornFySniffer
+from unicorn_fy.unicorn_fy_ticker_table import UnicornFyTickerTable
+import json
+import pickle
+import timeit
+import tracemalloc
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+rounds = 100000
+
+trade = '{"stream":"btcusdt@trade","data":{"e":"trade","E":1592591955766,"s":"BTCUSDT","t":343719861,' \
+        '"p":"9302.00000000","q":"0.00101900","b":2517144287,"a":2517144235,"T":1592591955765,"m":false,"M":true}}'
+execution_report = '{"e":"executionReport","E":1499405658658,"s":"ETHBTC","c":"mUvoqJxFIILMdfAW5iGSOW","S":"BUY",' \
+                   '"o":"LIMIT","f":"GTC","q":"1.00000000","p":"0.10264410","P":"0.00000000","F":"0.00000000",' \
+                   '"g":-1,"C":"","x":"NEW","X":"NEW","r":"NONE","i":4293153,"l":"0.00000000",' \
+                   '"z":"0.00000000","L":"0.00000000","n":"0","N":null,"T":1499405658657,"t":-1,"I":8641984,' \
+                   '"w":true,"m":false,"M":false,"O":1499405658657,"Z":"0.00000000","Y":"0.00000000",' \
+                   '"Q":"0.00000000"}'
+messages = {'trade': trade,
+            'executionReport': execution_report}
+
+
+def double_parse(stream_data_json):
+    # the way it was done before: `is_json()` decodes the message and throws the result away
+    if UnicornFy.is_json(stream_data_json) is False:
+        return stream_data_json
+    return UnicornFy.unicorn_fy(json.loads(stream_data_json))
+
+
+def print_result(title, seconds):
+    print(f"{title:<45} {seconds / rounds * 1000000:8.3f} µs/msg")
+
+
+for event_type, message in messages.items():
+    print(f"\n{event_type}:")
+    print_result("double parse (is_json + json.loads)", timeit.timeit(lambda: double_parse(message), number=rounds))
+    print_result("single parse (binance_com_websocket)",
+                 timeit.timeit(lambda: UnicornFy.binance_com_websocket(message), number=rounds))
+    print_result("single parse from bytes (unicorn_fy)",
+                 timeit.timeit(lambda: UnicornFy.unicorn_fy(message.encode()), number=rounds))
+
+print("\njson backends (executionReport):")
+for json_backend in UnicornFy.get_installed_json_backends():
+    unicorn_fy = UnicornFy(json_backend=json_backend)
+    print_result(json_backend, timeit.timeit(lambda: unicorn_fy.binance_com_websocket(execution_report),
+                                             number=rounds))
+
+print("\nconversion of the decoded executionReport:")
+decoded_execution_report = {'data': json.loads(execution_report)}
+print_result("schema interpreter", timeit.timeit(lambda: BINANCE_SCHEMAS['executionReport'].convert(
+    decoded_execution_report), number=rounds))
+print_result("compiled converter", timeit.timeit(lambda: BINANCE_CONVERTERS['executionReport'](
+    decoded_execution_report), number=rounds))
+
+print("\nbatch of 500 trade messages:")
+batch = [trade] * 500
+print_result("binance_com_websocket() in a loop", timeit.timeit(
+    lambda: [UnicornFy.binance_com_websocket(message) for message in batch], number=rounds // 500))
+print_result("binance_com_websocket_batch()", timeit.timeit(
+    lambda: UnicornFy.binance_com_websocket_batch(batch), number=rounds // 500))
+
+print("\nunwanted trade messages of ETHUSDT:")
+eth_trade = trade.replace("btcusdt", "ethusdt").replace("BTCUSDT", "ETHUSDT")
+sniffing_unicorn_fy = UnicornFy(sniffer=UnicornFySniffer(symbols=["BTCUSDT"]))
+print_result("convert and filter afterwards", timeit.timeit(
+    lambda: UnicornFy.binance_com_websocket(eth_trade)['symbol'] == "BTCUSDT", number=rounds))
+print_result("drop with the sniffer", timeit.timeit(
+    lambda: sniffing_unicorn_fy.binance_com_websocket(eth_trade), number=rounds))
+
+print("\nfield projection (executionReport):")
+projection = {'executionReport': ['symbol', 'order_price', 'order_quantity', 'current_order_status']}
+print_result("all 32 fields", timeit.timeit(lambda: UnicornFy.binance_com_websocket(execution_report),
+                                            number=rounds))
+print_result("4 fields", timeit.timeit(lambda: UnicornFy.binance_com_websocket(execution_report, fields=projection),
+                                       number=rounds))
+print_result("4 fields, batch of 500", timeit.timeit(
+    lambda: UnicornFy.binance_com_websocket_batch([execution_report] * 500, fields=projection),
+    number=rounds // 500))
+
+print("\noutput formats (executionReport):")
+view_unicorn_fy = UnicornFy(output="view")
+record_unicorn_fy = UnicornFy(output="record")
+print_result("dict", timeit.timeit(lambda: UnicornFy.binance_com_websocket(execution_report)['order_price'],
+                                   number=rounds))
+print_result("view", timeit.timeit(lambda: view_unicorn_fy.binance_com_websocket(execution_report)['order_price'],
+                                   number=rounds))
+print_result("record", timeit.timeit(lambda: record_unicorn_fy.binance_com_websocket(execution_report).order_price,
+                                     number=rounds))
+
+print("\nmemory of 100 converted `!ticker@arr` messages with 200 symbols each:")
+ticker = {"e": "24hrTicker", "E": 1592593727005, "s": "BTCUSDT", "p": "-65.00000000", "P": "-0.693",
+          "w": "9343.29777965", "x": "9366.22000000", "c": "9301.22000000", "Q": "0.04185100", "b": "9301.21000000",
+          "B": "0.30123900", "a": "9301.22000000", "A": "0.10000000", "o": "9366.22000000", "h": "9450.00000000",
+          "l": "9231.90000000", "v": "46780.16779000", "q": "437085697.72451722", "O": 1592507327000,
+          "C": 1592593727000, "F": 343472373, "L": 343722012, "n": 249640}
+ticker_arr = json.dumps({"stream": "!ticker@arr", "data": [dict(ticker, s=f"SYMBOL{index}") for index in range(200)]})
+for output in UnicornFy.OUTPUTS:
+    unicorn_fy = UnicornFy(output=output)
+    tracemalloc.start()
+    unicorn_fied_tickers = [unicorn_fy.binance_com_websocket(ticker_arr) for _ in range(100)]
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del unicorn_fied_tickers
+    print(f"{output:<45} {size / 1024 / 1024:8.3f} MiB")
+
+print("\nbatch of 500 trade messages into numpy columns:")
+if numpy is None:
+    print("numpy is not installed")
+else:
+    def columns_from_dicts(messages):
+        unicorn_fied_batch = UnicornFy.binance_com_websocket_batch(messages)[0]
+        return {'event_time': numpy.array([data['event_time'] for data in unicorn_fied_batch], dtype='datetime64[ms]'),
+                'price': numpy.array([float(data['price']) for data in unicorn_fied_batch]),
+                'quantity': numpy.array([float(data['quantity']) for data in unicorn_fied_batch])}
+
+    print_result("3 columns from binance_com_websocket_batch()", timeit.timeit(lambda: columns_from_dicts(batch),
+                                                                               number=rounds // 500))
+    print_result("9 columns from unicorn_fy_columns()", timeit.timeit(lambda: UnicornFy.unicorn_fy_columns(batch),
+                                                       number=rounds // 500))
+
+print("\nprices and quantities as numbers (executionReport):")
+float_unicorn_fy = UnicornFy(numeric="float")
+decimal_unicorn_fy = UnicornFy(numeric="decimal")
+scaled_unicorn_fy = UnicornFy(precision=UnicornFyPrecision({'ETHBTC': ("0.00000001", "0.00100000")}))
+print_result("str output + float() by the consumer", timeit.timeit(
+    lambda: float(UnicornFy.binance_com_websocket(execution_report)['order_price']), number=rounds))
+print_result("numeric='float'", timeit.timeit(
+    lambda: float_unicorn_fy.binance_com_websocket(execution_report)['order_price'], number=rounds))
+print_result("numeric='decimal'", timeit.timeit(
+    lambda: decimal_unicorn_fy.binance_com_websocket(execution_report)['order_price'], number=rounds))
+print_result("precision (scaled integers)", timeit.timeit(
+    lambda: scaled_unicorn_fy.binance_com_websocket(execution_report)['order_price'], number=rounds))
+
+print("\norder book levels (depthUpdate with 2x 100 levels):")
+if numpy is None:
+    print("numpy is not installed")
+else:
+    depth_update = json.dumps({'stream': "btcusdt@depth@100ms",
+                               'data': {'e': "depthUpdate", 'E': 1592591955766, 's': "BTCUSDT", 'U': 4716432290,
+                                        'u': 4716432296,
+                                        'b': [[f"{9300 - level / 100:.8f}", f"{level / 1000:.8f}"]
+                                              for level in range(100)],
+                                        'a': [[f"{9301 + level / 100:.8f}", f"{level / 1000:.8f}"]
+                                              for level in range(100)]}})
+    float_levels_unicorn_fy = UnicornFy(numeric="float")
+    numpy_levels_unicorn_fy = UnicornFy(levels="numpy")
+    print_result("numpy.array() of the float() parsed levels", timeit.timeit(
+        lambda: numpy.array(float_levels_unicorn_fy.binance_com_websocket(depth_update)['bids']),
+        number=rounds // 10) * 10)
+    print_result("levels='numpy'", timeit.timeit(
+        lambda: numpy_levels_unicorn_fy.binance_com_websocket(depth_update)['bids'], number=rounds // 10) * 10)
+
+print("\n`!ticker@arr` with 200 symbols into the latest values per symbol:")
+if numpy is None:
+    print("numpy is not installed")
+else:
+    latest_tickers = {}
+    float_ticker_unicorn_fy = UnicornFy(numeric="float")
+    ticker_table = UnicornFyTickerTable()
+
+    def update_latest_tickers(message):
+        for data in float_ticker_unicorn_fy.binance_com_websocket(message)['data']:
+            latest_tickers[data['symbol']] = data
+
+    print_result("dict per symbol with numeric='float'", timeit.timeit(lambda: update_latest_tickers(ticker_arr),
+                                                                         number=rounds // 100) * 100)
+    print_result("UnicornFyTickerTable.update()", timeit.timeit(lambda: ticker_table.update(ticker_arr),
+                                                                 number=rounds // 100) * 100)
+
+print("\n`!ticker@arr` with 200 symbols, none of them changed:")
+ticker_changes_unicorn_fy = UnicornFy(ticker_changes=True)
+print_result("binance_com_websocket()", timeit.timeit(lambda: UnicornFy.binance_com_websocket(ticker_arr),
+                                                      number=rounds // 100) * 100)
+print_result("ticker_changes=True", timeit.timeit(lambda: ticker_changes_unicorn_fy.binance_com_websocket(ticker_arr),
+                                                  number=rounds // 100) * 100)
+
+print("\ntrade into 1s, 5s, 1m and 5m bars:")
+bar_aggregator = UnicornFyBarAggregator()
+unicorn_fied_trade = UnicornFy.binance_com_websocket(trade)
+print_result("binance_com_websocket()", timeit.timeit(lambda: UnicornFy.binance_com_websocket(trade), number=rounds))
+print_result("UnicornFyBarAggregator.update()", timeit.timeit(lambda: bar_aggregator.update(unicorn_fied_trade),
+                                                              number=rounds))
+
+print("\nhand over of a converted trade to another process (without the transport itself):")
+try:
+    shared_ring_buffer = UnicornFySharedRingBuffer(capacity=rounds)
+except ImportError as error_msg:
+    print(error_msg)
+else:
+    shared_ring_buffer_reader = UnicornFySharedRingBufferReader(shared_ring_buffer.name)
+    print_result("pickle.dumps() + pickle.loads()", timeit.timeit(
+        lambda: pickle.loads(pickle.dumps(unicorn_fied_trade)), number=rounds))
+    print_result("UnicornFySharedRingBuffer put() + read()", timeit.timeit(
+        lambda: shared_ring_buffer.put(unicorn_fied_trade), number=rounds) + timeit.timeit(
+        lambda: shared_ring_buffer_reader.read(), number=1))
+    shared_ring_buffer_reader.close()
+    shared_ring_buffer.close()
+    shared_ring_buffer.unlink()
+
+print("\nburst of 1000 `bookTicker` messages of 10 symbols, consumed at the end:")
+book_tickers = ['{"stream":"symbol%d@bookTicker","data":{"u":%d,"s":"SYMBOL%d","b":"9319.00000000","B":"1.00000000",'
+                '"a":"9320.50000000","A":"2.00000100"}}' % (index % 10, index, index % 10) for index in range(1000)]
+
+
+def conflate(messages):
+    conflation_buffer = UnicornFyConflationBuffer()
+    for message in messages:
+        conflation_buffer.put(message)
+    return conflation_buffer.get_all()
+
+
+print_result("binance_com_websocket() of every message", timeit.timeit(
+    lambda: [UnicornFy.binance_com_websocket(message) for message in book_tickers], number=rounds // 1000))
+print_result("UnicornFyConflationBuffer", timeit.timeit(lambda: conflate(book_tickers),
+                                                        number=rounds // 1000))
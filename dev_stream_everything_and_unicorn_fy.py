@@ -39,7 +39,6 @@ import logging
 import os
 import requests
 import sys
-import time
 import threading
 
 try:
@@ -56,15 +55,9 @@ logging.basicConfig(level=logging.INFO,
 
 
 def print_stream_data_from_stream_buffer(binance_websocket_api_manager):
-    while True:
-        if binance_websocket_api_manager.is_manager_stopping():
-            exit(0)
-        oldest_stream_data_from_stream_buffer = binance_websocket_api_manager.pop_stream_data_from_stream_buffer()
-        if oldest_stream_data_from_stream_buffer is not False:
-            unicorn_fied_data = UnicornFy.binance_com_websocket(oldest_stream_data_from_stream_buffer)
-            print(str(unicorn_fied_data))
-        else:
-            time.sleep(0.01)
+    for unicorn_fied_data in UnicornFy.stream(binance_websocket_api_manager.pop_stream_data_from_stream_buffer,
+                                              stop=binance_websocket_api_manager.is_manager_stopping):
+        print(str(unicorn_fied_data))
 
 
 binance_api_key = ""
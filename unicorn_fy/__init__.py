@@ -1 +1,16 @@
-from unicorn_fy.unicorn_fy import UnicornFy
\ No newline at end of file
+from unicorn_fy.unicorn_fy import UnicornFy
+from unicorn_fy.unicorn_fy_stream import UnicornFyStream
+from unicorn_fy.unicorn_fy_sniffer import UnicornFySniffer
+from unicorn_fy.unicorn_fy_view import UnicornFyView
+from unicorn_fy.unicorn_fy_record import UnicornFyRecord
+from unicorn_fy.unicorn_fy_precision import UnicornFyPrecision
+from unicorn_fy.unicorn_fy_order_book import UnicornFyOrderBook, UnicornFyOrderBooks
+from unicorn_fy.unicorn_fy_depth_diff import UnicornFyDepthDiff
+from unicorn_fy.unicorn_fy_ticker_table import UnicornFyTickerTable
+from unicorn_fy.unicorn_fy_kline_store import UnicornFyKlineStore
+from unicorn_fy.unicorn_fy_bars import UnicornFyBarAggregator
+from unicorn_fy.unicorn_fy_pool import UnicornFyPool
+from unicorn_fy.unicorn_fy_async import AsyncUnicornFy
+from unicorn_fy.unicorn_fy_shared_memory import UnicornFySharedRingBuffer, UnicornFySharedRingBufferReader
+from unicorn_fy.unicorn_fy_pipeline import UnicornFyPipelineStage
+from unicorn_fy.unicorn_fy_conflation import UnicornFyConflationBuffer
@@ -33,12 +33,37 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
 # IN THE SOFTWARE.
 
-import json as json # Disable ujson
+from .unicorn_fy_columns import COLUMN_EVENT_TYPES, build_columns, row_converter
+from .unicorn_fy_json import get_installed_json_backends, select_json_backend
+from .unicorn_fy_schema import BINANCE_CONVERTERS, BINANCE_FUTURES_CONVERTERS, USER_DATA_EVENTS, \
+    DerivedConverters, get_fields_key, numeric_converter, project_converters
+from .unicorn_fy_stream import UnicornFyStream
+from .unicorn_fy_levels import levels_converter
+from .unicorn_fy_levels import numpy as levels_numpy
+from .unicorn_fy_precision import precision_converter
+from .unicorn_fy_record import record_converter
+from .unicorn_fy_ticker_changes import ticker_changes_converter
+from .unicorn_fy_view import view_converter
 import logging
 import time
 import requests
 
 
+class hybridmethod(object):
+    """
+    Decorator for methods that can be called on the class and on an instance
+
+    Called on the class the method receives the class as first argument and uses the class wide settings, called on
+    an instance it receives the instance and uses the settings of this instance.
+    """
+    def __init__(self, func):
+        self.func = func
+        self.__doc__ = func.__doc__
+
+    def __get__(self, instance, owner):
+        return self.func.__get__(owner if instance is None else instance, owner)
+
+
 class UnicornFy(object):
     """
     Unify received data from crypto exchanges
@@ -52,12 +77,76 @@ class UnicornFy(object):
         - Binance.us
         - Binance.org
         - Jex.com
+
+    :param json_backend: Override the automatically selected json decoder of this instance: `orjson`, `simdjson`,
+                         `ujson` or `json`
+    :type json_backend: str
+
+    :param sniffer: Drop unwanted raw messages of this instance before they get decoded, see `UnicornFySniffer`
+    :type sniffer: UnicornFySniffer
+
+    :param output: `dict`, `view` to get read-only `UnicornFyView` mappings over the decoded payload instead of
+                   freshly built dicts or `record` to get compact named tuples (`UnicornFyRecord`) with one generated
+                   class per event type
+    :type output: str
+
+    :param numeric: `str` to get prices and quantities as received, `float` or `decimal` to get them parsed into
+                    `float` or `decimal.Decimal` numbers once while converting
+    :type numeric: str
+
+    :param precision: Get the prices and quantities of `trade`, `aggTrade`, `bookTicker`, `depth`, `depthUpdate` and
+                      `executionReport` events as integers scaled by the tick and step size of their symbol
+    :type precision: UnicornFyPrecision
+
+    :param levels: `list` to get the `bids` and `asks` of `depth` and `depthUpdate` events as lists of levels or
+                   `numpy` to get them parsed in one go into numpy arrays of the shape `(n, 2)`: `float64` or `int64`
+                   if they get scaled by `precision` (requires numpy)
+    :type levels: str
+
+    :param ticker_changes: Convert only the symbols of `24hrTicker` and `24hrMiniTicker` events whose prices or volumes
+                           changed since the last event of this instance and the same `fields`, the `data` list of
+                           unchanged ticker arrays is empty. Calls on the class itself keep no fingerprints and never
+                           filter.
+    :type ticker_changes: bool
     """
     VERSION = "0.7.0.dev"
-
-    def __init__(self):
+    json_backend, json_loads = select_json_backend()
+    json_loads = staticmethod(json_loads)
+    sniffer = None
+    output = "dict"
+    OUTPUTS = ("dict", "view", "record")
+    numeric = "str"
+    NUMERICS = ("str", "float", "decimal")
+    precision = None
+    levels = "list"
+    LEVELS = ("list", "numpy")
+    ticker_changes = False
+    ticker_fingerprints = None
+    derived_converters = None
+
+    def __init__(self, json_backend=None, sniffer=None, output="dict", numeric="str", precision=None,
+                 levels="list", ticker_changes=False):
         self.last_update_check_github = {'timestamp': time.time(),
                                          'status': None}
+        if json_backend is not None:
+            self.json_backend, self.json_loads = select_json_backend(json_backend)
+        self.sniffer = sniffer
+        if output not in self.OUTPUTS:
+            raise ValueError(f"unknown output '{output}', use one of {', '.join(self.OUTPUTS)}")
+        self.output = output
+        if numeric not in self.NUMERICS:
+            raise ValueError(f"unknown numeric '{numeric}', use one of {', '.join(self.NUMERICS)}")
+        self.numeric = numeric
+        self.precision = precision
+        if levels not in self.LEVELS:
+            raise ValueError(f"unknown levels '{levels}', use one of {', '.join(self.LEVELS)}")
+        if levels == "numpy" and levels_numpy is None:
+            raise ImportError("The numpy levels require numpy: `pip install numpy`")
+        self.levels = levels
+        self.ticker_changes = ticker_changes
+        # (exchange, fields) -> event type -> stream -> symbol -> fingerprint of the last converted ticker
+        self.ticker_fingerprints = {}
+        self.derived_converters = {}
 
     @staticmethod
     def binance_org_websocket(stream_data_json):
@@ -72,20 +161,53 @@ class UnicornFy(object):
         logging.info("Can not convert raw data from binance.org")
         return stream_data_json
 
-    @staticmethod
-    def binance_com_websocket(stream_data_json):
+    @hybridmethod
+    def binance_org_websocket_batch(self, messages):
+        """
+        unicorn_fy a list of binance.org (incl testnet) raw_stream_data in one call
+
+        :param messages: The received raw stream data from the Binance websocket
+        :type messages: list
+
+        :return: tuple (list of unicorn_fied dicts, list of errors)
+        """
+        return self.unicorn_fy_batch(messages, exchange="binance.org")
+
+    @hybridmethod
+    def binance_com_websocket(self, stream_data_json, fields=None):
         """
         unicorn_fy binance.com raw_stream_data
 
         :param stream_data_json: The received raw stream data from the Binance websocket
         :type stream_data_json: json
 
+        :param fields: Build only the listed keys of the unicorn_fied dicts of these event types, e.g.
+                       `{'trade': ['symbol', 'price', 'quantity']}`
+        :type fields: dict
+
         :return: dict
         """
-        return UnicornFy.binance_websocket(stream_data_json, exchange="binance.com", show_deprecated_warning=False)
+        return self.binance_websocket(stream_data_json, exchange="binance.com", show_deprecated_warning=False,
+                                      fields=fields)
 
-    @staticmethod
-    def binance_com_margin_websocket(stream_data_json):
+    @hybridmethod
+    def binance_com_websocket_batch(self, messages, fields=None):
+        """
+        unicorn_fy a list of binance.com raw_stream_data in one call
+
+        :param messages: The received raw stream data from the Binance websocket
+        :type messages: list
+
+        :param fields: Build only the listed keys of the unicorn_fied dicts of these event types, e.g.
+                       `{'trade': ['symbol', 'price', 'quantity']}`
+        :type fields: dict
+
+        :return: tuple (list of unicorn_fied dicts, list of errors)
+        """
+        return self.unicorn_fy_batch(messages, exchange="binance.com", fields=fields)
+
+    @hybridmethod
+    def binance_com_margin_websocket(self, stream_data_json):
         """
         unicorn_fy binance.com-margin raw_stream_data
 
@@ -94,10 +216,22 @@ class UnicornFy(object):
 
         :return: dict
         """
-        return UnicornFy.binance_websocket(stream_data_json, exchange="binance.com-margin", show_deprecated_warning=False)
+        return self.binance_websocket(stream_data_json, exchange="binance.com-margin", show_deprecated_warning=False)
     
-    @staticmethod
-    def binance_com_isolated_margin_websocket(stream_data_json):
+    @hybridmethod
+    def binance_com_margin_websocket_batch(self, messages):
+        """
+        unicorn_fy a list of binance.com-margin raw_stream_data in one call
+
+        :param messages: The received raw stream data from the Binance websocket
+        :type messages: list
+
+        :return: tuple (list of unicorn_fied dicts, list of errors)
+        """
+        return self.unicorn_fy_batch(messages, exchange="binance.com-margin")
+
+    @hybridmethod
+    def binance_com_isolated_margin_websocket(self, stream_data_json):
         """
         unicorn_fy binance.com-isolated_margin raw_stream_data
 
@@ -106,26 +240,59 @@ class UnicornFy(object):
 
         :return: dict
         """
-        return UnicornFy.binance_websocket(stream_data_json,
-                                           exchange="binance.com-isolated_margin",
-                                           show_deprecated_warning=False)
+        return self.binance_websocket(stream_data_json,
+                                      exchange="binance.com-isolated_margin",
+                                      show_deprecated_warning=False)
         
-    @staticmethod
-    def binance_com_futures_websocket(stream_data_json):
+    @hybridmethod
+    def binance_com_isolated_margin_websocket_batch(self, messages):
+        """
+        unicorn_fy a list of binance.com-isolated_margin raw_stream_data in one call
+
+        :param messages: The received raw stream data from the Binance websocket
+        :type messages: list
+
+        :return: tuple (list of unicorn_fied dicts, list of errors)
+        """
+        return self.unicorn_fy_batch(messages, exchange="binance.com-isolated_margin")
+
+    @hybridmethod
+    def binance_com_futures_websocket(self, stream_data_json, fields=None):
         """
         unicorn_fy binance.com-futures raw_stream_data
 
         :param stream_data_json: The received raw stream data from the Binance websocket
         :type stream_data_json: json
 
+        :param fields: Build only the listed keys of the unicorn_fied dicts of these event types, e.g.
+                       `{'trade': ['symbol', 'price', 'quantity']}`
+        :type fields: dict
+
         :return: dict
         """
-        return UnicornFy.binance_futures_websocket(stream_data_json,
-                                                   exchange="binance.com-futures",
-                                                   show_deprecated_warning=False)
+        return self.binance_futures_websocket(stream_data_json,
+                                              exchange="binance.com-futures",
+                                              show_deprecated_warning=False,
+                                              fields=fields)
             
-    @staticmethod
-    def binance_je_websocket(stream_data_json):
+    @hybridmethod
+    def binance_com_futures_websocket_batch(self, messages, fields=None):
+        """
+        unicorn_fy a list of binance.com-futures raw_stream_data in one call
+
+        :param messages: The received raw stream data from the Binance websocket
+        :type messages: list
+
+        :param fields: Build only the listed keys of the unicorn_fied dicts of these event types, e.g.
+                       `{'trade': ['symbol', 'price', 'quantity']}`
+        :type fields: dict
+
+        :return: tuple (list of unicorn_fied dicts, list of errors)
+        """
+        return self.unicorn_fy_batch(messages, exchange="binance.com-futures", fields=fields)
+
+    @hybridmethod
+    def binance_je_websocket(self, stream_data_json):
         """
         unicorn_fy binance.je (Jersey) raw_stream_data
 
@@ -134,10 +301,22 @@ class UnicornFy(object):
 
         :return: dict
         """
-        return UnicornFy.binance_websocket(stream_data_json, exchange="binance.je", show_deprecated_warning=False)
+        return self.binance_websocket(stream_data_json, exchange="binance.je", show_deprecated_warning=False)
 
-    @staticmethod
-    def binance_us_websocket(stream_data_json):
+    @hybridmethod
+    def binance_je_websocket_batch(self, messages):
+        """
+        unicorn_fy a list of binance.je (Jersey) raw_stream_data in one call
+
+        :param messages: The received raw stream data from the Binance websocket
+        :type messages: list
+
+        :return: tuple (list of unicorn_fied dicts, list of errors)
+        """
+        return self.unicorn_fy_batch(messages, exchange="binance.je")
+
+    @hybridmethod
+    def binance_us_websocket(self, stream_data_json):
         """
         unicorn_us binance.us (US) raw_stream_data
 
@@ -146,10 +325,23 @@ class UnicornFy(object):
 
         :return: dict
         """
-        return UnicornFy.binance_websocket(stream_data_json, exchange="binance.us", show_deprecated_warning=False)
+        return self.binance_websocket(stream_data_json, exchange="binance.us", show_deprecated_warning=False)
 
-    @staticmethod
-    def binance_websocket(stream_data_json, exchange="binance", show_deprecated_warning=True):
+    @hybridmethod
+    def binance_us_websocket_batch(self, messages):
+        """
+        unicorn_fy a list of binance.us (US) raw_stream_data in one call
+
+        :param messages: The received raw stream data from the Binance websocket
+        :type messages: list
+
+        :return: tuple (list of unicorn_fied dicts, list of errors)
+        """
+        return self.unicorn_fy_batch(messages, exchange="binance.us")
+
+    @hybridmethod
+    def binance_websocket(self, stream_data_json, exchange="binance", show_deprecated_warning=True,
+                          fields=None):
         """
         unicorn_fy binance.com raw_stream_data
 
@@ -162,360 +354,115 @@ class UnicornFy(object):
         :param show_deprecated_warning: Show or hide warning
         :type show_deprecated_warning: bool
 
-        :return: dict
-        """
-        unicorn_fied_data = False
+        :param fields: Build only the listed keys of the unicorn_fied dicts of these event types, e.g.
+                       `{'trade': ['symbol', 'price', 'quantity']}`
+        :type fields: dict
 
-        logging.debug("UnicornFy->binance_websocket(" + str(stream_data_json) + ")")
+        :return: dict or None if the message was dropped by the sniffer
+        """
+        logging.debug("UnicornFy->binance_websocket(%s)", stream_data_json)
         if show_deprecated_warning is True:
             logging.warning("Using `UnicornFy.binance_websocket()` is deprecated, use "
                             "`UnicornFy.binance_com_websocket()` or `UnicornFy.binance_je_websocket()` instead!")
 
-        if UnicornFy.is_json(stream_data_json) is False:
+        if self.sniffer is not None and self.sniffer.accept(stream_data_json) is False:
+            return None
+        stream_data = self.decode_stream_data(stream_data_json)
+        if stream_data is False:
             return stream_data_json
+        return UnicornFy._binance_websocket(stream_data, exchange=exchange,
+                                            converters=self.get_converters(exchange, fields, BINANCE_CONVERTERS))
 
-        stream_data = json.loads(stream_data_json)
+    @staticmethod
+    def _binance_websocket(stream_data, exchange="binance", converters=BINANCE_CONVERTERS):
+        """
+        unicorn_fy already decoded binance.com raw_stream_data
 
-        try:
-            if stream_data[0]['e'] == "24hrMiniTicker":
-                stream_data = {'data': {'e': "24hrMiniTicker"},
-                               'items': stream_data}
-            elif stream_data[0]['e'] == "24hrTicker":
-                stream_data = {'data': {'e': "24hrTicker"},
-                               'items': stream_data}
-        except KeyError:
-            pass
+        :param stream_data: The decoded stream data (it gets modified in place!)
+        :type stream_data: dict or list
 
-        try:
-            if "!ticker@arr" in stream_data['stream']:
+        :param exchange: Exchange endpoint.
+        :type exchange: str
+
+        :param converters: Dispatch table of the exchange variant: event type -> converter
+        :type converters: dict
+
+        :return: dict
+        """
+        unicorn_fied_data = UnicornFy._convert(stream_data, exchange, converters)
+        if unicorn_fied_data is False:
+            logging.critical(f"UnicornFy->binance_websocket({str(stream_data)}, {str(exchange)}) - "
+                             f"error: unknown event type")
+            return False
+        logging.debug("UnicornFy->binance_websocket(%s)", unicorn_fied_data)
+        return unicorn_fied_data
+
+    @staticmethod
+    def _convert(stream_data, exchange, converters):
+        """
+        Convert decoded stream data without any logging, this is the part of the conversion that runs per message
+
+        The event type gets looked up in the dispatch table `converters`, which is built from the declarative schemas
+        in `unicorn_fy_schema.py`.
+
+        :param stream_data: The decoded stream data (it gets modified in place!)
+        :type stream_data: dict or list
+
+        :param exchange: Exchange endpoint.
+        :type exchange: str
+
+        :param converters: Dispatch table of the exchange variant: event type -> converter
+        :type converters: dict
+
+        :return: dict or False if the event type is unknown
+        """
+        if isinstance(stream_data, list):
+            if stream_data and stream_data[0].get('e') in ("24hrMiniTicker", "24hrTicker"):
+                stream_data = {'data': {'e': stream_data[0]['e']},
+                               'items': stream_data}
+        elif 'stream' in stream_data:
+            stream = stream_data['stream']
+            if "!ticker@arr" in stream:
                 stream_data = {'data': {'e': "24hrTicker"},
                                'items': stream_data['data']}
-            elif "!miniTicker@arr" in stream_data['stream']:
+            elif "!miniTicker@arr" in stream:
                 stream_data = {'data': {'e': "24hrMiniTicker"},
                                'items': stream_data['data']}
-        except KeyError:
-            pass
-
-        try:
-            if stream_data['e'] == 'outboundAccountInfo':
-                stream_data = {'data': stream_data}
-            elif stream_data['e'] == 'executionReport':
-                stream_data = {'data': stream_data}
-            elif stream_data['e'] == 'outboundAccountPosition':
-                stream_data = {'data': stream_data}
-            elif stream_data['e'] == 'listStatus':
-                stream_data = {'data': stream_data}
-        except KeyError:
-            pass
-        try:
-            if stream_data['stream'].find('@depth5') != -1:
+            elif stream.find('@depth5') != -1:
                 stream_data['data']['e'] = "depth"
                 stream_data['data']['depth_level'] = 5
-            elif stream_data['stream'].find('@depth10') != -1:
+            elif stream.find('@depth10') != -1:
                 stream_data['data']['e'] = "depth"
                 stream_data['data']['depth_level'] = 10
-            elif stream_data['stream'].find('@depth20') != -1:
+            elif stream.find('@depth20') != -1:
                 stream_data['data']['e'] = "depth"
                 stream_data['data']['depth_level'] = 20
-            elif "@bookTicker" in stream_data['stream']:
+            elif "@bookTicker" in stream:
                 stream_data['data']['e'] = "bookTicker"
-        except KeyError:
-            pass
+        elif stream_data.get('e') in USER_DATA_EVENTS:
+            stream_data = {'data': stream_data}
 
-        try:
+        if isinstance(stream_data, dict):
             # return if already unicorn_fied
-            if stream_data['unicorn_fied']:
+            if stream_data.get('unicorn_fied'):
                 return stream_data
-        except KeyError:
-            pass
-
-        try:
-            if stream_data['result'] is None:
-                unicorn_fied_version = [exchange, UnicornFy.VERSION]
-                stream_data['unicorn_fied'] = unicorn_fied_version
-                logging.debug(f"UnicornFy->binance_websocket({str(stream_data)}, {str(exchange)}")
+            if 'result' in stream_data or stream_data.get('error'):
+                stream_data['unicorn_fied'] = [exchange, UnicornFy.VERSION]
                 return stream_data
-            else:
-                unicorn_fied_version = [exchange, UnicornFy.VERSION]
-                stream_data['unicorn_fied'] = unicorn_fied_version
-                logging.debug(f"UnicornFy->binance_websocket({str(stream_data)}, {str(exchange)}")
-                return stream_data
-        except KeyError:
-            pass
 
         try:
-            if stream_data['error']:
-                unicorn_fied_version = [exchange, UnicornFy.VERSION]
-                stream_data['unicorn_fied'] = unicorn_fied_version
-                logging.debug(f"UnicornFy->binance_websocket({str(stream_data)}, {str(exchange)}")
-                return stream_data
-        except KeyError:
-            pass
-
-        if stream_data['data']['e'] == 'aggTrade':
-            unicorn_fied_data = {'stream_type': stream_data['stream'],
-                                 'event_type': stream_data['data']['e'],
-                                 'event_time': stream_data['data']['E'],
-                                 'symbol': stream_data['data']['s'],
-                                 'aggregate_trade_id': stream_data['data']['a'],
-                                 'price': stream_data['data']['p'],
-                                 'quantity': stream_data['data']['q'],
-                                 'first_trade_id': stream_data['data']['f'],
-                                 'last_trade_id': stream_data['data']['l'],
-                                 'trade_time': stream_data['data']['T'],
-                                 'is_market_maker': stream_data['data']['m'],
-                                 'ignore': stream_data['data']['M']}
-        elif stream_data['data']['e'] == 'listStatus':
-            objects = []
-            for item in stream_data['data']['O']:
-                objects.append({'symbol': item['s'],
-                                'order_id': item['i'],
-                                'client_order_id': item['c']})
-            unicorn_fied_data = {'stream_type': stream_data['data']['s'].lower() + "@listStatus",
-                                 'event_type': stream_data['data']['e'],
-                                 'event_time': stream_data['data']['E'],
-                                 'symbol': stream_data['data']['s'],
-                                 'order_list_id': stream_data['data']['g'],
-                                 'contingency_type': stream_data['data']['c'],
-                                 'list_status_type': stream_data['data']['l'],
-                                 'list_order_status': stream_data['data']['L'],
-                                 'list_reject_reason': stream_data['data']['r'],
-                                 'list_client_order_id': stream_data['data']['C'],
-                                 'transaction_time': stream_data['data']['T'],
-                                 'objects': objects}
-        elif stream_data['data']['e'] == 'trade':
-            unicorn_fied_data = {'stream_type': stream_data['stream'],
-                                 'event_type': stream_data['data']['e'],
-                                 'event_time': stream_data['data']['E'],
-                                 'symbol': stream_data['data']['s'],
-                                 'trade_id': stream_data['data']['t'],
-                                 'price': stream_data['data']['p'],
-                                 'quantity': stream_data['data']['q'],
-                                 'buyer_order_id': stream_data['data']['b'],
-                                 'seller_order_id': stream_data['data']['a'],
-                                 'trade_time': stream_data['data']['T'],
-                                 'is_market_maker': stream_data['data']['m'],
-                                 'ignore': stream_data['data']['M']}
-        elif stream_data['data']['e'] == 'bookTicker':
-            unicorn_fied_data = {'stream_type': stream_data['stream'],
-                                 'order_book_update_id': stream_data['data']['u'],
-                                 'symbol': stream_data['data']['s'],
-                                 'best_bid_price': stream_data['data']['b'],
-                                 'best_bid_quantity': stream_data['data']['B'],
-                                 'best_ask_price': stream_data['data']['a'],
-                                 'best_ask_quantity': stream_data['data']['A'],
-                                 'event_type': stream_data['data']['e']}
-        elif stream_data['data']['e'] == 'kline':
-            stream_data['data'] = UnicornFy.set_to_false_if_not_exist(stream_data['data'], 'f')
-            stream_data['data'] = UnicornFy.set_to_false_if_not_exist(stream_data['data'], 'L')
-            unicorn_fied_data = {'stream_type': stream_data['stream'],
-                                 'event_type': stream_data['data']['e'],
-                                 'event_time': stream_data['data']['E'],
-                                 'symbol': stream_data['data']['s'],
-                                 'kline': {'kline_start_time': stream_data['data']['k']['t'],
-                                           'kline_close_time': stream_data['data']['k']['T'],
-                                           'symbol': stream_data['data']['k']['s'],
-                                           'interval': stream_data['data']['k']['i'],
-                                           'first_trade_id': stream_data['data']['f'],
-                                           'last_trade_id': stream_data['data']['L'],
-                                           'open_price': stream_data['data']['k']['o'],
-                                           'close_price': stream_data['data']['k']['c'],
-                                           'high_price': stream_data['data']['k']['h'],
-                                           'low_price': stream_data['data']['k']['l'],
-                                           'base_volume': stream_data['data']['k']['v'],
-                                           'number_of_trades': stream_data['data']['k']['n'],
-                                           'is_closed': stream_data['data']['k']['x'],
-                                           'quote': stream_data['data']['k']['q'],
-                                           'taker_by_base_asset_volume': stream_data['data']['k']['V'],
-                                           'taker_by_quote_asset_volume': stream_data['data']['k']['Q'],
-                                           'ignore': stream_data['data']['k']['B']}}
-        elif stream_data['data']['e'] == '24hrMiniTicker':
-            try:
-                if stream_data['stream']:
-                    pass
-            except KeyError:
-                stream_data['stream'] = '!miniTicker@arr'
-            unicorn_fied_data = {'stream_type': stream_data['stream'],
-                                 'event_type': stream_data['data']['e'],
-                                 'data': []}
-
-            try:
-                for item in stream_data['items']:
-                    data = {'stream_type': stream_data['stream'],
-                            'event_type': item['e'],
-                            'event_time': item['E'],
-                            'symbol': item['s'],
-                            'close_price': item['c'],
-                            'open_price': item['o'],
-                            'high_price': item['h'],
-                            'low_price': item['l'],
-                            'taker_by_base_asset_volume': item['v'],
-                            'taker_by_quote_asset_volume': item['q']}
-                    unicorn_fied_data['data'].append(data)
-            except KeyError:
-                try:
-                    data = {'stream_type': stream_data['stream'],
-                            'event_type': stream_data['data']['e'],
-                            'event_time': stream_data['data']['E'],
-                            'symbol': stream_data['data']['s'],
-                            'close_price': stream_data['data']['c'],
-                            'open_price': stream_data['data']['o'],
-                            'high_price': stream_data['data']['h'],
-                            'low_price': stream_data['data']['l'],
-                            'taker_by_base_asset_volume': stream_data['data']['v'],
-                            'taker_by_quote_asset_volume': stream_data['data']['q']}
-                    unicorn_fied_data['data'].append(data)
-                except KeyError as error_msg:
-                    logging.critical(f"UnicornFy->binance_com_futures_websocket({str(stream_data)}) - "
-                                     f"error: {str(error_msg)}")
-                    print(str(stream_data))
-        elif stream_data['data']['e'] == '24hrTicker':
-            try:
-                if stream_data['stream']:
-                    pass
-            except KeyError:
-                stream_data['stream'] = '!ticker@arr'
-            unicorn_fied_data = {'stream_type': stream_data['stream'],
-                                 'event_type': stream_data['data']['e'],
-                                 'data': []}
-            try:
-                for item in stream_data['items']:
-                    data = {'stream_type': stream_data['stream'],
-                            'event_type': item['e'],
-                            'event_time': item['E'],
-                            'symbol': item['s'],
-                            'price_change': item['p'],
-                            'price_change_percent': item['P'],
-                            'weighted_average_price': item['w'],
-                            'trade_before_24h_window': item['x'],
-                            'last_price': item['c'],
-                            'last_quantity': item['Q'],
-                            'best_bid_price': item['b'],
-                            'best_bid_quantity': item['B'],
-                            'best_ask_price': item['a'],
-                            'best_ask_quantity': item['A'],
-                            'open_price': item['o'],
-                            'high_price': item['h'],
-                            'low_price': item['l'],
-                            'total_traded_base_asset_volume': item['v'],
-                            'total_traded_quote_asset_volume': item['q'],
-                            'statistics_open_time': item['O'],
-                            'statistics_close_time': item['C'],
-                            'first_trade_id': item['F'],
-                            'last_trade_id': item['L'],
-                            'total_nr_of_trades': item['n']}
-                    unicorn_fied_data['data'].append(data)
-            except KeyError:
-                data = {'stream_type': stream_data['stream'],
-                        'event_type': stream_data['data']['e'],
-                        'event_time': stream_data['data']['E'],
-                        'symbol': stream_data['data']['s'],
-                        'price_change': stream_data['data']['p'],
-                        'price_change_percent': stream_data['data']['P'],
-                        'weighted_average_price': stream_data['data']['w'],
-                        'trade_before_24h_window': stream_data['data']['x'],
-                        'last_price': stream_data['data']['c'],
-                        'last_quantity': stream_data['data']['Q'],
-                        'best_bid_price': stream_data['data']['b'],
-                        'best_bid_quantity': stream_data['data']['B'],
-                        'best_ask_price': stream_data['data']['a'],
-                        'best_ask_quantity': stream_data['data']['A'],
-                        'open_price': stream_data['data']['o'],
-                        'high_price': stream_data['data']['h'],
-                        'low_price': stream_data['data']['l'],
-                        'total_traded_base_asset_volume': stream_data['data']['v'],
-                        'total_traded_quote_asset_volume': stream_data['data']['q'],
-                        'statistics_open_time': stream_data['data']['O'],
-                        'statistics_close_time': stream_data['data']['C'],
-                        'first_trade_id': stream_data['data']['F'],
-                        'last_trade_id': stream_data['data']['L'],
-                        'total_nr_of_trades': stream_data['data']['n']}
-                unicorn_fied_data['data'].append(data)
-        elif stream_data['data']['e'] == 'depth':
-            unicorn_fied_data = {'stream_type': stream_data['stream'],
-                                 'event_type': stream_data['data']['e'],
-                                 'symbol': stream_data['stream'][:stream_data['stream'].find('@')].upper(),
-                                 'last_update_id': stream_data['data']['lastUpdateId'],
-                                 'bids': stream_data['data']['bids'],
-                                 'asks': stream_data['data']['asks']}
-        elif stream_data['data']['e'] == 'depthUpdate':
-            unicorn_fied_data = {'stream_type': stream_data['stream'],
-                                 'event_type': stream_data['data']['e'],
-                                 'event_time': stream_data['data']['E'],
-                                 'symbol': stream_data['data']['s'],
-                                 'first_update_id_in_event': stream_data['data']['U'],
-                                 'final_update_id_in_event': stream_data['data']['u'],
-                                 'bids': stream_data['data']['b'],
-                                 'asks': stream_data['data']['a']}
-        elif stream_data['data']['e'] == 'outboundAccountInfo':
-            unicorn_fied_data = {'stream_type': '!userData@arr',
-                                 'event_type': stream_data['data']['e'],
-                                 'event_time': stream_data['data']['E'],
-                                 'maker_commission_rate': stream_data['data']['m'],
-                                 'taker_commission_rate': stream_data['data']['t'],
-                                 'buyer_commission_rate': stream_data['data']['b'],
-                                 'seller_commission_rate': stream_data['data']['s'],
-                                 'can_trade': stream_data['data']['T'],
-                                 'can_withdraw': stream_data['data']['W'],
-                                 'can_deposit': stream_data['data']['D'],
-                                 'balances': [],
-                                 'account_permissions': stream_data['data']['P']}
-            for item in stream_data['data']['B']:
-                new_item = {'asset': item['a'],
-                            'free': item['f'],
-                            'locked': item['l']}
-                unicorn_fied_data['balances'] += [new_item]
-        elif stream_data['data']['e'] == 'outboundAccountPosition':
-            unicorn_fied_data = {'stream_type': '!userData@arr',
-                                 'event_type': stream_data['data']['e'],
-                                 'event_time': stream_data['data']['E'],
-                                 'last_update_time': stream_data['data']['u'],
-                                 'balances': []}
-            for item in stream_data['data']['B']:
-                new_item = {'asset': item['a'],
-                            'free': item['f'],
-                            'locked': item['l']}
-                unicorn_fied_data['balances'] += [new_item]
-        elif stream_data['data']['e'] == 'executionReport':
-            unicorn_fied_data = {'stream_type': '!userData@arr',
-                                 'event_type': stream_data['data']['e'],
-                                 'event_time': stream_data['data']['E'],
-                                 'symbol': stream_data['data']['s'],
-                                 'client_order_id': stream_data['data']['c'],
-                                 'side': stream_data['data']['S'],
-                                 'order_type': stream_data['data']['o'],
-                                 'time_in_force': stream_data['data']['f'],
-                                 'order_quantity': stream_data['data']['q'],
-                                 'order_price': stream_data['data']['p'],
-                                 'stop_price': stream_data['data']['P'],
-                                 'iceberg_quantity': stream_data['data']['F'],
-                                 'ignore_g': stream_data['data']['g'],
-                                 'original_client_order_id': stream_data['data']['C'],
-                                 'current_execution_type': stream_data['data']['x'],
-                                 'current_order_status': stream_data['data']['X'],
-                                 'order_reject_reason': stream_data['data']['r'],
-                                 'order_id': stream_data['data']['i'],
-                                 'last_executed_quantity': stream_data['data']['l'],
-                                 'cumulative_filled_quantity': stream_data['data']['z'],
-                                 'last_executed_price': stream_data['data']['L'],
-                                 'commission_amount': stream_data['data']['n'],
-                                 'commission_asset': stream_data['data']['N'],
-                                 'transaction_time': stream_data['data']['T'],
-                                 'trade_id': stream_data['data']['t'],
-                                 'ignore_I': stream_data['data']['I'],
-                                 'is_order_working': stream_data['data']['w'],
-                                 'is_trade_maker_side': stream_data['data']['m'],
-                                 'ignore_M': stream_data['data']['M'],
-                                 'order_creation_time': stream_data['data']['O'],
-                                 'cumulative_quote_asset_transacted_quantity': stream_data['data']['Z'],
-                                 'last_quote_asset_transacted_quantity': stream_data['data']['Y']}
-        unicorn_fied_version = [exchange, UnicornFy.VERSION]
-        unicorn_fied_data['unicorn_fied'] = unicorn_fied_version
-        logging.debug("UnicornFy->binance_com_futures_websocket(" + str(unicorn_fied_data) + ")")
+            converter = converters[stream_data['data']['e']]
+        except (KeyError, TypeError):
+            return False
+        unicorn_fied_data = converter(stream_data)
+        if unicorn_fied_data.__class__ is dict:
+            # other output formats carry the `unicorn_fied` value themselves
+            unicorn_fied_data['unicorn_fied'] = [exchange, UnicornFy.VERSION]
         return unicorn_fied_data
 
-    @staticmethod
-    def binance_futures_websocket(stream_data_json, exchange="binance.com-futures", show_deprecated_warning=False):
+    @hybridmethod
+    def binance_futures_websocket(self, stream_data_json, exchange="binance.com-futures", show_deprecated_warning=False,
+                                  fields=None):
         """
         unicorn_fy binance.com-futures raw_stream_data
 
@@ -528,310 +475,46 @@ class UnicornFy(object):
         :param show_deprecated_warning: Show or hide warning
         :type show_deprecated_warning: bool
 
-        :return: dict
-        """
-        unicorn_fied_data = False
+        :param fields: Build only the listed keys of the unicorn_fied dicts of these event types, e.g.
+                       `{'trade': ['symbol', 'price', 'quantity']}`
+        :type fields: dict
 
-        logging.debug("UnicornFy->binance_websocket(" + str(stream_data_json) + ")")
+        :return: dict or None if the message was dropped by the sniffer
+        """
+        logging.debug("UnicornFy->binance_websocket(%s)", stream_data_json)
         if show_deprecated_warning is True:
             logging.warning("Using `UnicornFy.binance_websocket()` is deprecated, use "
                             "`UnicornFy.binance_com_websocket()` or `UnicornFy.binance_je_websocket()` instead!")
 
-        if UnicornFy.is_json(stream_data_json) is False:
+        if self.sniffer is not None and self.sniffer.accept(stream_data_json) is False:
+            return None
+        stream_data = self.decode_stream_data(stream_data_json)
+        if stream_data is False:
             return stream_data_json
+        return UnicornFy._binance_futures_websocket(stream_data, exchange=exchange,
+                                                    converters=self.get_converters(exchange, fields,
+                                                                                   BINANCE_FUTURES_CONVERTERS))
 
-        stream_data = json.loads(stream_data_json)
-
-        try:
-            if stream_data['e'] == 'outboundAccountInfo':
-                stream_data = {'data': stream_data}
-            elif stream_data['e'] == 'executionReport':
-                stream_data = {'data': stream_data}
-        except KeyError:
-            pass
-        try:
-            if stream_data['stream'].find('@depth5') != -1:
-                stream_data['data']['e'] = "depth"
-                stream_data['data']['depth_level'] = 5
-            elif stream_data['stream'].find('@depth10') != -1:
-                stream_data['data']['e'] = "depth"
-                stream_data['data']['depth_level'] = 10
-            elif stream_data['stream'].find('@depth20') != -1:
-                stream_data['data']['e'] = "depth"
-                stream_data['data']['depth_level'] = 20
-            elif "@bookTicker" in stream_data['stream']:
-                stream_data['data']['e'] = "bookTicker"
-        except KeyError:
-            pass
+    @staticmethod
+    def _binance_futures_websocket(stream_data, exchange="binance.com-futures", converters=BINANCE_FUTURES_CONVERTERS):
+        """
+        unicorn_fy already decoded binance.com-futures raw_stream_data
 
-        try:
-            # return if already unicorn_fied
-            if stream_data['unicorn_fied']:
-                return stream_data
-        except KeyError:
-            pass
+        :param stream_data: The decoded stream data (it gets modified in place!)
+        :type stream_data: dict or list
 
-        try:
-            if stream_data['result'] is None:
-                unicorn_fied_version = [exchange, UnicornFy.VERSION]
-                stream_data['unicorn_fied'] = unicorn_fied_version
-                logging.debug(f"UnicornFy->binance_com_futures_websocket({str(stream_data)}, {str(exchange)}")
-                return stream_data
-            else:
-                unicorn_fied_version = [exchange, UnicornFy.VERSION]
-                stream_data['unicorn_fied'] = unicorn_fied_version
-                logging.debug(f"UnicornFy->binance_com_futures_websocket({str(stream_data)}, {str(exchange)}")
-                return stream_data
-        except KeyError:
-            pass
+        :param exchange: Exchange endpoint.
+        :type exchange: str
 
-        try:
-            if stream_data['error']:
-                unicorn_fied_version = [exchange, UnicornFy.VERSION]
-                stream_data['unicorn_fied'] = unicorn_fied_version
-                logging.debug(f"UnicornFy->binance_com_futures_websocket({str(stream_data)}, {str(exchange)}")
-                return stream_data
-        except KeyError:
-            pass
+        :param converters: Dispatch table of the exchange variant: event type -> converter
+        :type converters: dict
 
-        try:
-            if stream_data['data']['e'] == 'aggTrade':
-                unicorn_fied_data = {'stream_type': stream_data['stream'],
-                                     'event_type': stream_data['data']['e'],
-                                     'event_time': stream_data['data']['E'],
-                                     'symbol': stream_data['data']['s'],
-                                     'aggregate_trade_id': stream_data['data']['a'],
-                                     'price': stream_data['data']['p'],
-                                     'quantity': stream_data['data']['q'],
-                                     'first_trade_id': stream_data['data']['f'],
-                                     'last_trade_id': stream_data['data']['l'],
-                                     'trade_time': stream_data['data']['T'],
-                                     'is_market_maker': stream_data['data']['m']}
-            elif stream_data['data']['e'] == 'trade':
-                # Todo: KeyError: 'b'
-                # 'buyer_order_id': stream_data['data']['b'],
-                # Todo: KeyError: 'a'
-                # 'seller_order_id': stream_data['data']['a'],
-                # Todo: KeyError: 'M'
-                # , 'ignore': stream_data['data']['M']
-                unicorn_fied_data = {'stream_type': stream_data['stream'],
-                                     'event_type': stream_data['data']['e'],
-                                     'event_time': stream_data['data']['E'],
-                                     'symbol': stream_data['data']['s'],
-                                     'trade_id': stream_data['data']['t'],
-                                     'price': stream_data['data']['p'],
-                                     'quantity': stream_data['data']['q'],
-                                     'trade_time': stream_data['data']['T'],
-                                     'is_market_maker': stream_data['data']['m']}
-            elif stream_data['data']['e'] == 'kline':
-                stream_data['data'] = UnicornFy.set_to_false_if_not_exist(stream_data['data'], 'f')
-                stream_data['data'] = UnicornFy.set_to_false_if_not_exist(stream_data['data'], 'L')
-                unicorn_fied_data = {'stream_type': stream_data['stream'],
-                                     'event_type': stream_data['data']['e'],
-                                     'event_time': stream_data['data']['E'],
-                                     'symbol': stream_data['data']['s'],
-                                     'kline': {'kline_start_time': stream_data['data']['k']['t'],
-                                               'kline_close_time': stream_data['data']['k']['T'],
-                                               'symbol': stream_data['data']['k']['s'],
-                                               'interval': stream_data['data']['k']['i'],
-                                               'first_trade_id': stream_data['data']['f'],
-                                               'last_trade_id': stream_data['data']['L'],
-                                               'open_price': stream_data['data']['k']['o'],
-                                               'close_price': stream_data['data']['k']['c'],
-                                               'high_price': stream_data['data']['k']['h'],
-                                               'low_price': stream_data['data']['k']['l'],
-                                               'base_volume': stream_data['data']['k']['v'],
-                                               'number_of_trades': stream_data['data']['k']['n'],
-                                               'is_closed': stream_data['data']['k']['x'],
-                                               'quote': stream_data['data']['k']['q'],
-                                               'taker_by_base_asset_volume': stream_data['data']['k']['V'],
-                                               'taker_by_quote_asset_volume': stream_data['data']['k']['Q'],
-                                               'ignore': stream_data['data']['k']['B']}}
-            elif stream_data['data']['e'] == '24hrMiniTicker':
-                try:
-                    if stream_data['stream']:
-                        pass
-                except KeyError:
-                    stream_data['stream'] = '!miniTicker@arr'
-                unicorn_fied_data = {'stream_type': stream_data['stream'],
-                                     'event_type': stream_data['data']['e'],
-                                     'data': []}
-
-                try:
-                    for item in stream_data['items']:
-                        data = {'stream_type': stream_data['stream'],
-                                'event_type': item['e'],
-                                'event_time': item['E'],
-                                'symbol': item['s'],
-                                'close_price': item['c'],
-                                'open_price': item['o'],
-                                'high_price': item['h'],
-                                'low_price': item['l'],
-                                'taker_by_base_asset_volume': item['v'],
-                                'taker_by_quote_asset_volume': item['q']}
-                        unicorn_fied_data['data'].append(data)
-                except KeyError:
-                    data = {'stream_type': stream_data['stream'],
-                            'event_type': stream_data['data']['e'],
-                            'event_time': stream_data['data']['E'],
-                            'symbol': stream_data['data']['s'],
-                            'close_price': stream_data['data']['c'],
-                            'open_price': stream_data['data']['o'],
-                            'high_price': stream_data['data']['h'],
-                            'low_price': stream_data['data']['l'],
-                            'taker_by_base_asset_volume': stream_data['data']['v'],
-                            'taker_by_quote_asset_volume': stream_data['data']['q']}
-                    unicorn_fied_data['data'].append(data)
-            elif stream_data['data']['e'] == '24hrTicker':
-                try:
-                    if stream_data['stream']:
-                        pass
-                except KeyError:
-                    stream_data['stream'] = '!ticker@arr'
-                unicorn_fied_data = {'stream_type': stream_data['stream'],
-                                     'event_type': stream_data['data']['e'],
-                                     'data': []}
-                try:
-                    for item in stream_data['items']:
-                        data = {'stream_type': stream_data['stream'],
-                                'event_type': item['e'],
-                                'event_time': item['E'],
-                                'symbol': item['s'],
-                                'price_change': item['p'],
-                                'price_change_percent': item['P'],
-                                'weighted_average_price': item['w'],
-                                'trade_before_24h_window': item['x'],
-                                'last_price': item['c'],
-                                'last_quantity': item['Q'],
-                                'best_bid_price': item['b'],
-                                'best_bid_quantity': item['B'],
-                                'best_ask_price': item['a'],
-                                'best_ask_quantity': item['A'],
-                                'open_price': item['o'],
-                                'high_price': item['h'],
-                                'low_price': item['l'],
-                                'total_traded_base_asset_volume': item['v'],
-                                'total_traded_quote_asset_volume': item['q'],
-                                'statistics_open_time': item['O'],
-                                'statistics_close_time': item['C'],
-                                'first_trade_id': item['F'],
-                                'last_trade_id': item['L'],
-                                'total_nr_of_trades': item['n']}
-                        unicorn_fied_data['data'].append(data)
-                except KeyError:
-                    # Todo: KeyError: 'x'
-                    # 'trade_before_24h_window': stream_data['data']['x'],
-                    # Todo: KeyError: 'b'
-                    # 'best_bid_price': stream_data['data']['b'],
-                    # Todo: KeyError: 'B'
-                    # 'best_bid_quantity': stream_data['data']['B'],
-                    # Todo KeyError: 'a'
-                    # 'best_ask_price': stream_data['data']['a'],
-                    # Todo KeyError: 'A'
-                    # 'best_ask_quantity': stream_data['data']['A'],
-                    data = {'stream_type': stream_data['stream'],
-                            'event_type': stream_data['data']['e'],
-                            'event_time': stream_data['data']['E'],
-                            'symbol': stream_data['data']['s'],
-                            'price_change': stream_data['data']['p'],
-                            'price_change_percent': stream_data['data']['P'],
-                            'weighted_average_price': stream_data['data']['w'],
-                            'last_price': stream_data['data']['c'],
-                            'last_quantity': stream_data['data']['Q'],
-                            'open_price': stream_data['data']['o'],
-                            'high_price': stream_data['data']['h'],
-                            'low_price': stream_data['data']['l'],
-                            'total_traded_base_asset_volume': stream_data['data']['v'],
-                            'total_traded_quote_asset_volume': stream_data['data']['q'],
-                            'statistics_open_time': stream_data['data']['O'],
-                            'statistics_close_time': stream_data['data']['C'],
-                            'first_trade_id': stream_data['data']['F'],
-                            'last_trade_id': stream_data['data']['L'],
-                            'total_nr_of_trades': stream_data['data']['n']}
-                    unicorn_fied_data['data'].append(data)
-            elif stream_data['data']['e'] == 'depth':
-                # Todo: KeyError: 'lastUpdateId'
-                # 'last_update_id': stream_data['data']['lastUpdateId'],
-                # Todo: KeyError: 'bids'
-                # 'bids': stream_data['data']['bids'],
-                # , 'asks': stream_data['data']['asks']
-                unicorn_fied_data = {'stream_type': stream_data['stream'],
-                                     'event_type': stream_data['data']['e'],
-                                     'symbol': stream_data['stream'][:stream_data['stream'].find('@')].upper()}
-            elif stream_data['data']['e'] == 'depthUpdate':
-                # Todo: KeyError: 'bids'
-                # 'bids': stream_data['data']['b'],
-                unicorn_fied_data = {'stream_type': stream_data['stream'],
-                                     'event_type': stream_data['data']['e'],
-                                     'event_time': stream_data['data']['E'],
-                                     'symbol': stream_data['data']['s'],
-                                     'first_update_id_in_event': stream_data['data']['U'],
-                                     'final_update_id_in_event': stream_data['data']['u'],
-                                     'asks': stream_data['data']['a']}
-            elif stream_data['data']['e'] == 'outboundAccountInfo':
-                unicorn_fied_data = {'stream_type': '!userData@arr',
-                                     'event_type': stream_data['data']['e'],
-                                     'event_time': stream_data['data']['E'],
-                                     'maker_commission_rate': stream_data['data']['m'],
-                                     'taker_commission_rate': stream_data['data']['t'],
-                                     'buyer_commission_rate': stream_data['data']['b'],
-                                     'seller_commission_rate': stream_data['data']['s'],
-                                     'can_trade': stream_data['data']['T'],
-                                     'can_withdraw': stream_data['data']['W'],
-                                     'can_deposit': stream_data['data']['D'],
-                                     'balances': []}
-                for item in stream_data['data']['B']:
-                    new_item = {'asset': item['a'],
-                                'free': item['f'],
-                                'locked': item['l']}
-                    unicorn_fied_data['balances'] += [new_item]
-            elif stream_data['data']['e'] == 'executionReport':
-                unicorn_fied_data = {'stream_type': '!userData@arr',
-                                     'event_type': stream_data['data']['e'],
-                                     'event_time': stream_data['data']['E'],
-                                     'symbol': stream_data['data']['s'],
-                                     'client_order_id': stream_data['data']['c'],
-                                     'side': stream_data['data']['S'],
-                                     'order_type': stream_data['data']['o'],
-                                     'time_in_force': stream_data['data']['f'],
-                                     'order_quantity': stream_data['data']['q'],
-                                     'order_price': stream_data['data']['p'],
-                                     'stop_price': stream_data['data']['P'],
-                                     'iceberg_quantity': stream_data['data']['F'],
-                                     'ignore_g': stream_data['data']['g'],
-                                     'original_client_order_id': stream_data['data']['C'],
-                                     'current_execution_type': stream_data['data']['x'],
-                                     'current_order_status': stream_data['data']['X'],
-                                     'order_reject_reason': stream_data['data']['r'],
-                                     'order_id': stream_data['data']['i'],
-                                     'last_executed_quantity': stream_data['data']['l'],
-                                     'cumulative_filled_quantity': stream_data['data']['z'],
-                                     'last_executed_price': stream_data['data']['L'],
-                                     'commission_amount': stream_data['data']['n'],
-                                     'commission_asset': stream_data['data']['N'],
-                                     'transaction_time': stream_data['data']['T'],
-                                     'trade_id': stream_data['data']['t'],
-                                     'ignore_I': stream_data['data']['I'],
-                                     'is_order_working': stream_data['data']['w'],
-                                     'is_trade_maker_side': stream_data['data']['m'],
-                                     'ignore_M': stream_data['data']['M'],
-                                     'order_creation_time': stream_data['data']['O'],
-                                     'cumulative_quote_asset_transacted_quantity': stream_data['data']['Z'],
-                                     'last_quote_asset_transacted_quantity': stream_data['data']['Y']}
-        except TypeError as error_msg:
-            logging.critical(f"UnicornFy->binance_com_futures_websocket({str(unicorn_fied_data)}) - "
-                             f"error: {str(error_msg)}")
-        unicorn_fied_version = [exchange, UnicornFy.VERSION]
-        try:
-            unicorn_fied_data['unicorn_fied'] = unicorn_fied_version
-        except TypeError as error_msg:
-            logging.critical(f"UnicornFy->binance_com_futures_websocket({str(unicorn_fied_data)}) - "
-                             f"error: {str(error_msg)}")
-        logging.debug("UnicornFy->binance_com_futures_websocket(" + str(unicorn_fied_data) + ")")
-        return unicorn_fied_data
+        :return: dict
+        """
+        return UnicornFy._binance_websocket(stream_data, exchange=exchange, converters=converters)
 
-    @staticmethod
-    def jex_com_websocket(stream_data_json):
+    @hybridmethod
+    def jex_com_websocket(self, stream_data_json):
         """
         unicorn_fy jex.com raw_stream_data
 
@@ -840,7 +523,130 @@ class UnicornFy(object):
 
         :return: dict
         """
-        return UnicornFy.binance_websocket(stream_data_json, exchange="jex.com", show_deprecated_warning=False)
+        return self.binance_websocket(stream_data_json, exchange="jex.com", show_deprecated_warning=False)
+
+    @hybridmethod
+    def jex_com_websocket_batch(self, messages):
+        """
+        unicorn_fy a list of jex.com raw_stream_data in one call
+
+        :param messages: The received raw stream data from the Binance websocket
+        :type messages: list
+
+        :return: tuple (list of unicorn_fied dicts, list of errors)
+        """
+        return self.unicorn_fy_batch(messages, exchange="jex.com")
+
+    @hybridmethod
+    def decode_stream_data(self, stream_data_json):
+        """
+        Decode received raw stream data exactly once with the selected json backend
+
+        Accepts `str`, `bytes`, `bytearray` and `memoryview` objects as they come from the websocket layer. Malformed
+        input gets reported one time and results in `False`.
+
+        :param stream_data_json: The received raw stream data from the Binance websocket
+        :type stream_data_json: str, bytes, bytearray or memoryview
+
+        :return: dict, list or False
+        """
+        if isinstance(stream_data_json, memoryview):
+            stream_data_json = stream_data_json.tobytes()
+        try:
+            return self.json_loads(stream_data_json)
+        except (ValueError, TypeError) as error_msg:
+            logging.error(f"UnicornFy->decode_stream_data({str(stream_data_json)}) - malformed input - "
+                          f"error: {str(error_msg)}")
+            return False
+
+    @hybridmethod
+    def get_converters(self, exchange="binance.com", fields=None, converters=None):
+        """
+        Get the dispatch table of an exchange for the conversion options of this instance
+
+        :param exchange: Exchange endpoint.
+        :type exchange: str
+
+        :param fields: Build only the listed keys of the unicorn_fied dicts of these event types, e.g.
+                       `{'trade': ['symbol', 'price', 'quantity']}`
+        :type fields: dict
+
+        :param converters: The dispatch table to start from, by default the one of the exchange variant
+        :type converters: dict
+
+        :return: dict of event type -> converter function
+        """
+        if converters is None:
+            converters = BINANCE_FUTURES_CONVERTERS if exchange == "binance.com-futures" else BINANCE_CONVERTERS
+        if self.numeric == "str" and self.output == "dict" and self.precision is None and self.levels == "list" \
+                and not self.ticker_changes:
+            return project_converters(converters, fields) if fields else converters
+        # the derived tables of the module level dispatch tables get reused, also per combination of fields
+        fields_key = get_fields_key(fields) if fields else None
+        cache_key = (id(converters), exchange, self.numeric, self.output, id(self.precision), self.levels,
+                     self.ticker_changes, fields_key)
+        derived_converters = self.derived_converters
+        if derived_converters is None:
+            # options changed on the class itself, there is no instance to keep the tables
+            derived_converters = {}
+        if cache_key not in derived_converters:
+            if fields:
+                converters = project_converters(converters, fields)
+            derived_converters[cache_key] = self._derive_converters(converters, exchange, fields_key)
+        return derived_converters[cache_key]
+
+    @hybridmethod
+    def _derive_converters(self, converters, exchange, fields_key=None):
+        """
+        Wrap a dispatch table into the tables of the conversion options of this instance
+
+        :param converters: Dispatch table of the exchange variant: event type -> converter
+        :type converters: dict
+
+        :param exchange: Exchange endpoint.
+        :type exchange: str
+
+        :param fields_key: The hashable key of the projected `fields`, `None` without a projection
+        :type fields_key: tuple
+
+        :return: dict of event type -> converter function
+        """
+        if self.precision is not None:
+            converters = DerivedConverters(converters, precision_converter, self.precision)
+        if self.levels != "list":
+            converters = DerivedConverters(converters, levels_converter, self.levels)
+        if self.numeric != "str":
+            converters = DerivedConverters(converters, numeric_converter, self.numeric)
+        if self.output == "view":
+            converters = DerivedConverters(converters, view_converter, (exchange, UnicornFy.VERSION))
+        elif self.output == "record":
+            converters = DerivedConverters(converters, record_converter, (exchange, UnicornFy.VERSION))
+        if self.ticker_changes:
+            # the outermost layer, it reduces the symbols before any other layer converts them. The fingerprints are
+            # kept per projection like the derived tables, otherwise a projected table would swallow the changes of
+            # the full one. On the class itself a fresh dict per call never filters.
+            fingerprints = self.ticker_fingerprints.setdefault((exchange, fields_key), {}) \
+                if self.ticker_fingerprints is not None else {}
+            converters = DerivedConverters(converters, ticker_changes_converter, fingerprints)
+        return converters
+
+    @staticmethod
+    def get_installed_json_backends():
+        """
+        Get the names of all installed json backends, the fastest first
+
+        :return: list
+        """
+        return get_installed_json_backends()
+
+    @hybridmethod
+    def get_json_backend(self):
+        """
+        Get the name of the json backend used for decoding
+
+        :return: str
+        """
+        return self.json_backend
 
     @staticmethod
     def get_latest_release_info():
@@ -894,7 +700,7 @@ class UnicornFy(object):
         :rtype: bool
         """
         try:
-            json.loads(data)
+            UnicornFy.json_loads(data)
         except ValueError:
             return False
         except TypeError:
@@ -941,3 +747,215 @@ class UnicornFy(object):
         except IndexError:
             value[key] = False
             return value
+
+    @hybridmethod
+    def unicorn_fy(self, stream_data, exchange="binance.com", fields=None):
+        """
+        unicorn_fy raw_stream_data of any supported exchange with a single decode per message
+
+        In addition to the raw `str` received from the websocket, this also accepts `bytes`, `memoryview` and already
+        decoded `dict` or `list` objects. Already decoded objects are not copied and get modified in place!
+
+        :param stream_data: The received raw stream data from the Binance websocket
+        :type stream_data: str, bytes, bytearray, memoryview, dict or list
+
+        :param exchange: Exchange endpoint.
+        :type exchange: str
+
+        :param fields: Build only the listed keys of the unicorn_fied dicts of these event types, e.g.
+                       `{'trade': ['symbol', 'price', 'quantity']}`
+        :type fields: dict
+
+        :return: dict or None if the message was dropped by the sniffer
+        """
+        if exchange == "binance.org":
+            return UnicornFy.binance_org_websocket(stream_data)
+        if isinstance(stream_data, (dict, list)):
+            decoded_stream_data = stream_data
+        else:
+            if self.sniffer is not None and self.sniffer.accept(stream_data) is False:
+                return None
+            decoded_stream_data = self.decode_stream_data(stream_data)
+            if decoded_stream_data is False:
+                return stream_data
+        return UnicornFy._binance_websocket(decoded_stream_data, exchange=exchange,
+                                            converters=self.get_converters(exchange, fields))
+
+    @hybridmethod
+    def stream(self, source, exchange="binance.com", stop=None, errors=None, max_idle_sleep=0.01, fields=None):
+        """
+        Create a lazy pipeline that yields the unicorn_fied data of every received message
+
+        The pipeline holds only one message at a time. Chain `filter()` and `map()` stages to it and iterate it:
+
+            for trade in UnicornFy.stream(ubwa.pop_stream_data_from_stream_buffer,
+                                          stop=ubwa.is_manager_stopping).filter(lambda data: data.get('event_type')
+                                                                                == "trade"):
+                print(trade['price'])
+
+        :param source: An iterable of raw messages or a callable like `pop_stream_data_from_stream_buffer()` that
+                       returns the next raw message or `False`/`None` if there is none
+        :type source: iterable or function
+
+        :param exchange: Exchange endpoint.
+        :type exchange: str
+
+        :param stop: Called before every poll of the source, the pipeline ends as soon as it returns `True`
+        :type stop: function
+
+        :param errors: Collects the errors of messages that could not be converted (see `unicorn_fy_batch()`), use
+                       a `collections.deque(maxlen=...)` to keep memory bounded. Errors are logged if not provided.
+        :type errors: list or collections.deque
+
+        :param max_idle_sleep: Upper limit in seconds for the back off while a callable source is idle
+        :type max_idle_sleep: float
+
+        :param fields: Build only the listed keys of the unicorn_fied dicts of these event types, e.g.
+                       `{'trade': ['symbol', 'price', 'quantity']}`
+        :type fields: dict
+
+        :return: UnicornFyStream
+        """
+        return UnicornFyStream(self, source, exchange=exchange, stop=stop, errors=errors,
+                               max_idle_sleep=max_idle_sleep, fields=fields)
+
+    @hybridmethod
+    def unicorn_fy_batch(self, messages, exchange="binance.com", fields=None):
+        """
+        unicorn_fy a list of raw_stream_data of any supported exchange in one call
+
+        Logging, the selection of the json decoder and the dispatch table are set up once per batch. A message that
+        can not be converted does not abort the batch, it gets reported in the list of errors instead.
+
+        :param messages: The received raw stream data, every item can be a `str`, `bytes`, `memoryview`, `dict` or
+                         `list`
+        :type messages: list or any other iterable
+
+        :param exchange: Exchange endpoint.
+        :type exchange: str
+
+        :param fields: Build only the listed keys of the unicorn_fied dicts of these event types, e.g.
+                       `{'trade': ['symbol', 'price', 'quantity']}`
+        :type fields: dict
+
+        :return: tuple (list of unicorn_fied dicts, list of errors) - every error is a dict with the keys `index`,
+                 `stream_data` and `error`
+        """
+        if exchange == "binance.org":
+            return list(messages), []
+        errors = []
+        unicorn_fied_batch = list(self.unicorn_fy_iter(messages, exchange=exchange, errors=errors, fields=fields))
+        if errors:
+            logging.error(f"UnicornFy->unicorn_fy_batch() - {len(errors)} of {len(unicorn_fied_batch) + len(errors)} "
+                          f"messages of {str(exchange)} could not be converted")
+        logging.debug(f"UnicornFy->unicorn_fy_batch() - converted {len(unicorn_fied_batch)} messages of "
+                      f"{str(exchange)}")
+        return unicorn_fied_batch, errors
+
+    @hybridmethod
+    def unicorn_fy_columns(self, messages, event_type="trade", exchange="binance.com", structured=False, errors=None):
+        """
+        unicorn_fy a batch of `trade`, `aggTrade`, `kline` or `bookTicker` raw_stream_data into numpy columns
+
+        No unicorn_fied dict gets built: the raw values of every message are collected in a tuple and every column gets
+        converted by numpy in one go. Prices and quantities become `float64`, times `datetime64[ms]`. Messages of other
+        event types are skipped. Requires numpy.
+
+        :param messages: The received raw stream data, every item can be a `str`, `bytes`, `memoryview`, `dict` or
+                         `list`
+        :type messages: list or any other iterable
+
+        :param event_type: `trade`, `aggTrade`, `kline` or `bookTicker`
+        :type event_type: str
+
+        :param exchange: Exchange endpoint.
+        :type exchange: str
+
+        :param structured: Return a numpy structured array instead of a dict of column arrays
+        :type structured: bool
+
+        :param errors: Messages that can not be converted get skipped and appended to `errors` as dict with the keys
+                       `index`, `stream_data` and `error`. They get logged if `errors` is `None`.
+        :type errors: list or collections.deque
+
+        :return: dict of unicorn_fied key -> numpy array or numpy structured array
+        """
+        if event_type not in COLUMN_EVENT_TYPES:
+            raise ValueError(f"unknown event type '{event_type}', use one of {', '.join(COLUMN_EVENT_TYPES)}")
+        row = row_converter(UnicornFy.get_converters(exchange)[event_type])
+        converters = {event_type: row}
+        json_loads = self.json_loads
+        convert = UnicornFy._convert
+        sniff = self.sniffer.accept if self.sniffer is not None else None
+        rows = []
+        for index, stream_data in enumerate(messages):
+            try:
+                if isinstance(stream_data, (dict, list)):
+                    values = convert(stream_data, exchange, converters)
+                else:
+                    stream_data_json = stream_data.tobytes() if isinstance(stream_data, memoryview) else stream_data
+                    if sniff is not None and sniff(stream_data_json) is False:
+                        continue
+                    values = convert(json_loads(stream_data_json), exchange, converters)
+            except Exception as error_msg:
+                if errors is None:
+                    logging.error(f"UnicornFy->unicorn_fy_columns({str(stream_data)}, {str(exchange)}) - "
+                                  f"error: {str(error_msg)}")
+                else:
+                    errors.append({'index': index, 'stream_data': stream_data, 'error': error_msg})
+                continue
+            if values.__class__ is tuple:
+                rows.append(values)
+        return build_columns(row.names, rows, structured=structured)
+
+    @hybridmethod
+    def unicorn_fy_iter(self, messages, exchange="binance.com", errors=None, fields=None):
+        """
+        Lazily unicorn_fy raw_stream_data of any supported exchange
+
+        The json decoder and the dispatch table are set up once, then every message gets converted when the next
+        item is requested.
+
+        :param messages: The received raw stream data, every item can be a `str`, `bytes`, `memoryview`, `dict` or
+                         `list`
+        :type messages: iterable
+
+        :param exchange: Exchange endpoint.
+        :type exchange: str
+
+        :param errors: Messages that can not be converted get skipped and appended to `errors` as dict with the keys
+                       `index`, `stream_data` and `error`. They get logged if `errors` is `None`.
+        :type errors: list or collections.deque
+
+        :param fields: Build only the listed keys of the unicorn_fied dicts of these event types, e.g.
+                       `{'trade': ['symbol', 'price', 'quantity']}`
+        :type fields: dict
+
+        :return: generator of unicorn_fied dicts, messages dropped by the sniffer are skipped silently
+        """
+        if exchange == "binance.org":
+            yield from messages
+            return
+        converters = self.get_converters(exchange, fields)
+        json_loads = self.json_loads
+        convert = UnicornFy._convert
+        sniff = self.sniffer.accept if self.sniffer is not None else None
+        for index, stream_data in enumerate(messages):
+            try:
+                if isinstance(stream_data, (dict, list)):
+                    unicorn_fied_data = convert(stream_data, exchange, converters)
+                else:
+                    stream_data_json = stream_data.tobytes() if isinstance(stream_data, memoryview) else stream_data
+                    if sniff is not None and sniff(stream_data_json) is False:
+                        continue
+                    unicorn_fied_data = convert(json_loads(stream_data_json), exchange, converters)
+                if unicorn_fied_data is False:
+                    raise ValueError("unknown event type")
+            except Exception as error_msg:
+                if errors is None:
+                    logging.error(f"UnicornFy->unicorn_fy_iter({str(stream_data)}, {str(exchange)}) - "
+                                  f"error: {str(error_msg)}")
+                else:
+                    errors.append({'index': index, 'stream_data': stream_data, 'error': error_msg})
+                continue
+            yield unicorn_fied_data
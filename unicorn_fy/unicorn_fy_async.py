@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# File: unicorn_fy_async.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# Author: Oliver Zehentleitner
+#         https://about.me/oliver-zehentleitner
+#
+# Copyright (c) 2019-2020, Oliver Zehentleitner
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+
+from .unicorn_fy import UnicornFy
+import asyncio
+import concurrent.futures
+import functools
+
+# options that keep state between messages, a process executor would split it between its workers
+STATEFUL_OPTIONS = ('ticker_changes', )
+
+
+@functools.lru_cache(maxsize=16)
+def get_unicorn_fy(unicorn_fy_options):
+    """
+    Get the `UnicornFy` instance of a set of options in a worker process of a process executor
+
+    :param unicorn_fy_options: Tuple of the `(name, value)` pairs of the `UnicornFy` keyword arguments
+    :type unicorn_fy_options: tuple
+
+    :return: UnicornFy
+    """
+    return UnicornFy(**dict(unicorn_fy_options))
+
+
+def unicorn_fy_in_executor(unicorn_fy_options, stream_data, exchange):
+    """
+    Convert a message inside of an executor
+
+    :param unicorn_fy_options: Tuple of the `(name, value)` pairs of the `UnicornFy` keyword arguments
+    :type unicorn_fy_options: tuple
+
+    :param stream_data: The received raw stream data from the Binance websocket
+    :type stream_data: str, bytes or bytearray
+
+    :param exchange: Exchange endpoint.
+    :type exchange: str
+
+    :return: dict
+    """
+    return get_unicorn_fy(unicorn_fy_options).unicorn_fy(stream_data, exchange=exchange)
+
+
+class AsyncUnicornFy(object):
+    """
+    Convert raw messages of an async iterator or an `asyncio.Queue` without blocking the event loop
+
+    Small messages get converted inline, that is faster than any hand over. Messages of at least `offload_size`
+    bytes, like ticker arrays or depth snapshots, get converted in the executor while the event loop keeps running.
+    The results keep the order of the messages.
+
+    Every `AsyncUnicornFy` has its own `UnicornFy` instance, a thread executor uses it too. Conversions with the
+    stateful option `ticker_changes` never overlap, so the fingerprints follow the order of the messages.
+
+    With a `concurrent.futures.ProcessPoolExecutor` the results get pickled, so only dicts can be returned and
+    `unicorn_fy_options` should hold plain values like `numeric` or `levels`. Every worker process has its own
+    instance, stateful options like `ticker_changes` are not supported.
+
+    :param exchange: Exchange endpoint.
+    :type exchange: str
+
+    :param executor: A thread or process executor for large messages, without one all messages get converted inline
+    :type executor: concurrent.futures.Executor
+
+    :param offload_size: Minimum length of a raw message that gets converted in the executor
+    :type offload_size: int
+
+    :param sniffer: Drop unwanted raw messages before they get decoded or sent to the executor
+    :type sniffer: UnicornFySniffer
+
+    :param unicorn_fy_options: Keyword arguments of the `UnicornFy` instance, e.g. `{'numeric': "float"}`
+    :type unicorn_fy_options: dict
+    """
+    def __init__(self, exchange="binance.com", executor=None, offload_size=65536, sniffer=None,
+                 unicorn_fy_options=None):
+        self.exchange = exchange
+        self.executor = executor
+        self.offload_size = offload_size
+        self.sniffer = sniffer
+        unicorn_fy_options = unicorn_fy_options or {}
+        self.unicorn_fy_options = tuple(sorted(unicorn_fy_options.items()))
+        self.unicorn_fy = UnicornFy(**unicorn_fy_options)
+        self.is_stateful = any(unicorn_fy_options.get(option) for option in STATEFUL_OPTIONS)
+        if isinstance(executor, concurrent.futures.ProcessPoolExecutor):
+            if self.is_stateful:
+                raise ValueError(f"the options {', '.join(STATEFUL_OPTIONS)} can not be used with a process "
+                                 f"executor")
+            self.convert_in_executor = functools.partial(unicorn_fy_in_executor, self.unicorn_fy_options,
+                                                         exchange=exchange)
+        else:
+            self.convert_in_executor = functools.partial(self.unicorn_fy.unicorn_fy, exchange=exchange)
+        # created on first use inside of the running event loop
+        self.lock = None
+        self.stats = {'inline': 0,
+                      'offloaded': 0,
+                      'dropped': 0}
+
+    async def convert(self, stream_data):
+        """
+        Convert one message
+
+        :param stream_data: The received raw stream data from the Binance websocket
+        :type stream_data: str, bytes, bytearray, memoryview, dict or list
+
+        :return: dict or None if the message was dropped by the sniffer
+        """
+        if self.is_stateful:
+            if self.lock is None:
+                self.lock = asyncio.Lock()
+            async with self.lock:
+                return await self._convert(stream_data)
+        return await self._convert(stream_data)
+
+    async def _convert(self, stream_data):
+        if isinstance(stream_data, (str, bytes, bytearray, memoryview)):
+            if self.sniffer is not None and self.sniffer.accept(stream_data) is False:
+                self.stats['dropped'] += 1
+                return None
+            if self.executor is not None and len(stream_data) >= self.offload_size:
+                if isinstance(stream_data, memoryview):
+                    # the buffer of a memoryview can be reused by the websocket layer and can not be pickled
+                    stream_data = stream_data.tobytes()
+                self.stats['offloaded'] += 1
+                # `get_event_loop()` returns the running loop here and also exists on python 3.6
+                return await asyncio.get_event_loop().run_in_executor(self.executor, self.convert_in_executor,
+                                                                      stream_data)
+        self.stats['inline'] += 1
+        return self.unicorn_fy.unicorn_fy(stream_data, exchange=self.exchange)
+
+    def get_stats(self):
+        """
+        Get the counters of inline converted, offloaded and dropped messages
+
+        :return: dict
+        """
+        return dict(self.stats)
+
+    async def stream(self, source):
+        """
+        Convert the messages of a source, use it with `async for`
+
+        :param source: An async iterable of raw messages or an `asyncio.Queue`, the queue ends with `None`
+        :type source: async iterable or asyncio.Queue
+
+        :return: async generator of unicorn_fied dicts, messages dropped by the sniffer are skipped
+        """
+        if isinstance(source, asyncio.Queue):
+            while True:
+                stream_data = await source.get()
+                if stream_data is None:
+                    return
+                unicorn_fied_data = await self.convert(stream_data)
+                if unicorn_fied_data is not None:
+                    yield unicorn_fied_data
+        else:
+            async for stream_data in source:
+                unicorn_fied_data = await self.convert(stream_data)
+                if unicorn_fied_data is not None:
+                    yield unicorn_fied_data
@@ -0,0 +1,266 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# File: unicorn_fy_bars.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# Author: Oliver Zehentleitner
+#         https://about.me/oliver-zehentleitner
+#
+# Copyright (c) 2019-2020, Oliver Zehentleitner
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+
+from .unicorn_fy import UnicornFy
+
+INTERVAL_UNITS = {'s': 1000,
+                  'm': 60000,
+                  'h': 3600000,
+                  'd': 86400000,
+                  'w': 604800000}
+# the unix epoch is a thursday, binance weeks start on monday
+INTERVAL_OFFSETS = {'w': 345600000}
+
+# the positions of the values of one bar in the state of a symbol, one block of `BAR_SIZE` values per interval, the
+# last value is the end of the last closed bar of the interval
+BAR_START_TIME, BAR_OPEN, BAR_HIGH, BAR_LOW, BAR_CLOSE, BAR_VOLUME, BAR_QUOTE, BAR_TRADES, BAR_TAKER_VOLUME, \
+    BAR_TAKER_QUOTE, BAR_FIRST_TRADE_ID, BAR_LAST_TRADE_ID, BAR_CLOSED_UNTIL = range(13)
+BAR_SIZE = 13
+
+
+def get_interval_ms(interval):
+    """
+    Get the length of an interval like `1s`, `5m` or `4h` in milliseconds
+
+    :param interval: The interval
+    :type interval: str
+
+    :return: int
+    """
+    try:
+        return int(interval[:-1]) * INTERVAL_UNITS[interval[-1]]
+    except (KeyError, ValueError):
+        raise ValueError(f"unknown interval '{interval}', use a number followed by one of "
+                         f"{', '.join(INTERVAL_UNITS)}") from None
+
+
+class UnicornFyBarAggregator(object):
+    """
+    Build OHLCV bars of many intervals at once from unicorn_fied `trade` and `aggTrade` events
+
+    The open bars of a symbol are kept in one flat list with a block of values per interval and every trade updates
+    all intervals in one pass. A bar gets closed by the first trade of a later bar or by `flush()`, closed bars are
+    returned in the unicorn_fied format of `kline` events with an additional `volume_weighted_average_price` and
+    prices and volumes as `float`. Trades that belong to an already closed bar, also a bar closed by `flush()`, are
+    counted in `get_stats()` and dropped.
+
+    The bars of `aggTrade` events count the trades from `first_trade_id` to `last_trade_id`, weekly bars start on
+    monday like the klines of binance.
+
+    :param intervals: The intervals, e.g. `('1s', '5s', '1m', '5m')`
+    :type intervals: tuple
+
+    :param exchange: Exchange endpoint, used for the `unicorn_fied` key of the bars
+    :type exchange: str
+    """
+    def __init__(self, intervals=("1s", "5s", "1m", "5m"), exchange="binance.com"):
+        self.intervals = tuple(intervals)
+        self.interval_ms = tuple(get_interval_ms(interval) for interval in self.intervals)
+        self.interval_offsets = tuple(INTERVAL_OFFSETS.get(interval[-1], 0) for interval in self.intervals)
+        self.exchange = exchange
+        # symbol -> flat list of the open bars
+        self.bars = {}
+        self.stats = {'trades': 0,
+                      'late_trades': 0,
+                      'closed_bars': 0}
+
+    def close_bar(self, symbol, state, index):
+        """
+        Build the unicorn_fied kline event of an open bar and reset it
+
+        :param symbol: The symbol
+        :type symbol: str
+
+        :param state: The open bars of the symbol
+        :type state: list
+
+        :param index: The position of the interval
+        :type index: int
+
+        :return: dict
+        """
+        offset = index * BAR_SIZE
+        interval = self.intervals[index]
+        start_time = state[offset + BAR_START_TIME]
+        close_time = start_time + self.interval_ms[index] - 1
+        volume = state[offset + BAR_VOLUME]
+        quote = state[offset + BAR_QUOTE]
+        number_of_trades = state[offset + BAR_TRADES]
+        state[offset + BAR_TRADES] = 0
+        state[offset + BAR_CLOSED_UNTIL] = close_time + 1
+        self.stats['closed_bars'] += 1
+        return {'stream_type': f"{symbol.lower()}@bar_{interval}",
+                'event_type': "kline",
+                'event_time': close_time,
+                'symbol': symbol,
+                'kline': {'kline_start_time': start_time,
+                          'kline_close_time': close_time,
+                          'symbol': symbol,
+                          'interval': interval,
+                          'first_trade_id': state[offset + BAR_FIRST_TRADE_ID],
+                          'last_trade_id': state[offset + BAR_LAST_TRADE_ID],
+                          'open_price': state[offset + BAR_OPEN],
+                          'close_price': state[offset + BAR_CLOSE],
+                          'high_price': state[offset + BAR_HIGH],
+                          'low_price': state[offset + BAR_LOW],
+                          'base_volume': volume,
+                          'number_of_trades': number_of_trades,
+                          'is_closed': True,
+                          'quote': quote,
+                          'taker_by_base_asset_volume': state[offset + BAR_TAKER_VOLUME],
+                          'taker_by_quote_asset_volume': state[offset + BAR_TAKER_QUOTE],
+                          'volume_weighted_average_price': quote / volume if volume else state[offset + BAR_CLOSE]},
+                'unicorn_fied': [self.exchange, UnicornFy.VERSION]}
+
+    def flush(self, timestamp):
+        """
+        Close all open bars that end before a timestamp, e.g. the current time or the event time of a stream
+
+        :param timestamp: Unix time in milliseconds
+        :type timestamp: int
+
+        :return: list of unicorn_fied kline events
+        """
+        closed_bars = []
+        for symbol, state in self.bars.items():
+            for index, interval_ms in enumerate(self.interval_ms):
+                offset = index * BAR_SIZE
+                if state[offset + BAR_TRADES] and state[offset + BAR_START_TIME] + interval_ms <= timestamp:
+                    closed_bars.append(self.close_bar(symbol, state, index))
+        return closed_bars
+
+    def get_open_bar(self, symbol, interval):
+        """
+        Get the open bar of a symbol and interval
+
+        :param symbol: The symbol, e.g. `BTCUSDT`
+        :type symbol: str
+
+        :param interval: The interval, e.g. `1m`
+        :type interval: str
+
+        :return: dict or `None` if the bar has no trade yet
+        """
+        state = self.bars.get(symbol)
+        offset = self.intervals.index(interval) * BAR_SIZE
+        if state is None or not state[offset + BAR_TRADES]:
+            return None
+        return {'kline_start_time': state[offset + BAR_START_TIME],
+                'open_price': state[offset + BAR_OPEN],
+                'close_price': state[offset + BAR_CLOSE],
+                'high_price': state[offset + BAR_HIGH],
+                'low_price': state[offset + BAR_LOW],
+                'base_volume': state[offset + BAR_VOLUME],
+                'number_of_trades': state[offset + BAR_TRADES],
+                'quote': state[offset + BAR_QUOTE]}
+
+    def get_stats(self):
+        """
+        Get the counters of trades, late trades and closed bars
+
+        :return: dict
+        """
+        return dict(self.stats)
+
+    def update(self, unicorn_fied_data):
+        """
+        Add a unicorn_fied `trade` or `aggTrade` event to the open bars of its symbol, other events are ignored
+
+        :param unicorn_fied_data: The unicorn_fied dict or `UnicornFyView` with prices and quantities as `str`,
+                                  `float` or `decimal.Decimal`
+        :type unicorn_fied_data: dict
+
+        :return: list of the unicorn_fied kline events of the bars closed by this trade
+        """
+        event_type = unicorn_fied_data.get('event_type') if unicorn_fied_data is not None else None
+        if event_type == "trade":
+            first_trade_id = last_trade_id = unicorn_fied_data['trade_id']
+            number_of_trades = 1
+        elif event_type == "aggTrade":
+            first_trade_id = unicorn_fied_data['first_trade_id']
+            last_trade_id = unicorn_fied_data['last_trade_id']
+            number_of_trades = last_trade_id - first_trade_id + 1
+        else:
+            return []
+        symbol = unicorn_fied_data['symbol']
+        price = float(unicorn_fied_data['price'])
+        quantity = float(unicorn_fied_data['quantity'])
+        quote = price * quantity
+        trade_time = unicorn_fied_data['trade_time']
+        # the buyer is the taker unless the buyer is the market maker
+        is_taker_buy = not unicorn_fied_data['is_market_maker']
+        state = self.bars.get(symbol)
+        if state is None:
+            state = self.bars[symbol] = [0] * (BAR_SIZE * len(self.intervals))
+        self.stats['trades'] += 1
+        closed_bars = []
+        is_late = False
+        offset = 0
+        for index, interval_ms in enumerate(self.interval_ms):
+            start_time = trade_time - (trade_time - self.interval_offsets[index]) % interval_ms
+            if start_time < state[offset + BAR_CLOSED_UNTIL]:
+                is_late = True
+                offset += BAR_SIZE
+                continue
+            if state[offset + BAR_TRADES] and state[offset + BAR_START_TIME] != start_time:
+                if start_time < state[offset + BAR_START_TIME]:
+                    is_late = True
+                    offset += BAR_SIZE
+                    continue
+                closed_bars.append(self.close_bar(symbol, state, index))
+            if state[offset + BAR_TRADES]:
+                if price > state[offset + BAR_HIGH]:
+                    state[offset + BAR_HIGH] = price
+                elif price < state[offset + BAR_LOW]:
+                    state[offset + BAR_LOW] = price
+                state[offset + BAR_CLOSE] = price
+                state[offset + BAR_VOLUME] += quantity
+                state[offset + BAR_QUOTE] += quote
+                state[offset + BAR_TRADES] += number_of_trades
+                if is_taker_buy:
+                    state[offset + BAR_TAKER_VOLUME] += quantity
+                    state[offset + BAR_TAKER_QUOTE] += quote
+                state[offset + BAR_LAST_TRADE_ID] = last_trade_id
+            else:
+                state[offset:offset + BAR_CLOSED_UNTIL] = (start_time, price, price, price, price, quantity, quote,
+                                                           number_of_trades,
+                                                           quantity if is_taker_buy else 0.0,
+                                                           quote if is_taker_buy else 0.0,
+                                                           first_trade_id, last_trade_id)
+            offset += BAR_SIZE
+        if is_late:
+            self.stats['late_trades'] += 1
+        return closed_bars
@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# File: unicorn_fy_columns.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# Author: Oliver Zehentleitner
+#         https://about.me/oliver-zehentleitner
+#
+# Copyright (c) 2019-2020, Oliver Zehentleitner
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+
+from .unicorn_fy_schema import MISSING, ConverterCompiler, Event, Key, Section
+import functools
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# the event types that can be converted into columns
+COLUMN_EVENT_TYPES = ('trade', 'aggTrade', 'kline', 'bookTicker')
+
+# dtypes of the columns, unicorn_fied keys that are not listed do not become a column
+COLUMN_DTYPES = {'event_time': 'datetime64[ms]',
+                 'trade_time': 'datetime64[ms]',
+                 'kline_start_time': 'datetime64[ms]',
+                 'kline_close_time': 'datetime64[ms]',
+                 'symbol': 'U',
+                 'interval': 'U',
+                 'trade_id': 'int64',
+                 'aggregate_trade_id': 'int64',
+                 'first_trade_id': 'int64',
+                 'last_trade_id': 'int64',
+                 'buyer_order_id': 'int64',
+                 'seller_order_id': 'int64',
+                 'order_book_update_id': 'int64',
+                 'number_of_trades': 'int64',
+                 'price': 'float64',
+                 'quantity': 'float64',
+                 'open_price': 'float64',
+                 'close_price': 'float64',
+                 'high_price': 'float64',
+                 'low_price': 'float64',
+                 'base_volume': 'float64',
+                 'quote': 'float64',
+                 'taker_by_base_asset_volume': 'float64',
+                 'taker_by_quote_asset_volume': 'float64',
+                 'best_bid_price': 'float64',
+                 'best_bid_quantity': 'float64',
+                 'best_ask_price': 'float64',
+                 'best_ask_quantity': 'float64',
+                 'is_market_maker': 'bool',
+                 'is_closed': 'bool'}
+
+
+def column_fields(fields):
+    """
+    Flatten the fields of a schema into the fields that become columns
+
+    Nested sections like `kline` get flattened, keys that exist twice and keys with a default value are skipped.
+
+    :param fields: Tuple of `(unicorn_fied_key, source)` pairs
+    :type fields: tuple
+
+    :return: tuple of `(unicorn_fied_key, source)` pairs
+    """
+    flat_fields = {}
+    for name, source in fields:
+        if isinstance(source, Section):
+            for section_name, section_source in column_fields(source.fields):
+                flat_fields.setdefault(section_name, section_source)
+        elif isinstance(source, Key) and source.default is MISSING and name in COLUMN_DTYPES:
+            flat_fields.setdefault(name, source)
+    return tuple(flat_fields.items())
+
+
+class RowConverterCompiler(ConverterCompiler):
+    """
+    Generate the source code of a converter function that returns the raw values of the columns as tuple
+    """
+    def dict_expression(self, fields, payload, depth=0, name=None):
+        return "(" + "".join(self.expression(source, payload, depth, field_name) + ", "
+                             for field_name, source in fields) + ")"
+
+
+@functools.lru_cache(maxsize=None)
+def row_converter(converter):
+    """
+    Get a converter function that returns one row of raw column values instead of a dict
+
+    :param converter: The converter function of a `trade`, `aggTrade`, `kline` or `bookTicker` event
+    :type converter: function
+
+    :return: function(stream_data) - the unicorn_fied keys of the columns are available in its attribute `names`
+    """
+    fields = column_fields(converter.schema.fields)
+    row = RowConverterCompiler(Event(fields), converter.__name__).compile()
+    row.names = tuple(name for name, source in fields)
+    return row
+
+
+def build_columns(names, rows, structured=False):
+    """
+    Turn rows of raw values into numpy column arrays
+
+    Prices and quantities get parsed from their strings straight into a `float64` array, times become
+    `datetime64[ms]`.
+
+    :param names: The unicorn_fied keys of the columns
+    :type names: tuple
+
+    :param rows: The rows
+    :type rows: list of tuples
+
+    :param structured: Return a numpy structured array instead of a dict of column arrays
+    :type structured: bool
+
+    :return: dict of column arrays or numpy structured array
+    """
+    if numpy is None:
+        raise ImportError("The column output requires numpy: `pip install numpy`")
+    values = list(zip(*rows)) if rows else [()] * len(names)
+    columns = {}
+    for name, column_values in zip(names, values):
+        dtype = COLUMN_DTYPES[name]
+        if dtype == 'float64':
+            # faster than parsing a numpy unicode array with `astype()`
+            columns[name] = numpy.fromiter(map(float, column_values), numpy.float64, len(column_values))
+        elif dtype == 'datetime64[ms]':
+            columns[name] = numpy.fromiter(column_values, numpy.int64, len(column_values)).astype(dtype)
+        else:
+            columns[name] = numpy.array(column_values, dtype=dtype)
+    if structured is False:
+        return columns
+    array = numpy.empty(len(rows), dtype=[(name, column.dtype) for name, column in columns.items()])
+    for name, column in columns.items():
+        array[name] = column
+    return array
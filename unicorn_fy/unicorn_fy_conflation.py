@@ -0,0 +1,186 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# File: unicorn_fy_conflation.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# Author: Oliver Zehentleitner
+#         https://about.me/oliver-zehentleitner
+#
+# Copyright (c) 2019-2020, Oliver Zehentleitner
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+
+from .unicorn_fy import UnicornFy
+from .unicorn_fy_sniffer import UnicornFySniffer
+import logging
+import threading
+import time
+
+
+class UnicornFyConflationBuffer(object):
+    """
+    Keep only the latest unconsumed `bookTicker` and `depth` event of every symbol
+
+    A new event of an event type and symbol replaces the queued one in place, so a consumer that lags behind gets the
+    newest state of every symbol instead of all intermediate updates and the buffer never holds more than one event
+    per symbol. Raw messages can be added as well: their event type and symbol get sniffed without decoding them
+    and only the messages that survive until `get_all()` get converted, so a burst does not cost any conversions.
+
+    Partial depth streams of the same symbol with different levels, like `@depth5` and `@depth20`, share one entry.
+
+    :param event_types: The event types that get conflated
+    :type event_types: tuple
+
+    :param min_interval_ms: Minimum time between two events of a symbol returned by `get_all()`, newer events stay
+                            queued until it expired
+    :type min_interval_ms: int
+
+    :param unicorn_fy: The `UnicornFy` class or instance that converts the raw messages
+    :type unicorn_fy: UnicornFy
+
+    :param exchange: Exchange endpoint.
+    :type exchange: str
+    """
+    def __init__(self, event_types=("bookTicker", "depth"), min_interval_ms=None, unicorn_fy=UnicornFy,
+                 exchange="binance.com"):
+        self.event_types = frozenset(event_types)
+        self.min_interval = min_interval_ms / 1000 if min_interval_ms else None
+        self.unicorn_fy = unicorn_fy
+        self.exchange = exchange
+        self.sniffer = UnicornFySniffer()
+        # (event type, symbol) -> latest event, the dict keeps the position of replaced entries
+        self.entries = {}
+        self.last_emit_times = {}
+        self.condition = threading.Condition()
+        self.stats = {'received': 0,
+                      'conflated': 0,
+                      'emitted': 0,
+                      'errors': 0}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get_all(self, timeout=0):
+        """
+        Take the queued events that are due, the oldest symbol first
+
+        With `min_interval_ms` the call sleeps until the earliest queued event is due instead of returning nothing
+        right away. Raw messages that can not be converted get logged, counted in `get_stats()` and skipped.
+
+        :param timeout: Seconds to wait for a due event, `None` to wait until one is due
+        :type timeout: float
+
+        :return: list of unicorn_fied dicts
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self.condition:
+            while True:
+                now = time.monotonic()
+                if self.min_interval is None:
+                    if self.entries:
+                        entries = list(self.entries.values())
+                        self.entries = {}
+                        break
+                    wait = None
+                else:
+                    last_emit_times = self.last_emit_times
+                    due_times = {key: last_emit_times.get(key, 0.0) + self.min_interval for key in self.entries}
+                    keys = [key for key, due_time in due_times.items() if due_time <= now]
+                    if keys:
+                        entries = [self.entries.pop(key) for key in keys]
+                        # an emit time older than `min_interval` does not delay anything, symbols that are gone
+                        # must not pile up
+                        expired_time = now - self.min_interval
+                        self.last_emit_times = {key: emit_time for key, emit_time in last_emit_times.items()
+                                                if emit_time > expired_time}
+                        for key in keys:
+                            self.last_emit_times[key] = now
+                        break
+                    wait = min(due_times.values()) - now if due_times else None
+                if deadline is not None:
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        return []
+                    wait = remaining if wait is None else min(wait, remaining)
+                self.condition.wait(wait)
+            self.stats['emitted'] += len(entries)
+        unicorn_fied_events = []
+        for entry in entries:
+            if isinstance(entry, (str, bytes)):
+                try:
+                    unicorn_fied_data = self.unicorn_fy.unicorn_fy(entry, exchange=self.exchange)
+                except Exception as error_msg:
+                    logging.error(f"UnicornFyConflationBuffer->get_all({str(entry)}) - error: {str(error_msg)}")
+                    unicorn_fied_data = None
+                # malformed messages are returned unchanged by `unicorn_fy()`
+                if unicorn_fied_data is None or unicorn_fied_data is False or unicorn_fied_data is entry:
+                    self.stats['errors'] += 1
+                    continue
+                entry = unicorn_fied_data
+            unicorn_fied_events.append(entry)
+        return unicorn_fied_events
+
+    def get_stats(self):
+        """
+        Get the counters of received, conflated (replaced), emitted and not convertible events
+
+        :return: dict
+        """
+        return dict(self.stats, queued=len(self.entries))
+
+    def put(self, unicorn_fied_data):
+        """
+        Add an event, it replaces the queued event of the same event type and symbol
+
+        :param unicorn_fied_data: The unicorn_fied dict or the received raw stream data
+        :type unicorn_fied_data: dict, str, bytes, bytearray or memoryview
+
+        :return: bool - `False` if the event type does not get conflated
+        """
+        if isinstance(unicorn_fied_data, (str, bytes, bytearray, memoryview)):
+            if not isinstance(unicorn_fied_data, (str, bytes)):
+                # the websocket layer can reuse the buffer before the message gets converted
+                unicorn_fied_data = bytes(unicorn_fied_data)
+            stream, event_type, symbol = self.sniffer.sniff(unicorn_fied_data)
+        elif unicorn_fied_data is not None:
+            event_type = unicorn_fied_data.get('event_type')
+            symbol = unicorn_fied_data.get('symbol')
+        else:
+            return False
+        if event_type not in self.event_types:
+            return False
+        key = (event_type, symbol)
+        with self.condition:
+            self.stats['received'] += 1
+            if key in self.entries:
+                self.stats['conflated'] += 1
+                self.entries[key] = unicorn_fied_data
+            else:
+                self.entries[key] = unicorn_fied_data
+                # a new symbol can be due before the one the consumer waits for
+                self.condition.notify_all()
+        return True
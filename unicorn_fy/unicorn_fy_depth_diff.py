@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# File: unicorn_fy_depth_diff.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# Author: Oliver Zehentleitner
+#         https://about.me/oliver-zehentleitner
+#
+# Copyright (c) 2019-2020, Oliver Zehentleitner
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+
+from .unicorn_fy_record import UnicornFyRecord
+
+
+def get_removed_quantity(quantity):
+    """
+    The quantity that marks a removed level, of the same type as the received quantities
+
+    :return: str, float, int or decimal.Decimal
+    """
+    return "0.00000000" if isinstance(quantity, str) else quantity.__class__(0)
+
+
+def diff_levels(last_levels, levels):
+    """
+    Get the changed, added and removed levels of one side of two partial order book snapshots
+
+    Removed levels are returned with the quantity zero, like in `depthUpdate` events.
+
+    :param last_levels: Dict of price -> quantity of the last snapshot
+    :type last_levels: dict
+
+    :param levels: Dict of price -> quantity of the new snapshot
+    :type levels: dict
+
+    :return: list of `[price, quantity]` levels
+    """
+    changed_levels = [[price, quantity] for price, quantity in levels.items() if last_levels.get(price) != quantity]
+    for price, quantity in last_levels.items():
+        if price not in levels:
+            changed_levels.append([price, get_removed_quantity(quantity)])
+    return changed_levels
+
+
+class UnicornFyDepthDiff(object):
+    """
+    Turn the partial order book snapshots of `@depth5`, `@depth10` and `@depth20` streams into diffs
+
+    The last snapshot of every stream is kept, `update()` returns only the changed, added and removed levels and
+    suppresses snapshots without a change. The first snapshot of a stream is returned in full with
+    `'is_snapshot': True`. All other events pass unchanged. Levels of `UnicornFy(levels="numpy")` get compared and
+    returned as lists. Records of `UnicornFy(output="record")` are not supported because they can not carry the
+    `is_snapshot` key.
+
+    Use it as stage of a `UnicornFyStream`:
+
+    `UnicornFy.stream(messages).map(depth_diff.update).filter(lambda data: data is not None)`
+    """
+    def __init__(self):
+        # stream -> (bids, asks) as received and as dicts of price -> quantity
+        self.snapshots = {}
+        self.stats = {'emitted': 0,
+                      'suppressed': 0}
+
+    def get_stats(self):
+        """
+        Get the counters of emitted and suppressed snapshots
+
+        :return: dict
+        """
+        return dict(self.stats)
+
+    def reset(self, stream=None):
+        """
+        Forget the last snapshot of a stream or of all streams, the next snapshot gets returned in full
+
+        :param stream: The stream name, e.g. `btcusdt@depth5`
+        :type stream: str
+        """
+        if stream is None:
+            self.snapshots.clear()
+        else:
+            self.snapshots.pop(stream, None)
+
+    def update(self, unicorn_fied_data):
+        """
+        Diff a unicorn_fied `depth` event against the last snapshot of its stream
+
+        :param unicorn_fied_data: The unicorn_fied dict or `UnicornFyView`
+        :type unicorn_fied_data: dict
+
+        :return: dict - `None` if the snapshot did not change
+        """
+        if isinstance(unicorn_fied_data, UnicornFyRecord):
+            raise TypeError("records are not supported, use the output 'dict' or 'view'")
+        if unicorn_fied_data is None or unicorn_fied_data.get('event_type') != "depth":
+            return unicorn_fied_data
+        stream = unicorn_fied_data['stream_type']
+        bids = unicorn_fied_data['bids']
+        asks = unicorn_fied_data['asks']
+        if not isinstance(bids, list):
+            # numpy arrays can not be compared with `==` and their rows can not be dict keys
+            bids = bids.tolist()
+            asks = asks.tolist()
+        last_snapshot = self.snapshots.get(stream)
+        if last_snapshot is not None and last_snapshot[0] == bids and last_snapshot[1] == asks:
+            # comparing the received lists is cheaper than building the dicts of an unchanged book
+            self.stats['suppressed'] += 1
+            return None
+        bids_levels = {price: quantity for price, quantity in bids}
+        asks_levels = {price: quantity for price, quantity in asks}
+        self.snapshots[stream] = (bids, asks, bids_levels, asks_levels)
+        self.stats['emitted'] += 1
+        diff = dict(unicorn_fied_data)
+        if last_snapshot is None:
+            diff['bids'] = bids
+            diff['asks'] = asks
+            diff['is_snapshot'] = True
+            return diff
+        diff['bids'] = diff_levels(last_snapshot[2], bids_levels)
+        diff['asks'] = diff_levels(last_snapshot[3], asks_levels)
+        diff['is_snapshot'] = False
+        return diff
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# File: unicorn_fy_json.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# Author: Oliver Zehentleitner
+#         https://about.me/oliver-zehentleitner
+#
+# Copyright (c) 2019-2020, Oliver Zehentleitner
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+
+import logging
+import os
+
+JSON_BACKEND_ENV = "UNICORN_FY_JSON_BACKEND"
+JSON_BACKEND_PRIORITY = ("orjson", "simdjson", "ujson", "json")
+
+
+def _import_json_backend(name):
+    """
+    Import a json backend and return its `loads()` function
+
+    :param name: Name of the backend: `orjson`, `simdjson`, `ujson` or `json`
+    :type name: str
+
+    :return: function or None
+    """
+    try:
+        if name == "orjson":
+            import orjson
+            return orjson.loads
+        elif name == "simdjson":
+            import simdjson
+            return simdjson.loads
+        elif name == "ujson":
+            import ujson
+            return ujson.loads
+        elif name == "json":
+            import json
+            return json.loads
+    except ImportError:
+        return None
+    return None
+
+
+JSON_BACKENDS = {}
+for _backend_name in JSON_BACKEND_PRIORITY:
+    _backend_loads = _import_json_backend(_backend_name)
+    if _backend_loads is not None:
+        JSON_BACKENDS[_backend_name] = _backend_loads
+
+
+def get_installed_json_backends():
+    """
+    Get the names of all installed json backends, the fastest first
+
+    :return: list
+    """
+    return list(JSON_BACKENDS.keys())
+
+
+def select_json_backend(name=None):
+    """
+    Select a json backend
+
+    If `name` is not provided, the environment variable `UNICORN_FY_JSON_BACKEND` is used and if that is not set
+    either the fastest installed backend gets selected.
+
+    :param name: Name of the backend: `orjson`, `simdjson`, `ujson` or `json`
+    :type name: str
+
+    :return: tuple (name, loads)
+    """
+    if name is None:
+        env_name = os.environ.get(JSON_BACKEND_ENV)
+        if env_name:
+            if env_name in JSON_BACKENDS:
+                return env_name, JSON_BACKENDS[env_name]
+            logging.warning(f"UnicornFy->select_json_backend() - json backend `{env_name}` from "
+                            f"`{JSON_BACKEND_ENV}` is not available, using `{next(iter(JSON_BACKENDS))}`")
+        name = next(iter(JSON_BACKENDS))
+    try:
+        return name, JSON_BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"json backend `{name}` is not available, installed backends: "
+                         f"{get_installed_json_backends()}")
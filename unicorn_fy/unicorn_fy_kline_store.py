@@ -0,0 +1,242 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# File: unicorn_fy_kline_store.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# Author: Oliver Zehentleitner
+#         https://about.me/oliver-zehentleitner
+#
+# Copyright (c) 2019-2020, Oliver Zehentleitner
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+
+import collections
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# the unicorn_fied keys of a kline stored as `int64` and as `float64`
+KLINE_TIME_COLUMNS = ('kline_start_time', 'kline_close_time', 'number_of_trades')
+KLINE_VALUE_COLUMNS = ('open_price', 'high_price', 'low_price', 'close_price', 'base_volume', 'quote',
+                       'taker_by_base_asset_volume', 'taker_by_quote_asset_volume')
+
+
+class KlineRingBuffer(object):
+    """
+    The closed candles of one symbol and interval in a ring buffer plus the forming candle
+
+    Every closed candle is written twice, at `index` and at `index + capacity`, so the last `n` candles are always a
+    contiguous slice of the arrays and can be returned as views without a copy.
+
+    :param capacity: Number of closed candles to keep, older candles get overwritten
+    :type capacity: int
+    """
+    __slots__ = ('capacity', 'count', 'times', 'values', 'forming_times', 'forming_values', 'has_forming',
+                 'last_closed_start_time')
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.count = 0
+        self.times = numpy.zeros((capacity * 2, len(KLINE_TIME_COLUMNS)), numpy.int64)
+        self.values = numpy.zeros((capacity * 2, len(KLINE_VALUE_COLUMNS)), numpy.float64)
+        self.forming_times = numpy.zeros(len(KLINE_TIME_COLUMNS), numpy.int64)
+        self.forming_values = numpy.zeros(len(KLINE_VALUE_COLUMNS), numpy.float64)
+        self.has_forming = False
+        self.last_closed_start_time = -1
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def close_forming(self):
+        """
+        Append the forming candle to the closed candles
+
+        :return: None
+        """
+        index = self.count % self.capacity
+        self.times[index] = self.times[index + self.capacity] = self.forming_times
+        self.values[index] = self.values[index + self.capacity] = self.forming_values
+        self.count += 1
+        self.last_closed_start_time = int(self.forming_times[0])
+        self.has_forming = False
+
+    def get_forming(self):
+        """
+        Get the forming candle
+
+        :return: dict of unicorn_fied key -> value or `None` if there is no forming candle
+        """
+        if not self.has_forming:
+            return None
+        candle = dict(zip(KLINE_TIME_COLUMNS, self.forming_times.tolist()))
+        candle.update(zip(KLINE_VALUE_COLUMNS, self.forming_values.tolist()))
+        return candle
+
+    def get_last(self, limit=None):
+        """
+        Get the last closed candles, the oldest first
+
+        :param limit: Number of candles, by default all stored ones
+        :type limit: int
+
+        :return: dict of unicorn_fied key -> numpy array view
+        """
+        limit = len(self) if limit is None else min(limit, len(self))
+        end = (self.count - 1) % self.capacity + self.capacity + 1 if self.count else self.capacity
+        times = self.times[end - limit:end]
+        values = self.values[end - limit:end]
+        columns = {name: times[:, index] for index, name in enumerate(KLINE_TIME_COLUMNS)}
+        columns.update({name: values[:, index] for index, name in enumerate(KLINE_VALUE_COLUMNS)})
+        return columns
+
+    def update(self, kline):
+        """
+        Update the forming candle with a kline and close it if the kline is final
+
+        :param kline: The `kline` section of a unicorn_fied kline event
+        :type kline: dict
+
+        :return: int - the number of closed candles
+        """
+        start_time = int(kline['kline_start_time'])
+        if start_time <= self.last_closed_start_time:
+            return 0
+        closed_candles = 0
+        if self.has_forming and start_time != self.forming_times[0]:
+            if start_time < self.forming_times[0]:
+                return 0
+            # the final kline of the forming candle was not received
+            self.close_forming()
+            closed_candles += 1
+        self.forming_times[:] = (start_time, kline['kline_close_time'], kline['number_of_trades'])
+        self.forming_values[:] = [float(kline[name]) for name in KLINE_VALUE_COLUMNS]
+        self.has_forming = True
+        if kline['is_closed']:
+            self.close_forming()
+            closed_candles += 1
+        return closed_candles
+
+
+class UnicornFyKlineStore(object):
+    """
+    Closed candles of many symbols and intervals in fixed size numpy ring buffers, fed by unicorn_fied `kline` events
+
+    The least recently updated series gets evicted as soon as more than `max_series` series are stored, so the memory
+    is limited to `max_series * get_series_size()` bytes. Requires numpy.
+
+    :param capacity: Number of closed candles to keep per symbol and interval
+    :type capacity: int
+
+    :param max_series: Maximum number of stored symbol and interval pairs, by default unlimited
+    :type max_series: int
+    """
+    def __init__(self, capacity=1000, max_series=None):
+        if numpy is None:
+            raise ImportError("The kline store requires numpy: `pip install numpy`")
+        self.capacity = capacity
+        self.max_series = max_series
+        self.series = collections.OrderedDict()
+        self.stats = {'closed_candles': 0,
+                      'evicted_series': 0}
+
+    def get_forming(self, symbol, interval):
+        """
+        Get the forming candle of a symbol and interval
+
+        :param symbol: The symbol, e.g. `BTCUSDT`
+        :type symbol: str
+
+        :param interval: The interval, e.g. `1m`
+        :type interval: str
+
+        :return: dict or `None`
+        """
+        series = self.series.get((symbol, interval))
+        return None if series is None else series.get_forming()
+
+    def get_last(self, symbol, interval, limit=None):
+        """
+        Get the last closed candles of a symbol and interval as numpy arrays, the oldest first
+
+        The arrays are views on the ring buffer, copy them to keep them beyond the next `capacity` closed candles.
+
+        :param symbol: The symbol, e.g. `BTCUSDT`
+        :type symbol: str
+
+        :param interval: The interval, e.g. `1m`
+        :type interval: str
+
+        :param limit: Number of candles, by default all stored ones
+        :type limit: int
+
+        :return: dict of unicorn_fied key -> numpy array or `None` if the series is unknown
+        """
+        series = self.series.get((symbol, interval))
+        return None if series is None else series.get_last(limit)
+
+    def get_series_size(self):
+        """
+        Get the memory used by the arrays of one symbol and interval
+
+        :return: int - bytes
+        """
+        return self.capacity * 2 * 8 * (len(KLINE_TIME_COLUMNS) + len(KLINE_VALUE_COLUMNS))
+
+    def get_stats(self):
+        """
+        Get the counters of closed candles and evicted series
+
+        :return: dict
+        """
+        return dict(self.stats, series=len(self.series))
+
+    def update(self, unicorn_fied_data):
+        """
+        Add a unicorn_fied `kline` event, other events are ignored
+
+        :param unicorn_fied_data: The unicorn_fied dict or `UnicornFyView`
+        :type unicorn_fied_data: dict
+
+        :return: int - the number of closed candles
+        """
+        if unicorn_fied_data is None or unicorn_fied_data.get('event_type') != "kline":
+            return 0
+        kline = unicorn_fied_data['kline']
+        key = (kline['symbol'], kline['interval'])
+        series = self.series.get(key)
+        if series is None:
+            series = self.series[key] = KlineRingBuffer(self.capacity)
+            if self.max_series is not None and len(self.series) > self.max_series:
+                self.series.popitem(last=False)
+                self.stats['evicted_series'] += 1
+        else:
+            self.series.move_to_end(key)
+        closed_candles = series.update(kline)
+        self.stats['closed_candles'] += closed_candles
+        return closed_candles
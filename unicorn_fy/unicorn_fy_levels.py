@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# File: unicorn_fy_levels.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# Author: Oliver Zehentleitner
+#         https://about.me/oliver-zehentleitner
+#
+# Copyright (c) 2019-2020, Oliver Zehentleitner
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+
+from .unicorn_fy_schema import NUMERIC_LEVELS_FIELDS, ConverterCompiler, Key, Parsed
+from .unicorn_fy_precision import Scaled
+import functools
+import itertools
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def parse_levels_as_array(levels):
+    """
+    Parse the `[price, quantity]` levels of an order book in one go into a `float64` array of the shape `(n, 2)`
+
+    :param levels: The levels as received
+    :type levels: list
+
+    :return: numpy.ndarray
+    """
+    # faster than `numpy.array(levels, dtype=numpy.float64)`, numpy parses strings slower than `float()`
+    return numpy.fromiter(map(float, itertools.chain.from_iterable(levels)), numpy.float64,
+                          len(levels) * 2).reshape(-1, 2)
+
+
+def scaled_levels_as_array(levels):
+    """
+    Copy the scaled integer `[price, quantity]` levels of an order book into an `int64` array of the shape `(n, 2)`
+
+    :param levels: The levels scaled by `UnicornFyPrecision`
+    :type levels: list
+
+    :return: numpy.ndarray
+    """
+    return numpy.fromiter(itertools.chain.from_iterable(levels), numpy.int64, len(levels) * 2).reshape(-1, 2)
+
+
+@functools.lru_cache(maxsize=None)
+def levels_converter(converter, event_type, levels):
+    """
+    Get a converter function that returns the `bids` and `asks` of an event type as numpy arrays
+
+    Levels that get scaled by a `UnicornFyPrecision` become `int64` arrays, all others `float64` arrays. Event types
+    without order book levels keep their converter.
+
+    :param converter: A converter function of a dispatch table
+    :type converter: function
+
+    :param event_type: The event type
+    :type event_type: str
+
+    :param levels: `numpy`
+    :type levels: str
+
+    :return: function(stream_data)
+    """
+    schema = converter.schema
+    if not any(name in NUMERIC_LEVELS_FIELDS for name, source in schema.fields):
+        return converter
+    fields = []
+    for name, source in schema.fields:
+        if name in NUMERIC_LEVELS_FIELDS and isinstance(source, Key):
+            source = Parsed(source, parse_levels_as_array)
+        elif name in NUMERIC_LEVELS_FIELDS and isinstance(source, Scaled):
+            source = Parsed(source, scaled_levels_as_array)
+        fields.append((name, source))
+    return ConverterCompiler(schema.with_fields(tuple(fields)), converter.__name__).compile()
@@ -0,0 +1,439 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# File: unicorn_fy_order_book.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# Author: Oliver Zehentleitner
+#         https://about.me/oliver-zehentleitner
+#
+# Copyright (c) 2019-2020, Oliver Zehentleitner
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+
+import bisect
+import logging
+import requests
+import threading
+import time
+
+
+def get_sort_key(price):
+    """
+    The sort key of a price: decimal strings get sorted by their float value, numbers by themselves
+
+    :return: float, int or decimal.Decimal
+    """
+    return float(price) if isinstance(price, str) else price
+
+
+class OrderBookSide(object):
+    """
+    One side of an order book: the price levels sorted in an array plus a dict of price -> level
+
+    Finding a level is a binary search, the best level is the first or the last item of the array.
+
+    :param descending: `True` for bids, `False` for asks
+    :type descending: bool
+    """
+    __slots__ = ('descending', 'keys', 'levels')
+
+    def __init__(self, descending):
+        self.descending = descending
+        self.keys = []
+        self.levels = {}
+
+    def __len__(self):
+        return len(self.keys)
+
+    def clear(self):
+        self.keys = []
+        self.levels = {}
+
+    def get_best(self):
+        """
+        Get the best level
+
+        :return: tuple (price, quantity) or None if the side is empty
+        """
+        if not self.keys:
+            return None
+        return self.levels[self.keys[-1] if self.descending else self.keys[0]]
+
+    def get_top(self, limit):
+        """
+        Get the best levels, the best first
+
+        :param limit: Max number of levels
+        :type limit: int
+
+        :return: list of tuples (price, quantity)
+        """
+        levels = self.levels
+        if self.descending:
+            return [levels[key] for key in self.keys[:-limit - 1:-1]]
+        return [levels[key] for key in self.keys[:limit]]
+
+    def update(self, levels):
+        """
+        Set the quantity of price levels, a quantity of zero removes the level
+
+        :param levels: List of `[price, quantity]`
+        :type levels: list
+
+        :return: None
+        """
+        keys = self.keys
+        for price, quantity in levels:
+            key = get_sort_key(price)
+            if get_sort_key(quantity) == 0:
+                if self.levels.pop(key, None) is not None:
+                    del keys[bisect.bisect_left(keys, key)]
+            else:
+                if key not in self.levels:
+                    bisect.insort(keys, key)
+                self.levels[key] = (price, quantity)
+
+
+class UnicornFyOrderBook(object):
+    """
+    Local order book of one symbol, fed by unicorn_fied `depth` snapshots and `depthUpdate` diffs of binance.com spot
+
+    :param symbol: The symbol, e.g. `BTCUSDT`
+    :type symbol: str
+    """
+    def __init__(self, symbol):
+        self.symbol = symbol
+        self.bids = OrderBookSide(descending=True)
+        self.asks = OrderBookSide(descending=False)
+        self.last_update_id = None
+        self.is_synced = False
+
+    def apply_snapshot(self, last_update_id, bids, asks):
+        """
+        Replace the book with a snapshot
+
+        :param last_update_id: The `lastUpdateId` of the snapshot
+        :type last_update_id: int
+
+        :param bids: List of `[price, quantity]`
+        :type bids: list
+
+        :param asks: List of `[price, quantity]`
+        :type asks: list
+
+        :return: None
+        """
+        self.bids.clear()
+        self.asks.clear()
+        self.bids.update(bids)
+        self.asks.update(asks)
+        self.last_update_id = last_update_id
+        self.is_synced = True
+
+    def apply_update(self, first_update_id, final_update_id, bids, asks):
+        """
+        Apply a diff if it continues the sequence of update ids
+
+        Diffs that are older than the book get ignored. The first diff after a snapshot has to contain the
+        `last_update_id + 1` of the snapshot, every further diff has to start at the `final_update_id + 1` of the
+        previous one.
+
+        :param first_update_id: `first_update_id_in_event` (`U`)
+        :type first_update_id: int
+
+        :param final_update_id: `final_update_id_in_event` (`u`)
+        :type final_update_id: int
+
+        :param bids: List of `[price, quantity]`
+        :type bids: list
+
+        :param asks: List of `[price, quantity]`
+        :type asks: list
+
+        :return: bool - `False` if there is a gap and the book needs a new snapshot
+        """
+        if self.is_synced is False:
+            return False
+        if final_update_id <= self.last_update_id:
+            return True
+        if first_update_id > self.last_update_id + 1:
+            logging.debug(f"UnicornFyOrderBook->apply_update() - {self.symbol}: gap between update id "
+                          f"{self.last_update_id} and {first_update_id}")
+            self.is_synced = False
+            return False
+        self.bids.update(bids)
+        self.asks.update(asks)
+        self.last_update_id = final_update_id
+        return True
+
+    def get_best_ask(self):
+        """
+        Get the lowest ask
+
+        :return: tuple (price, quantity) or None
+        """
+        return self.asks.get_best()
+
+    def get_best_bid(self):
+        """
+        Get the highest bid
+
+        :return: tuple (price, quantity) or None
+        """
+        return self.bids.get_best()
+
+    def get_top(self, limit=5):
+        """
+        Get the best bids and asks
+
+        :param limit: Max number of levels per side
+        :type limit: int
+
+        :return: dict with the keys `bids` and `asks`, each a list of tuples (price, quantity), the best first
+        """
+        return {'bids': self.bids.get_top(limit),
+                'asks': self.asks.get_top(limit)}
+
+
+class UnicornFyOrderBooks(object):
+    """
+    Keep one local order book per symbol from unicorn_fied `depth` and `depthUpdate` events of binance.com spot
+
+        order_books = UnicornFyOrderBooks(get_snapshot=UnicornFyOrderBooks.get_binance_com_snapshot)
+        for depth_update in UnicornFy().stream(ubwa.pop_stream_data_from_stream_buffer):
+            order_books.update(depth_update)
+            print(order_books.get_order_book("BTCUSDT").get_best_bid())
+
+    A book gets synced by the full snapshot of `get_snapshot`, which gets downloaded in a worker thread so the updates
+    of the other symbols go on meanwhile. Diffs that arrive while a book is not synced get buffered, the snapshot gets
+    handed back to the next `update()` of its symbol or to `apply_snapshots()` and the buffered diffs get replayed. If
+    a gap in the update ids is detected, the book gets resynced the same way.
+
+    The `depth` events of the partial book depth streams (`@depth5`, `@depth10` and `@depth20`) only contain the top
+    levels. They sync a book only without `get_snapshot` and only while the book is not synced, otherwise they get
+    ignored because they would drop the levels outside of the top.
+
+    Only one snapshot per symbol is requested at a time. After a failed resync the next request of that symbol waits
+    `resync_interval` seconds, the wait doubles with every further failure up to `max_resync_interval`, the diffs get
+    buffered meanwhile.
+
+    :param get_snapshot: Called in a worker thread with the symbol if a book needs a snapshot, returns the decoded
+                         response of the `/api/v3/depth` endpoint: a dict with the keys `lastUpdateId`, `bids` and
+                         `asks`. Without it, a book waits for the next `depth` event.
+    :type get_snapshot: function
+
+    :param max_buffer: Max number of diffs to buffer per symbol while waiting for a snapshot
+    :type max_buffer: int
+
+    :param resync_interval: Seconds to wait after a failed resync before the next snapshot of the symbol gets requested
+    :type resync_interval: float
+
+    :param max_resync_interval: Upper limit in seconds for the back off of a symbol that fails to resync repeatedly
+    :type max_resync_interval: float
+    """
+    def __init__(self, get_snapshot=None, max_buffer=1000, resync_interval=1.0, max_resync_interval=60.0):
+        self.get_snapshot = get_snapshot
+        self.max_buffer = max_buffer
+        self.resync_interval = resync_interval
+        self.max_resync_interval = max_resync_interval
+        self.order_books = {}
+        self.buffers = {}
+        # symbol -> number of failed resyncs in a row and the earliest time of the next snapshot request
+        self.resync_failures = {}
+        # shared with the worker threads: the symbols with a pending request and symbol -> downloaded snapshot or
+        # `None` if the download failed
+        self.lock = threading.Lock()
+        self.snapshots_in_flight = set()
+        self.fetched_snapshots = {}
+
+    @staticmethod
+    def get_binance_com_snapshot(symbol, limit=1000, timeout=10):
+        """
+        Download a snapshot of an order book from binance.com
+
+        :param symbol: The symbol, e.g. `BTCUSDT`
+        :type symbol: str
+
+        :param limit: Number of levels per side
+        :type limit: int
+
+        :param timeout: Seconds to wait for the response
+        :type timeout: float
+
+        :return: dict
+        """
+        respond = requests.get("https://api.binance.com/api/v3/depth", params={'symbol': symbol, 'limit': limit},
+                               timeout=timeout)
+        respond.raise_for_status()
+        return respond.json()
+
+    def get_order_book(self, symbol):
+        """
+        Get the order book of a symbol
+
+        :param symbol: The symbol, e.g. `BTCUSDT`
+        :type symbol: str
+
+        :return: UnicornFyOrderBook or None
+        """
+        return self.order_books.get(symbol)
+
+    def request_resync(self, order_book):
+        """
+        Download a snapshot of a book in a worker thread unless a snapshot of its symbol is already requested or the
+        symbol is backing off
+
+        :param order_book: The order book
+        :type order_book: UnicornFyOrderBook
+
+        :return: bool - `True` if a snapshot got requested
+        """
+        symbol = order_book.symbol
+        if self.get_snapshot is None:
+            return False
+        failures, next_request_time = self.resync_failures.get(symbol, (0, 0.0))
+        if time.monotonic() < next_request_time:
+            return False
+        with self.lock:
+            if symbol in self.snapshots_in_flight or symbol in self.fetched_snapshots:
+                return False
+            self.snapshots_in_flight.add(symbol)
+        threading.Thread(target=self.fetch_snapshot, args=(symbol,), name=f"UnicornFyOrderBooks-{symbol}",
+                         daemon=True).start()
+        return True
+
+    def fetch_snapshot(self, symbol):
+        """
+        Download a snapshot with `get_snapshot` and hand it back to the thread that calls `update()`
+
+        `request_resync()` runs it in a worker thread.
+
+        :param symbol: The symbol, e.g. `BTCUSDT`
+        :type symbol: str
+
+        :return: None
+        """
+        try:
+            snapshot = self.get_snapshot(symbol)
+        except Exception as error_msg:
+            logging.error(f"UnicornFyOrderBooks->fetch_snapshot() - {symbol}: can not get snapshot - "
+                          f"error: {str(error_msg)}")
+            snapshot = None
+        with self.lock:
+            self.fetched_snapshots[symbol] = snapshot
+            self.snapshots_in_flight.discard(symbol)
+
+    def apply_fetched_snapshot(self, order_book):
+        """
+        Sync a book with its downloaded snapshot and replay the buffered diffs
+
+        :param order_book: The order book
+        :type order_book: UnicornFyOrderBook
+
+        :return: bool - `True` if the book is synced, `None` if there is no downloaded snapshot of the symbol
+        """
+        symbol = order_book.symbol
+        with self.lock:
+            if symbol not in self.fetched_snapshots:
+                return None
+            snapshot = self.fetched_snapshots.pop(symbol)
+        if snapshot is None:
+            is_synced = False
+        else:
+            order_book.apply_snapshot(snapshot['lastUpdateId'], snapshot['bids'], snapshot['asks'])
+            is_synced = self.replay(order_book)
+        if is_synced:
+            self.resync_failures.pop(symbol, None)
+        else:
+            failures = self.resync_failures.get(symbol, (0, 0.0))[0] + 1
+            wait = min(self.resync_interval * 2 ** (failures - 1), self.max_resync_interval)
+            self.resync_failures[symbol] = (failures, time.monotonic() + wait)
+        return is_synced
+
+    def apply_snapshots(self):
+        """
+        Sync all books with their downloaded snapshots
+
+        `update()` does it for the symbol of every event, call it to sync the books of symbols without new events.
+
+        :return: None
+        """
+        with self.lock:
+            symbols = list(self.fetched_snapshots)
+        for symbol in symbols:
+            self.apply_fetched_snapshot(self.order_books[symbol])
+
+    def replay(self, order_book):
+        """
+        Apply the buffered diffs of a book after a snapshot
+
+        :param order_book: The order book
+        :type order_book: UnicornFyOrderBook
+
+        :return: bool - `True` if the book is still synced, if not the diffs from the gap on stay buffered for the
+                 next snapshot
+        """
+        buffer = self.buffers.pop(order_book.symbol, [])
+        for index, (first_update_id, final_update_id, bids, asks) in enumerate(buffer):
+            if order_book.apply_update(first_update_id, final_update_id, bids, asks) is False:
+                self.buffers[order_book.symbol] = buffer[index:]
+                return False
+        return True
+
+    def update(self, unicorn_fied_data):
+        """
+        Apply a unicorn_fied `depth` or `depthUpdate` event to the book of its symbol, other events are ignored
+
+        :param unicorn_fied_data: The unicorn_fied dict or `UnicornFyView`
+        :type unicorn_fied_data: dict
+
+        :return: UnicornFyOrderBook or None
+        """
+        event_type = unicorn_fied_data.get('event_type')
+        if event_type not in ("depth", "depthUpdate"):
+            return None
+        symbol = unicorn_fied_data['symbol']
+        order_book = self.order_books.get(symbol)
+        if order_book is None:
+            order_book = self.order_books[symbol] = UnicornFyOrderBook(symbol)
+        if self.fetched_snapshots:
+            self.apply_fetched_snapshot(order_book)
+        if event_type == "depth":
+            if self.get_snapshot is None and order_book.is_synced is False:
+                order_book.apply_snapshot(unicorn_fied_data['last_update_id'], unicorn_fied_data['bids'],
+                                          unicorn_fied_data['asks'])
+                self.replay(order_book)
+            return order_book
+        diff = (unicorn_fied_data['first_update_id_in_event'], unicorn_fied_data['final_update_id_in_event'],
+                unicorn_fied_data['bids'], unicorn_fied_data['asks'])
+        if order_book.apply_update(*diff) is False:
+            buffer = self.buffers.setdefault(symbol, [])
+            buffer.append(diff)
+            if len(buffer) > self.max_buffer:
+                del buffer[0]
+            self.request_resync(order_book)
+        return order_book
@@ -0,0 +1,253 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# File: unicorn_fy_pipeline.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# Author: Oliver Zehentleitner
+#         https://about.me/oliver-zehentleitner
+#
+# Copyright (c) 2019-2020, Oliver Zehentleitner
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+
+from .unicorn_fy import UnicornFy
+import collections
+import logging
+import threading
+import time
+
+
+class UnicornFyPipelineStage(object):
+    """
+    Bounded queue between the websocket layer and UnicornFy that converts the raw messages in micro batches
+
+    The producer adds raw messages with `put()`. A batch gets converted as soon as `max_batch_size` messages are
+    queued or `max_wait_us` microseconds after its first message arrived, whatever comes first. Either pull the
+    batches with `get_batch()` or pass a `handler` and `start()` a thread that calls it for every batch.
+
+    If the queue is full, `overflow` decides what happens to a new message:
+
+    - `block`: `put()` waits until there is space again or its timeout expires
+    - `drop_oldest`: the oldest queued message gets dropped
+    - `callback`: `on_overflow(stream_data)` gets called and the new message gets dropped, the callback can e.g.
+      reconnect the stream or spill the message to disk
+
+    :param handler: Called with `(unicorn_fied_batch, errors)` by the thread of `start()`
+    :type handler: function
+
+    :param unicorn_fy: The `UnicornFy` class or instance used for the conversion
+    :type unicorn_fy: UnicornFy
+
+    :param exchange: Exchange endpoint.
+    :type exchange: str
+
+    :param max_queue_size: Maximum number of queued raw messages
+    :type max_queue_size: int
+
+    :param max_batch_size: Maximum number of messages per batch
+    :type max_batch_size: int
+
+    :param max_wait_us: Maximum time in microseconds the first message of a batch waits for more messages
+    :type max_wait_us: int
+
+    :param overflow: `block`, `drop_oldest` or `callback`
+    :type overflow: str
+
+    :param on_overflow: Called with the new message if the queue is full and `overflow` is `callback`
+    :type on_overflow: function
+    """
+    OVERFLOWS = ("block", "drop_oldest", "callback")
+
+    def __init__(self, handler=None, unicorn_fy=UnicornFy, exchange="binance.com", max_queue_size=10000,
+                 max_batch_size=500, max_wait_us=1000, overflow="block", on_overflow=None):
+        if overflow not in self.OVERFLOWS:
+            raise ValueError(f"unknown overflow '{overflow}', use one of {', '.join(self.OVERFLOWS)}")
+        if overflow == "callback" and on_overflow is None:
+            raise ValueError("overflow='callback' requires on_overflow")
+        self.handler = handler
+        self.unicorn_fy = unicorn_fy
+        self.exchange = exchange
+        self.max_queue_size = max_queue_size
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_us / 1000000
+        self.overflow = overflow
+        self.on_overflow = on_overflow
+        # tuples of (enqueue time, raw message)
+        self.queue = collections.deque()
+        self.condition = threading.Condition()
+        self.is_stopped = False
+        self.thread = None
+        self.stats = {'received': 0,
+                      'dropped': 0,
+                      'blocked': 0,
+                      'max_queue_depth': 0,
+                      'batches': 0,
+                      'converted': 0,
+                      'errors': 0,
+                      'last_batch_size': 0,
+                      'max_batch_size': 0}
+
+    def get_batch(self, timeout=None):
+        """
+        Wait for the next micro batch and convert it
+
+        :param timeout: Seconds to wait for the first message, by default wait until one arrives or the stage stops
+        :type timeout: float
+
+        :return: tuple (list of unicorn_fied dicts, list of errors) - both lists are empty if no message arrived
+        """
+        with self.condition:
+            if not self.condition.wait_for(lambda: self.queue or self.is_stopped, timeout):
+                return [], []
+            # the oldest message waits at most `max_wait`, also if the consumer was busy when it arrived
+            deadline = self.queue[0][0] + self.max_wait if self.queue else 0.0
+            while len(self.queue) < self.max_batch_size and not self.is_stopped:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.condition.wait(remaining)
+            popleft = self.queue.popleft
+            messages = [popleft()[1] for _ in range(min(len(self.queue), self.max_batch_size))]
+            # wake up blocked producers
+            self.condition.notify_all()
+        if not messages:
+            return [], []
+        unicorn_fied_batch, errors = self.unicorn_fy.unicorn_fy_batch(messages, exchange=self.exchange)
+        stats = self.stats
+        stats['batches'] += 1
+        stats['converted'] += len(unicorn_fied_batch)
+        stats['errors'] += len(errors)
+        stats['last_batch_size'] = len(messages)
+        if len(messages) > stats['max_batch_size']:
+            stats['max_batch_size'] = len(messages)
+        return unicorn_fied_batch, errors
+
+    def get_queue_depth(self):
+        """
+        Get the number of queued raw messages
+
+        :return: int
+        """
+        return len(self.queue)
+
+    def get_stats(self):
+        """
+        Get the counters of the stage: received, dropped and converted messages, how often a producer got blocked,
+        the queue depth and the batch sizes
+
+        :return: dict
+        """
+        stats = dict(self.stats, queue_depth=len(self.queue))
+        stats['average_batch_size'] = (stats['converted'] + stats['errors']) / stats['batches'] \
+            if stats['batches'] else 0.0
+        return stats
+
+    def put(self, stream_data, timeout=None):
+        """
+        Add a raw message
+
+        :param stream_data: The received raw stream data from the Binance websocket
+        :type stream_data: str, bytes, dict or list
+
+        :param timeout: Seconds a blocked producer waits for space, by default until there is space
+        :type timeout: float
+
+        :return: bool - `False` if the message was not queued, also after `stop()` was called
+        """
+        with self.condition:
+            self.stats['received'] += 1
+            if self.is_stopped:
+                # nothing would convert it anymore
+                self.stats['dropped'] += 1
+                return False
+            if len(self.queue) >= self.max_queue_size:
+                if self.overflow == "block":
+                    self.stats['blocked'] += 1
+                    if not self.condition.wait_for(lambda: len(self.queue) < self.max_queue_size or self.is_stopped,
+                                                   timeout) or self.is_stopped:
+                        self.stats['dropped'] += 1
+                        return False
+                elif self.overflow == "drop_oldest":
+                    self.queue.popleft()
+                    self.stats['dropped'] += 1
+                else:
+                    self.stats['dropped'] += 1
+                    self.on_overflow(stream_data)
+                    return False
+            self.queue.append((time.monotonic(), stream_data))
+            queue_depth = len(self.queue)
+            if queue_depth > self.stats['max_queue_depth']:
+                self.stats['max_queue_depth'] = queue_depth
+            # the consumer waits for the first message of a batch or for a full batch
+            if queue_depth == 1 or queue_depth >= self.max_batch_size:
+                self.condition.notify_all()
+        return True
+
+    def run(self):
+        """
+        Call the handler with every batch until the stage gets stopped, the queued messages get converted first
+
+        :return: None
+        """
+        while True:
+            unicorn_fied_batch, errors = self.get_batch()
+            if unicorn_fied_batch or errors:
+                try:
+                    self.handler(unicorn_fied_batch, errors)
+                except Exception as error_msg:
+                    logging.error(f"UnicornFyPipelineStage->run() - handler error: {str(error_msg)}")
+            elif self.is_stopped and not self.queue:
+                return
+
+    def start(self):
+        """
+        Start a thread that calls the handler with every batch
+
+        :return: None
+        """
+        if self.handler is None:
+            raise ValueError("start() requires a handler")
+        self.is_stopped = False
+        self.thread = threading.Thread(target=self.run, name="UnicornFyPipelineStage", daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout=None):
+        """
+        Stop the stage, blocked producers return, `put()` rejects new messages and the thread of `start()` ends after
+        the queued messages
+
+        :param timeout: Seconds to wait for the thread
+        :type timeout: float
+
+        :return: None
+        """
+        with self.condition:
+            self.is_stopped = True
+            self.condition.notify_all()
+        if self.thread is not None:
+            self.thread.join(timeout)
+            self.thread = None
@@ -0,0 +1,311 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# File: unicorn_fy_pool.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# Author: Oliver Zehentleitner
+#         https://about.me/oliver-zehentleitner
+#
+# Copyright (c) 2019-2020, Oliver Zehentleitner
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+
+from .unicorn_fy import UnicornFy
+from .unicorn_fy_sniffer import UnicornFySniffer
+import collections
+import logging
+import multiprocessing
+import os
+import queue
+import time
+import zlib
+
+
+def run_worker(worker_id, input_queue, output_queue, exchange, unicorn_fy_options):
+    """
+    Main loop of a worker process: convert batches until the `None` sentinel is received
+
+    :param worker_id: The number of the worker
+    :type worker_id: int
+
+    :param input_queue: Batches of raw messages
+    :type input_queue: multiprocessing.Queue
+
+    :param output_queue: Tuples of `(worker_id, unicorn_fied_batch, errors, busy_seconds)`
+    :type output_queue: multiprocessing.Queue
+
+    :param exchange: Exchange endpoint.
+    :type exchange: str
+
+    :param unicorn_fy_options: Keyword arguments of the `UnicornFy` instance of the worker
+    :type unicorn_fy_options: dict
+    """
+    unicorn_fy = UnicornFy(**unicorn_fy_options)
+    while True:
+        messages = input_queue.get()
+        if messages is None:
+            output_queue.put((worker_id, None, None, 0.0))
+            return
+        start_time = time.perf_counter()
+        unicorn_fied_batch, errors = unicorn_fy.unicorn_fy_batch(messages, exchange=exchange)
+        output_queue.put((worker_id, unicorn_fied_batch, errors, time.perf_counter() - start_time))
+
+
+class UnicornFyPool(object):
+    """
+    Convert raw messages in multiple worker processes
+
+    Every message is assigned to a worker by its symbol or stream name, which is sniffed from the raw message without
+    decoding it. All messages of a symbol get converted by the same worker and their results keep the order in which
+    they were added. Messages without a symbol and a stream name get assigned round-robin. Messages are sent to the
+    workers in batches and the results come back in batches.
+
+    The results get pickled on their way back, so the workers have to return dicts: `output="view"` and
+    `output="record"` are not supported.
+
+    :param processes: Number of worker processes, by default the number of CPUs
+    :type processes: int
+
+    :param exchange: Exchange endpoint.
+    :type exchange: str
+
+    :param shard_by: `symbol` or `stream`, messages without a symbol are assigned by their stream name
+    :type shard_by: str
+
+    :param batch_size: Number of messages per batch sent to a worker
+    :type batch_size: int
+
+    :param unicorn_fy_options: Keyword arguments of the `UnicornFy` instances of the workers, e.g.
+                               `{'numeric': "float"}`
+    :type unicorn_fy_options: dict
+    """
+    # seconds between the checks for dead workers while `get_batch()` waits
+    WORKER_CHECK_INTERVAL = 0.1
+
+    def __init__(self, processes=None, exchange="binance.com", shard_by="symbol", batch_size=100,
+                 unicorn_fy_options=None):
+        if shard_by not in ("symbol", "stream"):
+            raise ValueError(f"unknown shard_by '{shard_by}', use symbol or stream")
+        unicorn_fy_options = dict(unicorn_fy_options or {})
+        if unicorn_fy_options.get('output', "dict") != "dict":
+            raise ValueError("the workers of UnicornFyPool have to use output='dict'")
+        self.processes = processes or os.cpu_count() or 1
+        self.exchange = exchange
+        self.shard_by = shard_by
+        self.batch_size = batch_size
+        self.sniffer = UnicornFySniffer()
+        self.output_queue = multiprocessing.Queue()
+        self.input_queues = []
+        self.workers = []
+        self.pending = [[] for _ in range(self.processes)]
+        self.results = collections.deque()
+        self.sent_batches = 0
+        self.received_batches = 0
+        self.next_worker_id = 0
+        self.is_closed = False
+        self.stats = [{'messages': 0,
+                       'batches': 0,
+                       'errors': 0,
+                       'busy_seconds': 0.0} for _ in range(self.processes)]
+        for worker_id in range(self.processes):
+            input_queue = multiprocessing.Queue()
+            worker = multiprocessing.Process(target=run_worker, name=f"UnicornFyPool-{worker_id}",
+                                             args=(worker_id, input_queue, self.output_queue, exchange,
+                                                   unicorn_fy_options),
+                                             daemon=True)
+            worker.start()
+            self.input_queues.append(input_queue)
+            self.workers.append(worker)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self, timeout=5.0):
+        """
+        Send the pending messages, stop the workers and wait for them
+
+        Results that are still on their way get collected and stay available with `get_batch()`. Workers that do
+        not stop within the timeout get terminated.
+
+        :param timeout: Seconds to wait for the workers
+        :type timeout: float
+
+        :return: None
+        """
+        if self.is_closed:
+            return
+        self.flush()
+        for input_queue in self.input_queues:
+            input_queue.put(None)
+        stopped_workers = set()
+        deadline = time.monotonic() + timeout
+        while len(stopped_workers) < self.processes and time.monotonic() < deadline:
+            try:
+                result = self.output_queue.get(timeout=0.1)
+            except queue.Empty:
+                # a dead worker never sends its sentinel, its last results are already in the queue
+                if not any(worker.is_alive() for worker_id, worker in enumerate(self.workers)
+                           if worker_id not in stopped_workers):
+                    break
+                continue
+            if result[1] is None:
+                stopped_workers.add(result[0])
+            else:
+                self._add_result(result)
+        for worker, input_queue in zip(self.workers, self.input_queues):
+            worker.join(max(deadline - time.monotonic(), 0.1))
+            if worker.is_alive():
+                logging.error(f"UnicornFyPool->close() - terminating {worker.name}")
+                worker.terminate()
+                worker.join()
+            if worker.exitcode != 0:
+                # batches that nobody reads would block the feeder thread of the queue forever
+                input_queue.cancel_join_thread()
+            input_queue.close()
+            input_queue.join_thread()
+        self.output_queue.close()
+        self.output_queue.join_thread()
+        self.is_closed = True
+
+    def flush(self):
+        """
+        Send the pending messages of all workers, also if their batches are not full
+
+        :return: None
+        """
+        for worker_id, messages in enumerate(self.pending):
+            if messages:
+                self._send(worker_id)
+
+    def get_batch(self, timeout=None):
+        """
+        Get the next batch of results of any worker
+
+        :param timeout: Seconds to wait for a batch, by default wait until one arrives
+        :type timeout: float
+
+        :return: tuple (list of unicorn_fied dicts, list of errors) or `None` if no batch arrived in time
+        """
+        if not self.results and not self.is_closed:
+            deadline = time.monotonic() + timeout if timeout is not None else None
+            while True:
+                wait = self.WORKER_CHECK_INTERVAL if deadline is None \
+                    else max(min(self.WORKER_CHECK_INTERVAL, deadline - time.monotonic()), 0)
+                try:
+                    self._add_result(self.output_queue.get(timeout=wait))
+                    break
+                except queue.Empty:
+                    self.check_workers()
+                    if deadline is not None and time.monotonic() >= deadline:
+                        return None
+        return self.results.popleft() if self.results else None
+
+    def check_workers(self):
+        """
+        Raise if a worker process died, its results would never arrive
+
+        :return: None
+        """
+        for worker in self.workers:
+            if not worker.is_alive():
+                raise RuntimeError(f"UnicornFyPool worker {worker.name} died with exit code {worker.exitcode}")
+
+    def get_pending_batches(self):
+        """
+        Get the number of batches sent to the workers whose results were not received yet
+
+        :return: int
+        """
+        return self.sent_batches - self.received_batches
+
+    def get_stats(self):
+        """
+        Get the counters and the throughput of every worker
+
+        :return: list of dicts
+        """
+        stats = []
+        for worker_stats in self.stats:
+            worker_stats = dict(worker_stats)
+            worker_stats['messages_per_second'] = worker_stats['messages'] / worker_stats['busy_seconds'] \
+                if worker_stats['busy_seconds'] else 0.0
+            stats.append(worker_stats)
+        return stats
+
+    def get_worker_id(self, stream_data_json):
+        """
+        Get the worker of a raw message
+
+        :param stream_data_json: The received raw stream data from the Binance websocket
+        :type stream_data_json: str or bytes
+
+        :return: int
+        """
+        stream, event_type, symbol = self.sniffer.sniff(stream_data_json)
+        shard_key = symbol if self.shard_by == "symbol" and symbol is not None else stream
+        if shard_key is None:
+            worker_id = self.next_worker_id
+            self.next_worker_id = (worker_id + 1) % self.processes
+            return worker_id
+        # crc32 instead of the salted `hash()`, a symbol gets the same worker in every run
+        return zlib.crc32(shard_key.encode()) % self.processes
+
+    def put(self, stream_data_json):
+        """
+        Add a raw message, it gets sent as soon as the batch of its worker is full
+
+        :param stream_data_json: The received raw stream data from the Binance websocket
+        :type stream_data_json: str, bytes, bytearray or memoryview
+
+        :return: None
+        """
+        if isinstance(stream_data_json, memoryview):
+            # a memoryview can not be pickled, it would get lost in the feeder thread of the queue
+            stream_data_json = bytes(stream_data_json)
+        worker_id = self.get_worker_id(stream_data_json)
+        messages = self.pending[worker_id]
+        messages.append(stream_data_json)
+        if len(messages) >= self.batch_size:
+            self._send(worker_id)
+
+    def _add_result(self, result):
+        worker_id, unicorn_fied_batch, errors, busy_seconds = result
+        worker_stats = self.stats[worker_id]
+        worker_stats['messages'] += len(unicorn_fied_batch) + len(errors)
+        worker_stats['batches'] += 1
+        worker_stats['errors'] += len(errors)
+        worker_stats['busy_seconds'] += busy_seconds
+        self.received_batches += 1
+        self.results.append((unicorn_fied_batch, errors))
+
+    def _send(self, worker_id):
+        self.input_queues[worker_id].put(self.pending[worker_id])
+        self.pending[worker_id] = []
+        self.sent_batches += 1
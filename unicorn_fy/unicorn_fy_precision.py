@@ -0,0 +1,305 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# File: unicorn_fy_precision.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# Author: Oliver Zehentleitner
+#         https://about.me/oliver-zehentleitner
+#
+# Copyright (c) 2019-2020, Oliver Zehentleitner
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+
+from .unicorn_fy_schema import ConverterCompiler, Key, symbol_from_stream
+import functools
+import json
+import logging
+
+# the fields that become scaled integers: unicorn_fied key -> `price`, `quantity` or `levels`
+SCALED_FIELDS = {'trade': {'price': 'price',
+                           'quantity': 'quantity'},
+                 'aggTrade': {'price': 'price',
+                              'quantity': 'quantity'},
+                 'bookTicker': {'best_bid_price': 'price',
+                                'best_bid_quantity': 'quantity',
+                                'best_ask_price': 'price',
+                                'best_ask_quantity': 'quantity'},
+                 'depth': {'bids': 'levels',
+                           'asks': 'levels'},
+                 'depthUpdate': {'bids': 'levels',
+                                 'asks': 'levels'},
+                 'executionReport': {'order_quantity': 'quantity',
+                                     'order_price': 'price',
+                                     'stop_price': 'price',
+                                     'iceberg_quantity': 'quantity',
+                                     'last_executed_quantity': 'quantity',
+                                     'cumulative_filled_quantity': 'quantity',
+                                     'last_executed_price': 'price'}}
+
+
+def get_decimals(size):
+    """
+    The number of decimals of a tick or step size, e.g. `2` for `"0.01000000"`
+
+    :param size: The tick or step size as received from the exchange
+    :type size: str
+
+    :return: int
+    """
+    integer, _, fraction = str(size).partition(".")
+    return len(fraction.rstrip("0"))
+
+
+def scale(value, decimals):
+    """
+    Turn a decimal string into an integer scaled by `10 ** decimals` without a detour over float
+
+    :param value: The decimal string, e.g. `"9302.01000000"`
+    :type value: str
+
+    :param decimals: The number of decimals to keep
+    :type decimals: int
+
+    :return: int - e.g. `930201` for 2 decimals
+    """
+    integer, _, fraction = str(value).partition(".")
+    if len(fraction) > decimals and fraction[decimals:].strip("0"):
+        raise ValueError(f"'{value}' has more than {decimals} decimals")
+    return int(integer + fraction[:decimals].ljust(decimals, "0"))
+
+
+class UnicornFyPrecision(object):
+    """
+    Registry of the price and quantity precision of every symbol
+
+    Prices are scaled by the decimals of the `tickSize` of the `PRICE_FILTER` and quantities by the decimals of the
+    `stepSize` of the `LOT_SIZE` filter. With a tick size of `0.01` the price `"9302.01000000"` becomes `930201`, so
+    sums and comparisons of scaled values are exact integer operations.
+
+    :param symbols: Dict of symbol -> `(tick_size, step_size)`
+    :type symbols: dict
+    """
+    def __init__(self, symbols=None):
+        self.decimals = {}
+        self.unknown_symbols = set()
+        for symbol, (tick_size, step_size) in (symbols or {}).items():
+            self.add_symbol(symbol, tick_size, step_size)
+
+    @classmethod
+    def from_exchange_info(cls, exchange_info):
+        """
+        Create a registry from the decoded response of `/api/v3/exchangeInfo` or `/fapi/v1/exchangeInfo`
+
+        :param exchange_info: The decoded exchangeInfo
+        :type exchange_info: dict
+
+        :return: UnicornFyPrecision
+        """
+        precision = cls()
+        for symbol_info in exchange_info['symbols']:
+            filters = {symbol_filter['filterType']: symbol_filter for symbol_filter in symbol_info['filters']}
+            precision.add_symbol(symbol_info['symbol'],
+                                 filters['PRICE_FILTER']['tickSize'],
+                                 filters['LOT_SIZE']['stepSize'])
+        return precision
+
+    @classmethod
+    def from_exchange_info_file(cls, path):
+        """
+        Create a registry from a local copy of the exchangeInfo
+
+        :param path: Path of the json file
+        :type path: str
+
+        :return: UnicornFyPrecision
+        """
+        with open(path, "r") as exchange_info_file:
+            return cls.from_exchange_info(json.load(exchange_info_file))
+
+    def add_symbol(self, symbol, tick_size, step_size):
+        """
+        Add or replace the precision of a symbol
+
+        :param symbol: The symbol, e.g. `BTCUSDT`
+        :type symbol: str
+
+        :param tick_size: The tick size of prices, e.g. `"0.01000000"`
+        :type tick_size: str
+
+        :param step_size: The step size of quantities, e.g. `"0.00000100"`
+        :type step_size: str
+
+        :return: None
+        """
+        self.decimals[symbol.upper()] = (get_decimals(tick_size), get_decimals(step_size))
+
+    def get_decimals(self, symbol):
+        """
+        Get the number of decimals of prices and quantities of a symbol
+
+        :param symbol: The symbol, e.g. `BTCUSDT`
+        :type symbol: str
+
+        :return: tuple (price decimals, quantity decimals)
+        """
+        try:
+            return self.decimals[symbol]
+        except KeyError:
+            raise ValueError(f"unknown precision of symbol '{symbol}'") from None
+
+    def get_event_decimals(self, symbol):
+        """
+        Get the number of decimals of prices and quantities of the symbol of a received event
+
+        Unlike `get_decimals()` an unknown symbol, e.g. a new listing, does not raise: its values stay unscaled and a
+        warning gets logged once per symbol.
+
+        :param symbol: The symbol, e.g. `BTCUSDT`
+        :type symbol: str
+
+        :return: tuple (price decimals, quantity decimals) or None
+        """
+        decimals = self.decimals.get(symbol)
+        if decimals is None and symbol not in self.unknown_symbols:
+            self.unknown_symbols.add(symbol)
+            logging.warning(f"UnicornFyPrecision->get_event_decimals({str(symbol)}) - unknown precision, keeping the "
+                            f"values of this symbol unscaled")
+        return decimals
+
+    def scale_price(self, symbol, price):
+        """
+        Turn the decimal string of a price into a scaled integer
+
+        :return: int
+        """
+        return scale(price, self.get_decimals(symbol)[0])
+
+    def scale_quantity(self, symbol, quantity):
+        """
+        Turn the decimal string of a quantity into a scaled integer
+
+        :return: int
+        """
+        return scale(quantity, self.get_decimals(symbol)[1])
+
+    def scale_levels(self, symbol, levels):
+        """
+        Turn the `[price, quantity]` levels of an order book into scaled integers
+
+        :return: list
+        """
+        return scale_levels(levels, self.get_decimals(symbol))
+
+
+class Scaled(object):
+    """
+    The value of another source as scaled integer with the precision of the symbol of the event
+
+    :param source: The source of the raw value
+    :type source: Key
+
+    :param precision: The precision registry
+    :type precision: UnicornFyPrecision
+
+    :param kind: `price`, `quantity` or `levels`
+    :type kind: str
+    """
+    def __init__(self, source, precision, kind):
+        self.source = source
+        self.precision = precision
+        self.kind = kind
+
+    def get(self, stream_data, payload):
+        value = self.source.get(stream_data, payload)
+        decimals = self.precision.get_event_decimals(get_symbol(stream_data, payload))
+        return value if decimals is None else SCALERS[self.kind](value, decimals)
+
+    def compile_expression(self, compiler, payload, depth, name):
+        # the decimals of the symbol get looked up once per event, `None` keeps the values of unknown symbols unscaled
+        decimals = compiler.local_var("decimals", f"{compiler.constant(self.precision)}.get_event_decimals("
+                                                  f"{compiler.constant(get_symbol)}(stream_data, {payload}))")
+        value = compiler.expression(self.source, payload, depth, name)
+        if self.kind == "levels":
+            scaled = f"{compiler.constant(scale_levels)}({value}, {decimals})"
+        else:
+            scaled = f"{compiler.constant(scale)}({value}, {decimals}[{0 if self.kind == 'price' else 1}])"
+        return f"({value} if {decimals} is None else {scaled})"
+
+
+def get_symbol(stream_data, payload):
+    """
+    The symbol of an event, partial depth streams like `btcusdt@depth5` have no symbol in the payload
+
+    :return: str
+    """
+    return payload['s'] if 's' in payload else symbol_from_stream(stream_data, payload)
+
+
+def scale_price(price, decimals):
+    return scale(price, decimals[0])
+
+
+def scale_quantity(quantity, decimals):
+    return scale(quantity, decimals[1])
+
+
+def scale_levels(levels, decimals):
+    price_decimals, quantity_decimals = decimals
+    return [[scale(level[0], price_decimals), scale(level[1], quantity_decimals)] for level in levels]
+
+
+SCALERS = {'price': scale_price,
+           'quantity': scale_quantity,
+           'levels': scale_levels}
+
+
+@functools.lru_cache(maxsize=256)
+def precision_converter(converter, event_type, precision):
+    """
+    Get a converter function that returns the prices and quantities of an event type as scaled integers
+
+    Event types without prices or quantities to scale keep their converter.
+
+    :param converter: A converter function of a dispatch table
+    :type converter: function
+
+    :param event_type: The event type
+    :type event_type: str
+
+    :param precision: The precision registry
+    :type precision: UnicornFyPrecision
+
+    :return: function(stream_data)
+    """
+    if event_type not in SCALED_FIELDS:
+        return converter
+    scaled_fields = SCALED_FIELDS[event_type]
+    schema = converter.schema
+    fields = tuple((name, Scaled(source, precision, scaled_fields[name]))
+                   if name in scaled_fields and isinstance(source, Key) else (name, source)
+                   for name, source in schema.fields)
+    return ConverterCompiler(schema.with_fields(fields), converter.__name__).compile()
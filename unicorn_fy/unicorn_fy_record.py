@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# File: unicorn_fy_record.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# Author: Oliver Zehentleitner
+#         https://about.me/oliver-zehentleitner
+#
+# Copyright (c) 2019-2020, Oliver Zehentleitner
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+
+from .unicorn_fy_schema import BINANCE_SCHEMAS, ConverterCompiler
+import collections
+import functools
+
+# integer codes of the event types, new event types get appended to keep the codes stable
+EVENT_CODES = {event_type: event_code for event_code, event_type in enumerate(BINANCE_SCHEMAS, start=1)}
+EVENT_TYPES = {event_code: event_type for event_type, event_code in EVENT_CODES.items()}
+
+
+class UnicornFyRecord(tuple):
+    """
+    Base class of the generated record classes
+
+    A record is a named tuple with one slot per unicorn_fied key: `record.price` or `record[3]`. The event type is
+    available as integer in `record.event_code` and the value of the `unicorn_fied` key in `record.unicorn_fied`, both
+    are attributes of the class and do not take memory per record.
+    """
+    __slots__ = ()
+    event_code = 0
+    unicorn_fied = None
+
+    def to_dict(self):
+        """
+        Copy the record into a unicorn_fied dict, nested records included
+
+        :return: dict
+        """
+        unicorn_fied_data = {name: to_dict(value) for name, value in zip(self._fields, self)}
+        if self.unicorn_fied is not None:
+            unicorn_fied_data['unicorn_fied'] = list(self.unicorn_fied)
+        return unicorn_fied_data
+
+
+def to_dict(value):
+    """
+    Convert records, also records in lists, into unicorn_fied dicts
+
+    :return: dict, list or the value itself
+    """
+    if isinstance(value, UnicornFyRecord):
+        return value.to_dict()
+    elif isinstance(value, list):
+        return [to_dict(item) for item in value]
+    return value
+
+
+def make_record_class(name, field_names, event_code=0, unicorn_fied=None):
+    """
+    Generate a record class
+
+    :param name: Name of the class
+    :type name: str
+
+    :param field_names: The unicorn_fied keys in their order
+    :type field_names: tuple
+
+    :param event_code: Integer code of the event type, `0` for nested records
+    :type event_code: int
+
+    :param unicorn_fied: The value of the `unicorn_fied` key: `(exchange, version)`, `None` for nested records
+    :type unicorn_fied: tuple
+
+    :return: class
+    """
+    return type(name, (collections.namedtuple(name, field_names), UnicornFyRecord),
+                {'__slots__': (), 'event_code': event_code, 'unicorn_fied': unicorn_fied})
+
+
+def class_name(*parts):
+    """
+    The name of a record class, e.g. `KlineKlineRecord` for the section `kline` of `kline` events
+
+    :return: str
+    """
+    words = [word for part in parts for word in part.split("_")]
+    name = "".join(word[:1].upper() + word[1:] for word in words)
+    if not name[:1].isalpha():
+        name = "Event" + name
+    return name + "Record"
+
+
+class RecordConverterCompiler(ConverterCompiler):
+    """
+    Generate the source code of a converter function that builds records instead of dicts
+
+    :param schema: The schema of the event
+    :type schema: Event
+
+    :param name: Name of the generated function
+    :type name: str
+
+    :param event_type: The event type
+    :type event_type: str
+
+    :param unicorn_fied: The value of the `unicorn_fied` key: `(exchange, version)`
+    :type unicorn_fied: tuple
+    """
+    def __init__(self, schema, name, event_type, unicorn_fied):
+        super().__init__(schema, name)
+        self.event_type = event_type
+        self.unicorn_fied = unicorn_fied
+        self.namespace['_tuple_new'] = tuple.__new__
+
+    def record_expression(self, record_class, expressions):
+        values = "".join(expression + ", " for expression in expressions)
+        return f"_tuple_new({self.constant(record_class)}, ({values}))"
+
+    def dict_expression(self, fields, payload, depth=0, name=None):
+        field_names = tuple(field_name for field_name, source in fields)
+        if name is None:
+            record_class = make_record_class(class_name(self.event_type), field_names,
+                                             EVENT_CODES.get(self.event_type, 0), self.unicorn_fied)
+        else:
+            record_class = make_record_class(class_name(self.event_type, name), field_names)
+        return self.record_expression(record_class, (self.expression(source, payload, depth, field_name)
+                                                     for field_name, source in fields))
+
+    def ticker_expression(self, item_expression):
+        record_class = make_record_class(class_name(self.event_type), ('stream_type', 'event_type', 'data'),
+                                         EVENT_CODES.get(self.event_type, 0), self.unicorn_fied)
+        return self.record_expression(record_class, ("stream", "data['e']",
+                                                     f"[{item_expression} for item in items]"))
+
+
+@functools.lru_cache(maxsize=None)
+def record_converter(converter, event_type, unicorn_fied):
+    """
+    Get a converter function that returns records instead of dicts
+
+    :param converter: A converter function of a dispatch table
+    :type converter: function
+
+    :param event_type: The event type
+    :type event_type: str
+
+    :param unicorn_fied: The value of the `unicorn_fied` key: `(exchange, version)`
+    :type unicorn_fied: tuple
+
+    :return: function(stream_data)
+    """
+    return RecordConverterCompiler(converter.schema, converter.__name__, event_type, unicorn_fied).compile()
@@ -0,0 +1,822 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# File: unicorn_fy_schema.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# Author: Oliver Zehentleitner
+#         https://about.me/oliver-zehentleitner
+#
+# Copyright (c) 2019-2020, Oliver Zehentleitner
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+
+import decimal
+import functools
+import re
+
+MISSING = object()
+
+
+class Key(object):
+    """
+    The value of a key of the received payload
+
+    :param path: The raw key, multiple keys walk into nested objects: `Key('k', 'o')` reads `payload['k']['o']`
+    :type path: str
+
+    :param default: Value to use if the key does not exist, without a default a missing key raises `KeyError`
+    :type default: any
+    """
+    def __init__(self, *path, default=MISSING):
+        self.path = path
+        self.default = default
+
+    def get(self, stream_data, payload):
+        try:
+            for key in self.path:
+                payload = payload[key]
+        except KeyError:
+            if self.default is MISSING:
+                raise
+            return self.default
+        return payload
+
+
+class Stream(object):
+    """
+    The name of the stream the payload was received from
+    """
+    def get(self, stream_data, payload):
+        return stream_data['stream']
+
+
+class Constant(object):
+    """
+    A fixed value
+
+    :param value: The value
+    :type value: any
+    """
+    def __init__(self, value):
+        self.value = value
+
+    def get(self, stream_data, payload):
+        return self.value
+
+
+class Computed(object):
+    """
+    A value derived from the received stream data
+
+    :param func: Called with the stream data and the payload
+    :type func: function
+    """
+    def __init__(self, func):
+        self.func = func
+
+    def get(self, stream_data, payload):
+        return self.func(stream_data, payload)
+
+
+class Parsed(object):
+    """
+    The value of another source, parsed by a function, e.g. a decimal string into a `float`
+
+    :param source: The source of the raw value
+    :type source: Key
+
+    :param parse: Called with the raw value
+    :type parse: function
+    """
+    def __init__(self, source, parse):
+        self.source = source
+        self.parse = parse
+
+    def get(self, stream_data, payload):
+        return self.parse(self.source.get(stream_data, payload))
+
+
+class Section(object):
+    """
+    A nested dict built from the same payload, e.g. `kline`
+
+    :param fields: The fields of the section
+    :type fields: tuple
+    """
+    def __init__(self, fields):
+        self.fields = fields
+
+    def get(self, stream_data, payload):
+        return convert_fields(self.fields, stream_data, payload)
+
+
+class Items(object):
+    """
+    A list of dicts built from a list in the payload, e.g. `balances`
+
+    :param key: The raw key of the list
+    :type key: str
+
+    :param fields: The fields of one list item
+    :type fields: tuple
+    """
+    def __init__(self, key, fields):
+        self.key = key
+        self.fields = fields
+
+    def get(self, stream_data, payload):
+        return [convert_fields(self.fields, stream_data, item) for item in payload[self.key]]
+
+
+class Event(object):
+    """
+    Schema of an event that gets converted into one flat dict
+
+    :param fields: Tuple of `(unicorn_fied_key, source)` pairs in the order of the unicorn_fied dict
+    :type fields: tuple
+    """
+    def __init__(self, fields):
+        self.fields = fields
+
+    def only(self, *names):
+        """
+        Create a copy of this schema with only the named fields in the given order
+
+        :return: Event
+        """
+        fields = dict(self.fields)
+        for name in names:
+            if name not in fields:
+                raise ValueError(f"unknown field '{name}'")
+        return self.with_fields(tuple((name, fields[name]) for name in names))
+
+    def with_fields(self, fields):
+        """
+        Create a copy of this schema with other fields
+
+        :return: Event
+        """
+        return self.__class__(fields)
+
+    def numeric(self, numeric):
+        """
+        Create a copy of this schema that parses the prices and quantities into numbers
+
+        :param numeric: `float` or `decimal`
+        :type numeric: str
+
+        :return: Event
+        """
+        return self.with_fields(parse_numeric_fields(self.fields, NUMERIC_TYPES[numeric],
+                                                     LEVELS_PARSERS[numeric]))
+
+    def without(self, *names):
+        """
+        Create a copy of this schema without the named fields
+
+        :return: Event
+        """
+        return self.with_fields(tuple(field for field in self.fields if field[0] not in names))
+
+    def convert(self, stream_data):
+        return convert_fields(self.fields, stream_data, stream_data['data'])
+
+
+class TickerEvent(Event):
+    """
+    Schema of a ticker event, the unicorn_fied dict holds a `data` list with one dict per symbol
+
+    The symbols are taken from `stream_data['items']` of `!ticker@arr` and `!miniTicker@arr` streams or from
+    `stream_data['data']` of single symbol streams.
+
+    :param fields: Tuple of `(unicorn_fied_key, source)` pairs of one symbol
+    :type fields: tuple
+
+    :param default_stream: Stream name to use if the stream data has none
+    :type default_stream: str
+    """
+    def __init__(self, fields, default_stream):
+        super().__init__(fields)
+        self.default_stream = default_stream
+
+    def with_fields(self, fields):
+        return self.__class__(fields, self.default_stream)
+
+    def convert(self, stream_data):
+        if 'stream' not in stream_data:
+            stream_data['stream'] = self.default_stream
+        items = stream_data['items'] if 'items' in stream_data else (stream_data['data'], )
+        return {'stream_type': stream_data['stream'],
+                'event_type': stream_data['data']['e'],
+                'data': [convert_fields(self.fields, stream_data, item) for item in items]}
+
+
+def convert_fields(fields, stream_data, payload):
+    """
+    Build a unicorn_fied dict from a payload
+
+    :param fields: Tuple of `(unicorn_fied_key, source)` pairs
+    :type fields: tuple
+
+    :param stream_data: The decoded stream data
+    :type stream_data: dict
+
+    :param payload: The part of the stream data the sources read from
+    :type payload: dict
+
+    :return: dict
+    """
+    return {name: source.get(stream_data, payload) for name, source in fields}
+
+
+def symbol_from_stream(stream_data, payload):
+    """
+    The symbol of streams like `btcusdt@depth5` whose payload does not contain one
+
+    :return: str
+    """
+    return stream_data['stream'][:stream_data['stream'].find('@')].upper()
+
+
+def list_status_stream(stream_data, payload):
+    """
+    The stream name of `listStatus` events, e.g. `ethusdt@listStatus`
+
+    :return: str
+    """
+    return payload['s'].lower() + "@listStatus"
+
+
+def parse_levels_as_float(levels):
+    """
+    Parse the `[price, quantity]` levels of an order book into floats
+
+    :return: list
+    """
+    return [[float(level[0]), float(level[1])] for level in levels]
+
+
+def parse_levels_as_decimal(levels):
+    """
+    Parse the `[price, quantity]` levels of an order book into `decimal.Decimal`
+
+    :return: list
+    """
+    return [[decimal.Decimal(level[0]), decimal.Decimal(level[1])] for level in levels]
+
+
+def parse_numeric_fields(fields, parse, parse_levels):
+    """
+    Wrap the sources of the numeric fields into `Parsed` sources, also in sections and lists
+
+    Only plain `Key` sources get wrapped, fields that are already parsed in another way keep their source.
+
+    :param fields: Tuple of `(unicorn_fied_key, source)` pairs
+    :type fields: tuple
+
+    :param parse: Parses one decimal string
+    :type parse: function
+
+    :param parse_levels: Parses a list of order book levels
+    :type parse_levels: function
+
+    :return: tuple of `(unicorn_fied_key, source)` pairs
+    """
+    parsed_fields = []
+    for name, source in fields:
+        if isinstance(source, Section):
+            source = Section(parse_numeric_fields(source.fields, parse, parse_levels))
+        elif isinstance(source, Items):
+            source = Items(source.key, parse_numeric_fields(source.fields, parse, parse_levels))
+        elif name in NUMERIC_FIELDS and isinstance(source, Key):
+            source = Parsed(source, parse)
+        elif name in NUMERIC_LEVELS_FIELDS and isinstance(source, Key):
+            source = Parsed(source, parse_levels)
+        parsed_fields.append((name, source))
+    return tuple(parsed_fields)
+
+
+STREAM = Stream()
+USER_DATA_STREAM = Constant('!userData@arr')
+
+# the unicorn_fied keys whose values are received as decimal strings
+NUMERIC_FIELDS = frozenset(('price', 'quantity', 'best_bid_price', 'best_bid_quantity', 'best_ask_price',
+                            'best_ask_quantity', 'open_price', 'close_price', 'high_price', 'low_price', 'base_volume',
+                            'quote', 'taker_by_base_asset_volume', 'taker_by_quote_asset_volume', 'price_change',
+                            'price_change_percent', 'weighted_average_price', 'trade_before_24h_window', 'last_price',
+                            'last_quantity', 'total_traded_base_asset_volume', 'total_traded_quote_asset_volume',
+                            'order_quantity', 'order_price', 'stop_price', 'iceberg_quantity',
+                            'last_executed_quantity', 'cumulative_filled_quantity', 'last_executed_price',
+                            'commission_amount', 'cumulative_quote_asset_transacted_quantity',
+                            'last_quote_asset_transacted_quantity', 'free', 'locked'))
+# the unicorn_fied keys whose values are lists of `[price, quantity]` decimal strings
+NUMERIC_LEVELS_FIELDS = frozenset(('bids', 'asks'))
+NUMERIC_TYPES = {'float': float,
+                 'decimal': decimal.Decimal}
+LEVELS_PARSERS = {'float': parse_levels_as_float,
+                  'decimal': parse_levels_as_decimal}
+
+# user data events are received without the `{"stream": ..., "data": ...}` wrapper
+USER_DATA_EVENTS = ('outboundAccountInfo', 'executionReport', 'outboundAccountPosition', 'listStatus')
+
+BALANCE_FIELDS = (('asset', Key('a')),
+                  ('free', Key('f')),
+                  ('locked', Key('l')))
+
+MINI_TICKER_FIELDS = (('stream_type', STREAM),
+                      ('event_type', Key('e')),
+                      ('event_time', Key('E')),
+                      ('symbol', Key('s')),
+                      ('close_price', Key('c')),
+                      ('open_price', Key('o')),
+                      ('high_price', Key('h')),
+                      ('low_price', Key('l')),
+                      ('taker_by_base_asset_volume', Key('v')),
+                      ('taker_by_quote_asset_volume', Key('q')))
+
+TICKER_FIELDS = (('stream_type', STREAM),
+                 ('event_type', Key('e')),
+                 ('event_time', Key('E')),
+                 ('symbol', Key('s')),
+                 ('price_change', Key('p')),
+                 ('price_change_percent', Key('P')),
+                 ('weighted_average_price', Key('w')),
+                 ('trade_before_24h_window', Key('x')),
+                 ('last_price', Key('c')),
+                 ('last_quantity', Key('Q')),
+                 ('best_bid_price', Key('b')),
+                 ('best_bid_quantity', Key('B')),
+                 ('best_ask_price', Key('a')),
+                 ('best_ask_quantity', Key('A')),
+                 ('open_price', Key('o')),
+                 ('high_price', Key('h')),
+                 ('low_price', Key('l')),
+                 ('total_traded_base_asset_volume', Key('v')),
+                 ('total_traded_quote_asset_volume', Key('q')),
+                 ('statistics_open_time', Key('O')),
+                 ('statistics_close_time', Key('C')),
+                 ('first_trade_id', Key('F')),
+                 ('last_trade_id', Key('L')),
+                 ('total_nr_of_trades', Key('n')))
+
+BINANCE_SCHEMAS = {
+    'aggTrade': Event((('stream_type', STREAM),
+                       ('event_type', Key('e')),
+                       ('event_time', Key('E')),
+                       ('symbol', Key('s')),
+                       ('aggregate_trade_id', Key('a')),
+                       ('price', Key('p')),
+                       ('quantity', Key('q')),
+                       ('first_trade_id', Key('f')),
+                       ('last_trade_id', Key('l')),
+                       ('trade_time', Key('T')),
+                       ('is_market_maker', Key('m')),
+                       ('ignore', Key('M')))),
+    'listStatus': Event((('stream_type', Computed(list_status_stream)),
+                         ('event_type', Key('e')),
+                         ('event_time', Key('E')),
+                         ('symbol', Key('s')),
+                         ('order_list_id', Key('g')),
+                         ('contingency_type', Key('c')),
+                         ('list_status_type', Key('l')),
+                         ('list_order_status', Key('L')),
+                         ('list_reject_reason', Key('r')),
+                         ('list_client_order_id', Key('C')),
+                         ('transaction_time', Key('T')),
+                         ('objects', Items('O', (('symbol', Key('s')),
+                                                 ('order_id', Key('i')),
+                                                 ('client_order_id', Key('c'))))))),
+    'trade': Event((('stream_type', STREAM),
+                    ('event_type', Key('e')),
+                    ('event_time', Key('E')),
+                    ('symbol', Key('s')),
+                    ('trade_id', Key('t')),
+                    ('price', Key('p')),
+                    ('quantity', Key('q')),
+                    ('buyer_order_id', Key('b')),
+                    ('seller_order_id', Key('a')),
+                    ('trade_time', Key('T')),
+                    ('is_market_maker', Key('m')),
+                    ('ignore', Key('M')))),
+    'bookTicker': Event((('stream_type', STREAM),
+                         ('order_book_update_id', Key('u')),
+                         ('symbol', Key('s')),
+                         ('best_bid_price', Key('b')),
+                         ('best_bid_quantity', Key('B')),
+                         ('best_ask_price', Key('a')),
+                         ('best_ask_quantity', Key('A')),
+                         ('event_type', Key('e')))),
+    'kline': Event((('stream_type', STREAM),
+                    ('event_type', Key('e')),
+                    ('event_time', Key('E')),
+                    ('symbol', Key('s')),
+                    ('kline', Section((('kline_start_time', Key('k', 't')),
+                                       ('kline_close_time', Key('k', 'T')),
+                                       ('symbol', Key('k', 's')),
+                                       ('interval', Key('k', 'i')),
+                                       ('first_trade_id', Key('f', default=False)),
+                                       ('last_trade_id', Key('L', default=False)),
+                                       ('open_price', Key('k', 'o')),
+                                       ('close_price', Key('k', 'c')),
+                                       ('high_price', Key('k', 'h')),
+                                       ('low_price', Key('k', 'l')),
+                                       ('base_volume', Key('k', 'v')),
+                                       ('number_of_trades', Key('k', 'n')),
+                                       ('is_closed', Key('k', 'x')),
+                                       ('quote', Key('k', 'q')),
+                                       ('taker_by_base_asset_volume', Key('k', 'V')),
+                                       ('taker_by_quote_asset_volume', Key('k', 'Q')),
+                                       ('ignore', Key('k', 'B'))))))),
+    '24hrMiniTicker': TickerEvent(MINI_TICKER_FIELDS, default_stream='!miniTicker@arr'),
+    '24hrTicker': TickerEvent(TICKER_FIELDS, default_stream='!ticker@arr'),
+    'depth': Event((('stream_type', STREAM),
+                    ('event_type', Key('e')),
+                    ('symbol', Computed(symbol_from_stream)),
+                    ('last_update_id', Key('lastUpdateId')),
+                    ('bids', Key('bids')),
+                    ('asks', Key('asks')))),
+    'depthUpdate': Event((('stream_type', STREAM),
+                          ('event_type', Key('e')),
+                          ('event_time', Key('E')),
+                          ('symbol', Key('s')),
+                          ('first_update_id_in_event', Key('U')),
+                          ('final_update_id_in_event', Key('u')),
+                          ('bids', Key('b')),
+                          ('asks', Key('a')))),
+    'outboundAccountInfo': Event((('stream_type', USER_DATA_STREAM),
+                                  ('event_type', Key('e')),
+                                  ('event_time', Key('E')),
+                                  ('maker_commission_rate', Key('m')),
+                                  ('taker_commission_rate', Key('t')),
+                                  ('buyer_commission_rate', Key('b')),
+                                  ('seller_commission_rate', Key('s')),
+                                  ('can_trade', Key('T')),
+                                  ('can_withdraw', Key('W')),
+                                  ('can_deposit', Key('D')),
+                                  ('balances', Items('B', BALANCE_FIELDS)),
+                                  ('account_permissions', Key('P')))),
+    'outboundAccountPosition': Event((('stream_type', USER_DATA_STREAM),
+                                      ('event_type', Key('e')),
+                                      ('event_time', Key('E')),
+                                      ('last_update_time', Key('u')),
+                                      ('balances', Items('B', BALANCE_FIELDS)))),
+    'executionReport': Event((('stream_type', USER_DATA_STREAM),
+                              ('event_type', Key('e')),
+                              ('event_time', Key('E')),
+                              ('symbol', Key('s')),
+                              ('client_order_id', Key('c')),
+                              ('side', Key('S')),
+                              ('order_type', Key('o')),
+                              ('time_in_force', Key('f')),
+                              ('order_quantity', Key('q')),
+                              ('order_price', Key('p')),
+                              ('stop_price', Key('P')),
+                              ('iceberg_quantity', Key('F')),
+                              ('ignore_g', Key('g')),
+                              ('original_client_order_id', Key('C')),
+                              ('current_execution_type', Key('x')),
+                              ('current_order_status', Key('X')),
+                              ('order_reject_reason', Key('r')),
+                              ('order_id', Key('i')),
+                              ('last_executed_quantity', Key('l')),
+                              ('cumulative_filled_quantity', Key('z')),
+                              ('last_executed_price', Key('L')),
+                              ('commission_amount', Key('n')),
+                              ('commission_asset', Key('N')),
+                              ('transaction_time', Key('T')),
+                              ('trade_id', Key('t')),
+                              ('ignore_I', Key('I')),
+                              ('is_order_working', Key('w')),
+                              ('is_trade_maker_side', Key('m')),
+                              ('ignore_M', Key('M')),
+                              ('order_creation_time', Key('O')),
+                              ('cumulative_quote_asset_transacted_quantity', Key('Z')),
+                              ('last_quote_asset_transacted_quantity', Key('Y')))),
+}
+
+# binance.com-futures sends the same events with less fields
+BINANCE_FUTURES_SCHEMAS = dict(BINANCE_SCHEMAS)
+BINANCE_FUTURES_SCHEMAS.update({
+    'aggTrade': BINANCE_SCHEMAS['aggTrade'].without('ignore'),
+    'trade': BINANCE_SCHEMAS['trade'].without('buyer_order_id', 'seller_order_id', 'ignore'),
+    '24hrTicker': BINANCE_SCHEMAS['24hrTicker'].without('trade_before_24h_window', 'best_bid_price',
+                                                        'best_bid_quantity', 'best_ask_price', 'best_ask_quantity'),
+    # the partial depth streams of binance.com-futures send `depthUpdate` payloads, `u` is the last update id
+    'depth': Event((('stream_type', STREAM),
+                    ('event_type', Key('e')),
+                    ('event_time', Key('E')),
+                    ('symbol', Computed(symbol_from_stream)),
+                    ('last_update_id', Key('u')),
+                    ('final_update_id_in_last_stream', Key('pu', default=None)),
+                    ('bids', Key('b')),
+                    ('asks', Key('a')))),
+    'depthUpdate': Event((('stream_type', STREAM),
+                          ('event_type', Key('e')),
+                          ('event_time', Key('E')),
+                          ('symbol', Key('s')),
+                          ('first_update_id_in_event', Key('U')),
+                          ('final_update_id_in_event', Key('u')),
+                          ('final_update_id_in_last_stream', Key('pu', default=None)),
+                          ('bids', Key('b')),
+                          ('asks', Key('a')))),
+    'outboundAccountInfo': BINANCE_SCHEMAS['outboundAccountInfo'].without('account_permissions'),
+})
+
+
+class ConverterCompiler(object):
+    """
+    Generate the source code of a straight-line converter function from an event schema
+
+    The generated function builds the unicorn_fied dict with a single dict display: no loop over the fields and the
+    payload `stream_data['data']` as well as nested objects like `data['k']` are looked up only once.
+
+    :param schema: The schema of the event
+    :type schema: Event
+
+    :param name: Name of the generated function
+    :type name: str
+    """
+    def __init__(self, schema, name):
+        self.schema = schema
+        self.name = name
+        self.namespace = {}
+        self.local_vars = {}
+
+    def constant(self, value):
+        """
+        Make an object accessible to the generated code
+
+        :return: str - the name of the object in the generated code
+        """
+        if value is None or isinstance(value, (bool, int, str)):
+            return repr(value)
+        for name, known_value in self.namespace.items():
+            if known_value is value:
+                return name
+        name = f"_const_{len(self.namespace)}"
+        self.namespace[name] = value
+        return name
+
+    def local_var(self, name, expression):
+        """
+        Evaluate an expression once at the beginning of the generated function
+
+        :param name: Preferred name of the local variable
+        :type name: str
+
+        :param expression: The python expression
+        :type expression: str
+
+        :return: str - the name of the local variable
+        """
+        if expression not in self.local_vars:
+            if not name.isidentifier() or name in self.local_vars.values():
+                name = f"_local_{len(self.local_vars)}"
+            self.local_vars[expression] = name
+        return self.local_vars[expression]
+
+    def key_expression(self, source, payload):
+        path = source.path
+        if source.default is not MISSING:
+            if len(path) == 1:
+                return f"{payload}.get({path[0]!r}, {self.constant(source.default)})"
+            return f"{self.constant(source)}.get(stream_data, {payload})"
+        if payload == "data" and len(path) > 1:
+            payload = self.local_var(f"data_{path[0]}", f"data[{path[0]!r}]")
+            path = path[1:]
+        return payload + "".join(f"[{key!r}]" for key in path)
+
+    def expression(self, source, payload, depth=0, name=None):
+        """
+        Get the python expression that reads a source from `payload`
+
+        :param name: The unicorn_fied key of the source
+        :type name: str
+
+        :return: str
+        """
+        if isinstance(source, Key):
+            return self.key_expression(source, payload)
+        elif isinstance(source, Stream):
+            return self.local_var("stream", "stream_data['stream']")
+        elif isinstance(source, Constant):
+            return self.constant(source.value)
+        elif isinstance(source, Computed):
+            return f"{self.constant(source.func)}(stream_data, {payload})"
+        elif isinstance(source, Parsed):
+            return f"{self.constant(source.parse)}({self.expression(source.source, payload, depth, name)})"
+        elif isinstance(source, Section):
+            return self.dict_expression(source.fields, payload, depth, name)
+        elif isinstance(source, Items):
+            item = f"item_{depth}"
+            return f"[{self.dict_expression(source.fields, item, depth + 1, name)} " \
+                   f"for {item} in {payload}[{source.key!r}]]"
+        elif hasattr(source, "compile_expression"):
+            # sources defined outside of this module can generate their own code
+            return source.compile_expression(self, payload, depth, name)
+        return f"{self.constant(source)}.get(stream_data, {payload})"
+
+    def dict_expression(self, fields, payload, depth=0, name=None):
+        """
+        Get the python expression that builds the unicorn_fied dict of `fields`
+
+        :param name: The unicorn_fied key of a nested section or list, `None` for the event itself
+        :type name: str
+
+        :return: str
+        """
+        return "{" + ", ".join(f"{field_name!r}: {self.expression(source, payload, depth, field_name)}"
+                               for field_name, source in fields) + "}"
+
+    def ticker_expression(self, item_expression):
+        """
+        Get the python expression that builds the result of a ticker event from the expression of one symbol
+
+        :return: str
+        """
+        return "{'stream_type': stream, 'event_type': data['e'], 'data': [" + item_expression + " for item in items]}"
+
+    def source_code(self):
+        """
+        Generate the source code of the converter function
+
+        :return: str
+        """
+        lines = [f"def {self.name}(stream_data):"]
+        if isinstance(self.schema, TickerEvent):
+            lines += ["    if 'stream' not in stream_data:",
+                      f"        stream_data['stream'] = {self.constant(self.schema.default_stream)}"]
+            result = self.ticker_expression(self.dict_expression(self.schema.fields, "item", 1, "data"))
+            self.local_var("stream", "stream_data['stream']")
+            lines += ["    data = stream_data['data']",
+                      "    items = stream_data['items'] if 'items' in stream_data else (data, )"]
+        else:
+            result = self.dict_expression(self.schema.fields, "data")
+            lines += ["    data = stream_data['data']"]
+        lines += [f"    {name} = {expression}" for expression, name in self.local_vars.items()]
+        lines += [f"    return {result}"]
+        return "\n".join(lines) + "\n"
+
+    def compile(self):
+        """
+        Compile the converter function
+
+        :return: function(stream_data) - the generated source code is available in its attribute `source_code` and
+                 the schema in `schema`
+        """
+        source_code = self.source_code()
+        exec(compile(source_code, f"<unicorn_fy converter {self.name}>", "exec"), self.namespace)
+        converter = self.namespace[self.name]
+        converter.schema = self.schema
+        converter.source_code = source_code
+        return converter
+
+
+@functools.lru_cache(maxsize=None)
+def compile_converter(schema, event_type):
+    """
+    Get the compiled converter function of a schema, every schema gets compiled only once
+
+    :param schema: The schema of the event
+    :type schema: Event
+
+    :param event_type: The event type, used for the name of the function
+    :type event_type: str
+
+    :return: function(stream_data)
+    """
+    return ConverterCompiler(schema, "convert_" + re.sub(r"\W", "_", event_type)).compile()
+
+
+@functools.lru_cache(maxsize=None)
+def project_converter(converter, names):
+    """
+    Get a compiled converter function that builds only the named fields of the unicorn_fied dict
+
+    The fields of ticker events are the fields of one symbol in the `data` list.
+
+    :param converter: A converter function of a dispatch table
+    :type converter: function
+
+    :param names: The unicorn_fied keys to build
+    :type names: tuple
+
+    :return: function(stream_data)
+    """
+    return ConverterCompiler(converter.schema.only(*names), converter.__name__).compile()
+
+
+def project_converters(converters, fields):
+    """
+    Create a copy of a dispatch table whose converters build only the requested fields
+
+    :param converters: Dispatch table of the exchange variant: event type -> converter
+    :type converters: dict
+
+    :param fields: Dict of event type -> list of unicorn_fied keys, e.g. `{'trade': ['symbol', 'price']}`, event
+                   types that are not listed get converted completely
+    :type fields: dict
+
+    :return: dict of event type -> function(stream_data)
+    """
+    projected_converters = dict(converters)
+    for event_type, names in fields.items():
+        if event_type not in converters:
+            raise ValueError(f"unknown event type '{event_type}'")
+        projected_converters[event_type] = project_converter(converters[event_type], tuple(names))
+    return projected_converters
+
+
+def get_fields_key(fields):
+    """
+    Get a hashable key of a `fields` dict
+
+    :param fields: Dict of event type -> list of unicorn_fied keys
+    :type fields: dict
+
+    :return: frozenset
+    """
+    return frozenset((event_type, tuple(names)) for event_type, names in fields.items())
+
+
+class DerivedConverters(dict):
+    """
+    Dispatch table whose converter functions get derived from the converters of another table on first use
+
+    :param converters: Dispatch table of the exchange variant: event type -> converter
+    :type converters: dict
+
+    :param derive: Called with the converter, the event type and `argument`, returns the derived converter
+    :type derive: function
+
+    :param argument: Passed to `derive`, e.g. the value of the `unicorn_fied` key: `(exchange, version)`
+    :type argument: any hashable object
+    """
+    def __init__(self, converters, derive, argument):
+        super().__init__()
+        self.converters = converters
+        self.derive = derive
+        self.argument = argument
+
+    def __missing__(self, event_type):
+        converter = self[event_type] = self.derive(self.converters[event_type], event_type, self.argument)
+        return converter
+
+
+@functools.lru_cache(maxsize=None)
+def numeric_converter(converter, event_type, numeric):
+    """
+    Get a compiled converter function that parses the prices and quantities into numbers
+
+    :param converter: A converter function of a dispatch table
+    :type converter: function
+
+    :param event_type: The event type
+    :type event_type: str
+
+    :param numeric: `float` or `decimal`
+    :type numeric: str
+
+    :return: function(stream_data)
+    """
+    return ConverterCompiler(converter.schema.numeric(numeric), converter.__name__).compile()
+
+
+def build_converters(schemas):
+    """
+    Build the dispatch table of an exchange variant
+
+    :param schemas: Dict of event type -> schema
+    :type schemas: dict
+
+    :return: dict of event type -> function(stream_data)
+    """
+    return {event_type: compile_converter(schema, event_type) for event_type, schema in schemas.items()}
+
+
+BINANCE_CONVERTERS = build_converters(BINANCE_SCHEMAS)
+BINANCE_FUTURES_CONVERTERS = build_converters(BINANCE_FUTURES_SCHEMAS)
@@ -0,0 +1,340 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# File: unicorn_fy_shared_memory.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# Author: Oliver Zehentleitner
+#         https://about.me/oliver-zehentleitner
+#
+# Copyright (c) 2019-2020, Oliver Zehentleitner
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+
+from .unicorn_fy import UnicornFy
+from .unicorn_fy_record import EVENT_CODES, class_name, make_record_class
+import os
+import struct
+import sys
+
+try:
+    from multiprocessing import resource_tracker, shared_memory
+except ImportError:
+    resource_tracker = shared_memory = None
+
+# the binary layout of the records: event type -> tuple of (unicorn_fied key, struct format)
+# a kline is stored flat, its symbol is the symbol of the event
+SHARED_RECORD_LAYOUTS = {
+    'trade': (('symbol', '16s'), ('event_time', 'q'), ('trade_id', 'q'), ('price', 'd'), ('quantity', 'd'),
+              ('buyer_order_id', 'q'), ('seller_order_id', 'q'), ('trade_time', 'q'), ('is_market_maker', '?')),
+    'aggTrade': (('symbol', '16s'), ('event_time', 'q'), ('aggregate_trade_id', 'q'), ('price', 'd'),
+                 ('quantity', 'd'), ('first_trade_id', 'q'), ('last_trade_id', 'q'), ('trade_time', 'q'),
+                 ('is_market_maker', '?')),
+    'bookTicker': (('symbol', '16s'), ('order_book_update_id', 'q'), ('best_bid_price', 'd'),
+                   ('best_bid_quantity', 'd'), ('best_ask_price', 'd'), ('best_ask_quantity', 'd')),
+    'kline': (('symbol', '16s'), ('event_time', 'q'), ('interval', '4s'), ('kline_start_time', 'q'),
+              ('kline_close_time', 'q'), ('open_price', 'd'), ('close_price', 'd'), ('high_price', 'd'),
+              ('low_price', 'd'), ('base_volume', 'd'), ('number_of_trades', 'q'), ('is_closed', '?'),
+              ('quote', 'd'), ('taker_by_base_asset_volume', 'd'), ('taker_by_quote_asset_volume', 'd')),
+}
+# the header of the buffer: number of written records, capacity, size of a slot
+HEADER = struct.Struct("<QQQ")
+WRITE_COUNT = struct.Struct("<Q")
+# the head of a slot: sequence number of the record (1 for the first one), event code
+SLOT_HEAD = struct.Struct("<QB")
+
+
+class SharedRecordLayout(object):
+    """
+    Packs unicorn_fied events of one event type into a slot of the buffer and unpacks them into records
+
+    :param event_type: The event type
+    :type event_type: str
+    """
+    def __init__(self, event_type):
+        fields = SHARED_RECORD_LAYOUTS[event_type]
+        self.event_type = event_type
+        self.event_code = EVENT_CODES[event_type]
+        self.names = tuple(name for name, fmt in fields)
+        self.formats = tuple(fmt for name, fmt in fields)
+        self.struct = struct.Struct("<" + "".join(self.formats))
+        self.record_class = make_record_class(class_name("shared", event_type), self.names, self.event_code)
+        self.text_positions = tuple(index for index, fmt in enumerate(self.formats) if fmt.endswith("s"))
+        self.pack_into = self.compile_packer()
+
+    def compile_packer(self):
+        """
+        Generate a straight-line function that packs a unicorn_fied event into a slot
+
+        The texts get checked first: a text that does not fit its field raises `ValueError` before the slot is
+        touched. Then the slot gets invalidated and the record gets written, the caller validates the slot again.
+
+        :return: function(buffer, slot_offset, unicorn_fied_data)
+        """
+        source_code = "def pack_into(buffer, offset, data):\n"
+        if self.event_type == "kline":
+            source_code += "    kline = data['kline']\n"
+        values = []
+        for name, fmt in zip(self.names, self.formats):
+            payload = "kline" if self.event_type == "kline" and name not in ('symbol', 'event_time') else "data"
+            value = f"{payload}[{name!r}]"
+            if fmt.endswith("s"):
+                size = int(fmt[:-1])
+                source_code += (f"    {name} = {value}.encode()\n"
+                                f"    if len({name}) > {size}:\n"
+                                f"        raise ValueError(f'{name} {{{name}!r}} is longer than {size} bytes')\n")
+                value = name
+            elif fmt == "d":
+                value = f"float({value})"
+            values.append(value)
+        source_code += (f"    slot_head_pack_into(buffer, offset, 0, {self.event_code})\n"
+                        f"    struct_pack_into(buffer, offset + {SLOT_HEAD.size}, {', '.join(values)})\n")
+        namespace = {'slot_head_pack_into': SLOT_HEAD.pack_into,
+                     'struct_pack_into': self.struct.pack_into}
+        exec(compile(source_code, f"<shared {self.event_type} record>", "exec"), namespace)
+        return namespace['pack_into']
+
+    def unpack_from(self, buffer, offset):
+        values = self.struct.unpack_from(buffer, offset)
+        if self.text_positions:
+            values = list(values)
+            for index in self.text_positions:
+                values[index] = values[index].rstrip(b"\0").decode()
+        return self.record_class._make(values)
+
+
+SHARED_RECORDS = {event_type: SharedRecordLayout(event_type) for event_type in SHARED_RECORD_LAYOUTS}
+SHARED_RECORDS_BY_CODE = {layout.event_code: layout for layout in SHARED_RECORDS.values()}
+# every slot fits the largest record
+SLOT_SIZE = (SLOT_HEAD.size + max(layout.struct.size for layout in SHARED_RECORDS.values()) + 7) // 8 * 8
+
+
+# before python 3.13 every process that attaches a block registers it at the resource tracker, which unlinks it as
+# soon as that process ends, and a forked reader shares the tracker of the producer. So the block does not stay
+# registered at all and the producer unlinks it explicitly.
+MANUAL_TRACKING = os.name == "posix" and sys.version_info < (3, 13)
+
+
+def attach_shared_memory(name):
+    """
+    Attach to an existing shared memory block without letting this process remove it on exit
+
+    :param name: The name of the block
+    :type name: str
+
+    :return: multiprocessing.shared_memory.SharedMemory
+    """
+    if not MANUAL_TRACKING:
+        return shared_memory.SharedMemory(name, **({'track': False} if sys.version_info >= (3, 13) else {}))
+    block = shared_memory.SharedMemory(name)
+    resource_tracker.unregister(block._name, "shared_memory")
+    return block
+
+
+def create_shared_memory(name, size):
+    """
+    Create a shared memory block
+
+    :param name: The name of the block, `None` for a random one
+    :type name: str
+
+    :param size: Size in bytes
+    :type size: int
+
+    :return: multiprocessing.shared_memory.SharedMemory
+    """
+    block = shared_memory.SharedMemory(name=name, create=True, size=size)
+    if MANUAL_TRACKING:
+        resource_tracker.unregister(block._name, "shared_memory")
+    return block
+
+
+def unlink_shared_memory(block):
+    """
+    Remove a shared memory block created by `create_shared_memory()`
+
+    :param block: The block
+    :type block: multiprocessing.shared_memory.SharedMemory
+
+    :return: None
+    """
+    if MANUAL_TRACKING:
+        # `unlink()` unregisters the block
+        resource_tracker.register(block._name, "shared_memory")
+    block.unlink()
+
+
+class UnicornFySharedRingBuffer(object):
+    """
+    Hand over unicorn_fied `trade`, `aggTrade`, `bookTicker` and `kline` events to other processes without pickling
+
+    A single producer writes the events as fixed size binary records into a ring buffer in shared memory, any number
+    of `UnicornFySharedRingBufferReader` instances read them with their own cursor. Prices and quantities are stored
+    as `float`. The producer never waits for the readers: a reader that falls behind by more than `capacity`
+    records loses the overwritten ones and gets them counted as overrun. Requires python 3.8 or newer.
+
+    :param name: Name of the shared memory block, by default a random one
+    :type name: str
+
+    :param capacity: Number of records in the ring buffer
+    :type capacity: int
+    """
+    def __init__(self, name=None, capacity=65536):
+        if shared_memory is None:
+            raise ImportError("The shared ring buffer requires multiprocessing.shared_memory (python 3.8+)")
+        self.capacity = capacity
+        self.shared_memory = create_shared_memory(name, HEADER.size + capacity * SLOT_SIZE)
+        self.name = self.shared_memory.name
+        self.buffer = self.shared_memory.buf
+        self.write_count = 0
+        HEADER.pack_into(self.buffer, 0, 0, capacity, SLOT_SIZE)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        self.unlink()
+
+    def close(self):
+        """
+        Detach this process from the shared memory block
+
+        :return: None
+        """
+        self.buffer = None
+        self.shared_memory.close()
+
+    def put(self, unicorn_fied_data):
+        """
+        Write a unicorn_fied event into the ring buffer
+
+        :param unicorn_fied_data: The unicorn_fied dict or `UnicornFyView` with prices and quantities as `str` or
+                                  numbers
+        :type unicorn_fied_data: dict
+
+        :return: bool - `False` if the event type can not be stored, raises `ValueError` if a text like the symbol
+                 does not fit its field
+        """
+        layout = SHARED_RECORDS.get(unicorn_fied_data.get('event_type')) if unicorn_fied_data is not None else None
+        if layout is None:
+            return False
+        sequence = self.write_count + 1
+        offset = HEADER.size + self.write_count % self.capacity * SLOT_SIZE
+        # the slot gets invalidated first, so a reader that reads it while it gets overwritten detects the overrun
+        layout.pack_into(self.buffer, offset, unicorn_fied_data)
+        SLOT_HEAD.pack_into(self.buffer, offset, sequence, layout.event_code)
+        self.write_count = sequence
+        WRITE_COUNT.pack_into(self.buffer, 0, sequence)
+        return True
+
+    def unlink(self):
+        """
+        Remove the shared memory block, call it once after the producer and all readers are done
+
+        :return: None
+        """
+        unlink_shared_memory(self.shared_memory)
+
+
+class UnicornFySharedRingBufferReader(object):
+    """
+    Read the records of a `UnicornFySharedRingBuffer` of another process
+
+    The records are `UnicornFyRecord` named tuples, use `to_dict()` to get dicts.
+
+    :param name: Name of the shared memory block: `UnicornFySharedRingBuffer.name`
+    :type name: str
+
+    :param from_start: Start with the oldest record that is still in the buffer instead of the next new one
+    :type from_start: bool
+    """
+    def __init__(self, name, from_start=False):
+        if shared_memory is None:
+            raise ImportError("The shared ring buffer requires multiprocessing.shared_memory (python 3.8+)")
+        self.shared_memory = attach_shared_memory(name)
+        self.buffer = self.shared_memory.buf
+        write_count, self.capacity, self.slot_size = HEADER.unpack_from(self.buffer, 0)
+        self.read_count = max(write_count - self.capacity, 0) if from_start else write_count
+        self.overruns = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Detach this process from the shared memory block
+
+        :return: None
+        """
+        self.buffer = None
+        self.shared_memory.close()
+
+    def get_lag(self):
+        """
+        Get the number of written records this reader did not read yet
+
+        :return: int
+        """
+        return WRITE_COUNT.unpack_from(self.buffer, 0)[0] - self.read_count
+
+    def read(self, max_records=None):
+        """
+        Read the new records
+
+        :param max_records: Upper limit of records to read
+        :type max_records: int
+
+        :return: list of records
+        """
+        buffer = self.buffer
+        write_count = WRITE_COUNT.unpack_from(buffer, 0)[0]
+        if write_count - self.read_count > self.capacity:
+            # the oldest unread records got overwritten
+            self.overruns += write_count - self.capacity - self.read_count
+            self.read_count = write_count - self.capacity
+        if max_records is not None:
+            write_count = min(write_count, self.read_count + max_records)
+        records = []
+        while self.read_count < write_count:
+            sequence = self.read_count + 1
+            offset = HEADER.size + self.read_count % self.capacity * self.slot_size
+            slot_sequence, event_code = SLOT_HEAD.unpack_from(buffer, offset)
+            record = SHARED_RECORDS_BY_CODE[event_code].unpack_from(buffer, offset + SLOT_HEAD.size) \
+                if slot_sequence == sequence else None
+            if record is None or SLOT_HEAD.unpack_from(buffer, offset)[0] != sequence:
+                # the slot got overwritten before or while it was read, continue with the oldest record
+                newest_count = WRITE_COUNT.unpack_from(buffer, 0)[0]
+                self.overruns += max(newest_count - self.capacity, sequence) - self.read_count
+                self.read_count = max(newest_count - self.capacity, sequence)
+                write_count = max(write_count, self.read_count)
+                continue
+            records.append(record)
+            self.read_count = sequence
+        return records
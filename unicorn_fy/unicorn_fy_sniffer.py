@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# File: unicorn_fy_sniffer.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# Author: Oliver Zehentleitner
+#         https://about.me/oliver-zehentleitner
+#
+# Copyright (c) 2019-2020, Oliver Zehentleitner
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+
+import fnmatch
+import re
+
+
+class UnicornFySniffer(object):
+    """
+    Drop unwanted raw messages before they get decoded
+
+    The sniffer only looks at the raw `str` or `bytes` received from the websocket: it reads the value of `"stream":`,
+    the first `"e":` and the first `"s":` with plain substring searches. Messages it can not classify, like results,
+    errors or already decoded objects, always pass.
+
+    :param event_types: Allowed event types, e.g. `['trade', 'depthUpdate']`
+    :type event_types: list
+
+    :param symbols: Allowed symbols, e.g. `['BTCUSDT']`. Array streams like `!ticker@arr` and events without a
+                    symbol are not filtered by symbol.
+    :type symbols: list
+
+    :param stream_patterns: Allowed stream names as shell-style wildcard patterns, e.g. `['*@depth@100ms']`
+    :type stream_patterns: list
+    """
+    STREAM_EVENT_TYPES = (("!ticker@arr", "24hrTicker"),
+                          ("!miniTicker@arr", "24hrMiniTicker"),
+                          ("@depth5", "depth"),
+                          ("@depth10", "depth"),
+                          ("@depth20", "depth"),
+                          ("@bookTicker", "bookTicker"))
+
+    def __init__(self, event_types=None, symbols=None, stream_patterns=None):
+        self.event_types = frozenset(event_types) if event_types is not None else None
+        self.symbols = frozenset(symbol.upper() for symbol in symbols) if symbols is not None else None
+        if stream_patterns is not None:
+            self.stream_regex = re.compile("|".join(fnmatch.translate(pattern) for pattern in stream_patterns))
+        else:
+            self.stream_regex = None
+        self.stats = {'passed': 0,
+                      'skipped': 0,
+                      'skipped_by_event_type': 0,
+                      'skipped_by_symbol': 0,
+                      'skipped_by_stream': 0}
+
+    @staticmethod
+    def _get_value(stream_data_json, marker, quote):
+        start = stream_data_json.find(marker)
+        if start == -1:
+            return None
+        start += len(marker)
+        return stream_data_json[start:stream_data_json.find(quote, start)]
+
+    def accept(self, stream_data_json):
+        """
+        Decide if a raw message gets decoded and converted
+
+        :param stream_data_json: The received raw stream data from the Binance websocket
+        :type stream_data_json: str, bytes, bytearray or memoryview
+
+        :return: bool
+        """
+        stream, event_type, symbol = self.sniff(stream_data_json)
+        if stream is not None and self.stream_regex is not None and self.stream_regex.match(stream) is None:
+            self.stats['skipped_by_stream'] += 1
+        elif event_type is not None and self.event_types is not None and event_type not in self.event_types:
+            self.stats['skipped_by_event_type'] += 1
+        elif symbol is not None and self.symbols is not None and symbol not in self.symbols:
+            self.stats['skipped_by_symbol'] += 1
+        else:
+            self.stats['passed'] += 1
+            return True
+        self.stats['skipped'] += 1
+        return False
+
+    def get_stats(self):
+        """
+        Get the counters of passed and skipped messages
+
+        :return: dict
+        """
+        return dict(self.stats)
+
+    def sniff(self, stream_data_json):
+        """
+        Read the stream name, the event type and the symbol of a raw message without decoding it
+
+        :param stream_data_json: The received raw stream data from the Binance websocket
+        :type stream_data_json: str, bytes, bytearray or memoryview
+
+        :return: tuple (stream, event_type, symbol) - every value is `None` if it is unknown
+        """
+        if isinstance(stream_data_json, str):
+            stream = self._get_value(stream_data_json, '"stream":"', '"')
+            event_type = self._get_value(stream_data_json, '"e":"', '"')
+            symbol = self._get_value(stream_data_json, '"s":"', '"')
+            is_array = stream_data_json.startswith("[")
+        elif isinstance(stream_data_json, (bytes, bytearray, memoryview)):
+            if isinstance(stream_data_json, memoryview):
+                stream_data_json = stream_data_json.tobytes()
+            stream = self._get_value(stream_data_json, b'"stream":"', b'"')
+            event_type = self._get_value(stream_data_json, b'"e":"', b'"')
+            symbol = self._get_value(stream_data_json, b'"s":"', b'"')
+            stream = stream.decode() if stream is not None else None
+            event_type = event_type.decode() if event_type is not None else None
+            symbol = symbol.decode() if symbol is not None else None
+            is_array = stream_data_json.startswith(b"[")
+        else:
+            return None, None, None
+        if is_array:
+            return stream, event_type, None
+        if stream is not None:
+            for stream_part, stream_event_type in self.STREAM_EVENT_TYPES:
+                if stream_part in stream:
+                    event_type = stream_event_type
+                    break
+            if stream.startswith("!"):
+                symbol = None
+            elif "@" in stream:
+                symbol = stream[:stream.find("@")].upper()
+        return stream, event_type, symbol
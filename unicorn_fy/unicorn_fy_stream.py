@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# File: unicorn_fy_stream.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# Author: Oliver Zehentleitner
+#         https://about.me/oliver-zehentleitner
+#
+# Copyright (c) 2019-2020, Oliver Zehentleitner
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+
+import time
+
+
+class UnicornFyStream(object):
+    """
+    Lazy pipeline that converts raw messages one by one and passes them through chained `filter()` and `map()` stages
+
+    Use `UnicornFy.stream()` to create it.
+
+    :param unicorn_fy: The `UnicornFy` class or instance used for the conversion
+    :type unicorn_fy: UnicornFy
+
+    :param source: An iterable of raw messages or a callable that returns the next raw message or `False`/`None`
+    :type source: iterable or function
+
+    :param exchange: Exchange endpoint.
+    :type exchange: str
+
+    :param stop: Called before every poll of the source, the pipeline ends as soon as it returns `True`
+    :type stop: function
+
+    :param errors: Collects the errors of messages that could not be converted
+    :type errors: list or collections.deque
+
+    :param max_idle_sleep: Upper limit in seconds for the back off while a callable source is idle
+    :type max_idle_sleep: float
+
+    :param fields: Build only the listed keys of the unicorn_fied dicts of these event types
+    :type fields: dict
+    """
+    MIN_IDLE_SLEEP = 0.0001
+
+    def __init__(self, unicorn_fy, source, exchange="binance.com", stop=None, errors=None, max_idle_sleep=0.01,
+                 fields=None):
+        self.unicorn_fy = unicorn_fy
+        self.source = source
+        self.exchange = exchange
+        self.stop = stop
+        self.errors = errors
+        self.max_idle_sleep = max_idle_sleep
+        self.fields = fields
+        self.stages = []
+
+    def __iter__(self):
+        stages = tuple(self.stages)
+        for unicorn_fied_data in self.unicorn_fy.unicorn_fy_iter(self.get_messages(), exchange=self.exchange,
+                                                                 errors=self.errors, fields=self.fields):
+            for is_filter, func in stages:
+                if is_filter:
+                    if not func(unicorn_fied_data):
+                        break
+                else:
+                    unicorn_fied_data = func(unicorn_fied_data)
+            else:
+                yield unicorn_fied_data
+
+    def filter(self, func):
+        """
+        Add a stage that drops all items for which `func(item)` is false
+
+        :param func: The filter function
+        :type func: function
+
+        :return: UnicornFyStream
+        """
+        self.stages.append((True, func))
+        return self
+
+    def get_messages(self):
+        """
+        Get the raw messages of the source
+
+        A callable source gets polled, while it is idle the sleep between two polls starts at
+        `MIN_IDLE_SLEEP` and doubles up to `max_idle_sleep`, so a message that arrives after a short break is not
+        delayed by the full idle sleep. `stop` is checked before every message, also while the source is busy.
+
+        :return: generator
+        """
+        stop = self.stop
+        if not callable(self.source):
+            for message in self.source:
+                if stop is not None and stop():
+                    return
+                yield message
+            return
+        idle_sleep = self.MIN_IDLE_SLEEP
+        while True:
+            if stop is not None and stop():
+                return
+            message = self.source()
+            if message is False or message is None:
+                time.sleep(idle_sleep)
+                idle_sleep = min(idle_sleep * 2, self.max_idle_sleep)
+                continue
+            idle_sleep = self.MIN_IDLE_SLEEP
+            yield message
+
+    def map(self, func):
+        """
+        Add a stage that replaces every item with `func(item)`
+
+        :param func: The map function
+        :type func: function
+
+        :return: UnicornFyStream
+        """
+        self.stages.append((False, func))
+        return self
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# File: unicorn_fy_ticker_changes.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# Author: Oliver Zehentleitner
+#         https://about.me/oliver-zehentleitner
+#
+# Copyright (c) 2019-2020, Oliver Zehentleitner
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+
+from .unicorn_fy_precision import Scaled
+from .unicorn_fy_schema import NUMERIC_FIELDS, Key, Parsed
+import operator
+
+# the event types of ticker arrays that can be reduced to the changed symbols
+TICKER_CHANGES_EVENT_TYPES = ('24hrTicker', '24hrMiniTicker')
+
+
+def get_fingerprint_keys(fields):
+    """
+    Get the raw keys of the prices and volumes of a ticker schema
+
+    Sources that parse or scale a raw value (`numeric` and `precision` options) get unwrapped to the raw key.
+
+    :param fields: Tuple of `(unicorn_fied_key, source)` pairs of one symbol
+    :type fields: tuple
+
+    :return: tuple of raw keys
+    """
+    fingerprint_keys = []
+    for name, source in fields:
+        if name not in NUMERIC_FIELDS:
+            continue
+        while isinstance(source, (Parsed, Scaled)):
+            source = source.source
+        if isinstance(source, Key) and len(source.path) == 1:
+            fingerprint_keys.append(source.path[0])
+    return tuple(fingerprint_keys)
+
+
+def ticker_changes_converter(converter, event_type, fingerprints):
+    """
+    Get a converter function that converts only the symbols of a ticker event whose prices or volumes changed
+
+    The fingerprint of a symbol is the hash of its raw price and volume strings, it is stored per stream in
+    `fingerprints` and compared before a symbol gets converted. Symbols whose timestamps moved but nothing else are
+    skipped. A symbol of `btcusdt@ticker` and the same symbol of `!ticker@arr` are compared separately.
+
+    :param converter: A converter function of a dispatch table
+    :type converter: function
+
+    :param event_type: The event type
+    :type event_type: str
+
+    :param fingerprints: Dict of event type -> dict of stream -> dict of symbol -> fingerprint of the last converted
+                         state
+    :type fingerprints: dict
+
+    :return: function(stream_data)
+    """
+    fingerprint_keys = get_fingerprint_keys(converter.schema.fields)
+    if event_type not in TICKER_CHANGES_EVENT_TYPES or not fingerprint_keys:
+        return converter
+    get_fingerprint = operator.itemgetter(*fingerprint_keys)
+    default_stream = converter.schema.default_stream
+    stream_fingerprints = fingerprints.setdefault(event_type, {})
+
+    def convert_ticker_changes(stream_data):
+        stream = stream_data['stream'] if 'stream' in stream_data else default_stream
+        last_fingerprints = stream_fingerprints.get(stream)
+        if last_fingerprints is None:
+            last_fingerprints = stream_fingerprints[stream] = {}
+        items = stream_data['items'] if 'items' in stream_data else (stream_data['data'], )
+        changed_items = []
+        for item in items:
+            fingerprint = hash(get_fingerprint(item))
+            if last_fingerprints.get(item['s']) != fingerprint:
+                last_fingerprints[item['s']] = fingerprint
+                changed_items.append(item)
+        stream_data['items'] = changed_items
+        return converter(stream_data)
+
+    convert_ticker_changes.schema = converter.schema
+    return convert_ticker_changes
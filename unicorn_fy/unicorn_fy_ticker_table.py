@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# File: unicorn_fy_ticker_table.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# Author: Oliver Zehentleitner
+#         https://about.me/oliver-zehentleitner
+#
+# Copyright (c) 2019-2020, Oliver Zehentleitner
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+
+from .unicorn_fy import UnicornFy
+from .unicorn_fy_columns import COLUMN_DTYPES
+from .unicorn_fy_schema import BINANCE_FUTURES_SCHEMAS, BINANCE_SCHEMAS, NUMERIC_FIELDS, Key
+import operator
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# dtypes of the numeric columns, all other prices and quantities become `float64`, the symbol is the row
+TICKER_TABLE_DTYPES = dict({name: dtype for name, dtype in COLUMN_DTYPES.items() if dtype != 'U'},
+                           statistics_open_time='datetime64[ms]',
+                           statistics_close_time='datetime64[ms]',
+                           first_trade_id='int64',
+                           last_trade_id='int64',
+                           total_nr_of_trades='int64')
+
+
+class UnicornFyTickerTable(object):
+    """
+    Latest `24hrTicker` or `24hrMiniTicker` values of every symbol, updated in place from `!ticker@arr` and
+    `!miniTicker@arr` messages
+
+    The table holds one preallocated numpy array per unicorn_fied key and one row per symbol. An update parses
+    every column of all symbols of a message in one go and writes it into the rows of the symbols, no dict gets built
+    per symbol. Requires numpy.
+
+    :param event_type: `24hrTicker` or `24hrMiniTicker`
+    :type event_type: str
+
+    :param exchange: Exchange endpoint.
+    :type exchange: str
+
+    :param capacity: Number of preallocated rows, the table doubles its size if more symbols are received
+    :type capacity: int
+
+    :param unicorn_fy: The `UnicornFy` class or instance that decodes the raw messages
+    :type unicorn_fy: UnicornFy
+    """
+    def __init__(self, event_type="24hrTicker", exchange="binance.com", capacity=4096, unicorn_fy=UnicornFy):
+        if numpy is None:
+            raise ImportError("The ticker table requires numpy: `pip install numpy`")
+        schemas = BINANCE_FUTURES_SCHEMAS if exchange == "binance.com-futures" else BINANCE_SCHEMAS
+        if event_type not in ('24hrTicker', '24hrMiniTicker'):
+            raise ValueError(f"unknown ticker event type '{event_type}', use 24hrTicker or 24hrMiniTicker")
+        self.event_type = event_type
+        self.unicorn_fy = unicorn_fy
+        self.capacity = capacity
+        # unicorn_fied key -> (raw key, dtype)
+        self.fields = {name: (source.path[0], TICKER_TABLE_DTYPES.get(name, 'float64'))
+                       for name, source in schemas[event_type].fields
+                       if isinstance(source, Key) and len(source.path) == 1 and
+                       (name in TICKER_TABLE_DTYPES or name in NUMERIC_FIELDS)}
+        self.columns = {name: numpy.zeros(capacity, dtype) for name, (key, dtype) in self.fields.items()}
+        self.rows = {}
+        self.symbols = []
+
+    def __contains__(self, symbol):
+        return symbol in self.rows
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def add_symbol(self, symbol):
+        """
+        Add a row for a symbol
+
+        :param symbol: The symbol, e.g. `BTCUSDT`
+        :type symbol: str
+
+        :return: int - the row of the symbol
+        """
+        row = len(self.symbols)
+        if row == self.capacity:
+            self.capacity *= 2
+            for name, column in self.columns.items():
+                resized_column = numpy.zeros(self.capacity, column.dtype)
+                resized_column[:row] = column
+                self.columns[name] = resized_column
+        self.rows[symbol] = row
+        self.symbols.append(symbol)
+        return row
+
+    def get(self, symbol):
+        """
+        Get the latest values of a symbol as unicorn_fied dict
+
+        :param symbol: The symbol, e.g. `BTCUSDT`
+        :type symbol: str
+
+        :return: dict or `None` if the symbol was not received yet
+        """
+        row = self.rows.get(symbol)
+        if row is None:
+            return None
+        values = {name: column[row].item() for name, column in self.columns.items()}
+        values['symbol'] = symbol
+        return values
+
+    def get_column(self, name):
+        """
+        Get the values of all symbols of a unicorn_fied key in the order of `symbols`
+
+        The column is a view on the table without a copy, it shows later updates. After the table has grown it
+        does not anymore.
+
+        :param name: The unicorn_fied key, e.g. `last_price`
+        :type name: str
+
+        :return: numpy.ndarray
+        """
+        return self.columns[name][:len(self.symbols)]
+
+    def get_row(self, symbol):
+        """
+        Get the row of a symbol in the columns
+
+        :param symbol: The symbol, e.g. `BTCUSDT`
+        :type symbol: str
+
+        :return: int or `None` if the symbol was not received yet
+        """
+        return self.rows.get(symbol)
+
+    def get_value(self, symbol, name):
+        """
+        Get the latest value of a unicorn_fied key of a symbol
+
+        :param symbol: The symbol, e.g. `BTCUSDT`
+        :type symbol: str
+
+        :param name: The unicorn_fied key, e.g. `last_price`
+        :type name: str
+
+        :return: numpy scalar
+        """
+        return self.columns[name][self.rows[symbol]]
+
+    def update(self, stream_data):
+        """
+        Write the symbols of a ticker message into the table
+
+        Messages of other event types are ignored.
+
+        :param stream_data: The received raw stream data or the decoded one
+        :type stream_data: str, bytes, dict or list
+
+        :return: int - the number of updated symbols
+        """
+        if not isinstance(stream_data, (dict, list)):
+            stream_data = self.unicorn_fy.decode_stream_data(stream_data)
+            if stream_data is False:
+                return 0
+        items = stream_data['data'] if isinstance(stream_data, dict) and 'data' in stream_data else stream_data
+        if isinstance(items, dict):
+            items = (items, )
+        if not items or items[0].get('e') != self.event_type:
+            return 0
+        get_row = self.rows.get
+        rows = []
+        for item in items:
+            row = get_row(item['s'])
+            if row is None:
+                row = self.add_symbol(item['s'])
+            rows.append(row)
+        rows = numpy.fromiter(rows, numpy.intp, len(rows))
+        for name, (key, dtype) in self.fields.items():
+            values = map(operator.itemgetter(key), items)
+            if dtype == 'float64':
+                # faster than parsing a numpy unicode array with `astype()`
+                values = map(float, values)
+            self.columns[name][rows] = numpy.fromiter(values, numpy.float64 if dtype == 'float64' else numpy.int64,
+                                                      len(rows))
+        return len(rows)
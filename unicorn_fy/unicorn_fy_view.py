@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# File: unicorn_fy_view.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# Author: Oliver Zehentleitner
+#         https://about.me/oliver-zehentleitner
+#
+# Copyright (c) 2019-2020, Oliver Zehentleitner
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+
+from .unicorn_fy_schema import MISSING, Computed, Key, Section, TickerEvent
+import collections.abc
+import functools
+
+
+class ViewLayout(object):
+    """
+    The translation of unicorn_fied keys to the sources in the payload, shared by all views of an event type
+
+    :param fields: Tuple of `(unicorn_fied_key, source)` pairs
+    :type fields: tuple
+    """
+    def __init__(self, fields):
+        self.names = tuple(name for name, source in fields)
+        self.raw_keys = {}
+        self.sources = {}
+        for name, source in fields:
+            if isinstance(source, Key) and len(source.path) == 1 and source.default is MISSING:
+                self.raw_keys[name] = source.path[0]
+            elif isinstance(source, Section):
+                self.sources[name] = ViewLayout(source.fields)
+            else:
+                self.sources[name] = source
+
+
+class UnicornFyView(collections.abc.Mapping):
+    """
+    Read-only mapping over a decoded payload that translates unicorn_fied keys to the raw keys on access
+
+    No values get copied while converting: `view['price']` reads `payload['p']` when it is accessed. `[]`, `get()`,
+    `in`, iteration, `len()` and `dict(view)` behave like with the unicorn_fied dict. Nested sections like `kline` are
+    views too, lists like `bids` or `balances` get built when they are accessed.
+
+    :param layout: The layout of the event type
+    :type layout: ViewLayout
+
+    :param stream_data: The decoded stream data
+    :type stream_data: dict
+
+    :param payload: The part of the stream data the view reads from
+    :type payload: dict
+    """
+    __slots__ = ('_layout', '_stream_data', '_payload')
+
+    def __init__(self, layout, stream_data, payload):
+        self._layout = layout
+        self._stream_data = stream_data
+        self._payload = payload
+
+    def __contains__(self, name):
+        return name in self._layout.raw_keys or name in self._layout.sources
+
+    def __getitem__(self, name):
+        raw_key = self._layout.raw_keys.get(name)
+        if raw_key is not None:
+            return self._payload[raw_key]
+        source = self._layout.sources[name]
+        if isinstance(source, ViewLayout):
+            return UnicornFyView(source, self._stream_data, self._payload)
+        return source.get(self._stream_data, self._payload)
+
+    def __iter__(self):
+        return iter(self._layout.names)
+
+    def __len__(self):
+        return len(self._layout.names)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+    def to_dict(self):
+        """
+        Copy the view into a unicorn_fied dict, nested views included
+
+        :return: dict
+        """
+        return {name: value.to_dict() if isinstance(value, UnicornFyView) else value for name, value in self.items()}
+
+
+@functools.lru_cache(maxsize=None)
+def view_converter(converter, event_type, unicorn_fied):
+    """
+    Get a converter function that returns views instead of dicts
+
+    :param converter: A converter function of a dispatch table
+    :type converter: function
+
+    :param event_type: The event type
+    :type event_type: str
+
+    :param unicorn_fied: The value of the `unicorn_fied` key: `(exchange, version)`
+    :type unicorn_fied: tuple
+
+    :return: function(stream_data)
+    """
+    schema = converter.schema
+    if isinstance(schema, TickerEvent):
+        # the dict around the symbols is small, only the symbols are views
+        item_layout = ViewLayout(schema.fields)
+
+        def convert_to_views(stream_data):
+            if 'stream' not in stream_data:
+                stream_data['stream'] = schema.default_stream
+            items = stream_data['items'] if 'items' in stream_data else (stream_data['data'], )
+            return {'stream_type': stream_data['stream'],
+                    'event_type': stream_data['data']['e'],
+                    'data': [UnicornFyView(item_layout, stream_data, item) for item in items]}
+        convert_to_views.schema = schema
+        return convert_to_views
+    # a new list per access, a consumer that changes it must not change the value of the other views
+    layout = ViewLayout(schema.fields + (('unicorn_fied', Computed(lambda stream_data, payload: list(unicorn_fied))), ))
+
+    def convert_to_view(stream_data):
+        return UnicornFyView(layout, stream_data, stream_data['data'])
+    convert_to_view.schema = schema
+    return convert_to_view
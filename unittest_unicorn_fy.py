@@ -35,12 +35,40 @@
 
 from unicorn_binance_websocket_api.unicorn_binance_websocket_api_manager import BinanceWebSocketApiManager
 from unicorn_fy.unicorn_fy import UnicornFy
+from unicorn_fy.unicorn_fy_shared_memory import UnicornFySharedRingBuffer, UnicornFySharedRingBufferReader, \
+    shared_memory
+from unicorn_fy.unicorn_fy_sniffer import UnicornFySniffer
+from unicorn_fy.unicorn_fy_ticker_table import UnicornFyTickerTable
+from unicorn_fy.unicorn_fy_async import AsyncUnicornFy
+from unicorn_fy.unicorn_fy_bars import UnicornFyBarAggregator
+from unicorn_fy.unicorn_fy_conflation import UnicornFyConflationBuffer
+from unicorn_fy.unicorn_fy_depth_diff import UnicornFyDepthDiff
+from unicorn_fy.unicorn_fy_kline_store import UnicornFyKlineStore
+from unicorn_fy.unicorn_fy_order_book import UnicornFyOrderBooks
+from unicorn_fy.unicorn_fy_pipeline import UnicornFyPipelineStage
+from unicorn_fy.unicorn_fy_pool import UnicornFyPool
+from unicorn_fy.unicorn_fy_precision import UnicornFyPrecision, scale
+from unicorn_fy.unicorn_fy_record import EVENT_CODES, EVENT_TYPES, UnicornFyRecord
+from unicorn_fy.unicorn_fy_view import UnicornFyView
+from unicorn_fy.unicorn_fy_schema import BINANCE_CONVERTERS, BINANCE_FUTURES_CONVERTERS, BINANCE_SCHEMAS, \
+    BINANCE_FUTURES_SCHEMAS, compile_converter, project_converters
+import asyncio
+import concurrent.futures
+import decimal
+import json
 import logging
+import multiprocessing
 import unittest
 import os
 import time
+import tempfile
 import threading
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 # https://docs.python.org/3/library/logging.html#logging-levels
 logging.basicConfig(level=logging.ERROR,
@@ -89,6 +117,16 @@ class TestBinanceGeneric(unittest.TestCase):
     def test_is_json(self):
         self.assertFalse(self.unicorn_fy.is_json(False))
 
+    def test_decode_stream_data(self):
+        self.assertEqual(self.unicorn_fy.decode_stream_data('{"result":null,"id":2}'), {'result': None, 'id': 2})
+        self.assertEqual(self.unicorn_fy.decode_stream_data(b'{"result":null,"id":2}'), {'result': None, 'id': 2})
+        self.assertEqual(self.unicorn_fy.decode_stream_data(memoryview(b'{"id":2}')), {'id': 2})
+        self.assertFalse(self.unicorn_fy.decode_stream_data('{"id":'))
+        self.assertFalse(self.unicorn_fy.decode_stream_data(False))
+
+    def test_unicorn_fy_malformed(self):
+        self.assertEqual(self.unicorn_fy.unicorn_fy('{"id":'), '{"id":')
+
     def test_result(self):
         data = '{"result":null,"id":2}'
         asserted_result = "{'result': None, 'id': 2, 'unicorn_fied': ['binance.com', '" + self.unicorn_fy_version + "']}"
@@ -125,6 +163,14 @@ class TestBinanceComWebsocket(unittest.TestCase):
         asserted_result = "{'stream_type': 'btcusdt@trade', 'event_type': 'trade', 'event_time': 1592591955766, 'symbol': 'BTCUSDT', 'trade_id': 343719861, 'price': '9302.00000000', 'quantity': '0.00101900', 'buyer_order_id': 2517144287, 'seller_order_id': 2517144235, 'trade_time': 1592591955765, 'is_market_maker': False, 'ignore': True, 'unicorn_fied': ['binance.com', '" + self.unicorn_fy_version + "']}"
         self.assertEqual(str(self.unicorn_fy.binance_com_websocket(data)), asserted_result)
 
+    def test_trade_single_decoded(self):
+        data = '{"stream":"btcusdt@trade","data":{"e":"trade","E":1592591955766,"s":"BTCUSDT","t":343719861,"p":"9302.00000000","q":"0.00101900","b":2517144287,"a":2517144235,"T":1592591955765,"m":false,"M":true}}'
+        asserted_result = str(self.unicorn_fy.binance_com_websocket(data))
+        self.assertEqual(str(self.unicorn_fy.unicorn_fy(data)), asserted_result)
+        self.assertEqual(str(self.unicorn_fy.unicorn_fy(data.encode())), asserted_result)
+        self.assertEqual(str(self.unicorn_fy.unicorn_fy(memoryview(data.encode()))), asserted_result)
+        self.assertEqual(str(self.unicorn_fy.unicorn_fy(json.loads(data))), asserted_result)
+
     def test_ticker_single(self):
         data = '{"stream":"btcusdt@ticker","data":{"e":"24hrTicker","E":1592593727005,"s":"BTCUSDT","p":"-65.00000000","P":"-0.693","w":"9343.29777965","x":"9383.27000000","c":"9318.48000000","Q":"0.00250000","b":"9318.18000000","B":"0.32000000","a":"9318.47000000","A":"0.35414300","o":"9383.48000000","h":"9438.30000000","l":"9215.79000000","v":"48745.36667100","q":"455442476.18534620","O":1592507327001,"C":1592593727001,"F":343178738,"L":343729077,"n":550340}}'
         asserted_result = "{'stream_type': 'btcusdt@ticker', 'event_type': '24hrTicker', 'data': [{'stream_type': 'btcusdt@ticker', 'event_type': '24hrTicker', 'event_time': 1592593727005, 'symbol': 'BTCUSDT', 'price_change': '-65.00000000', 'price_change_percent': '-0.693', 'weighted_average_price': '9343.29777965', 'trade_before_24h_window': '9383.27000000', 'last_price': '9318.48000000', 'last_quantity': '0.00250000', 'best_bid_price': '9318.18000000', 'best_bid_quantity': '0.32000000', 'best_ask_price': '9318.47000000', 'best_ask_quantity': '0.35414300', 'open_price': '9383.48000000', 'high_price': '9438.30000000', 'low_price': '9215.79000000', 'total_traded_base_asset_volume': '48745.36667100', 'total_traded_quote_asset_volume': '455442476.18534620', 'statistics_open_time': 1592507327001, 'statistics_close_time': 1592593727001, 'first_trade_id': 343178738, 'last_trade_id': 343729077, 'total_nr_of_trades': 550340}], 'unicorn_fied': ['binance.com', '" + self.unicorn_fy_version + "']}"
@@ -150,6 +196,35 @@ class TestBinanceComWebsocket(unittest.TestCase):
         asserted_result = "{'stream_type': 'ethusdt@listStatus', 'event_type': 'listStatus', 'event_time': 1606946194410, 'symbol': 'ETHUSDT', 'order_list_id': 10717037, 'contingency_type': 'OCO', 'list_status_type': 'ALL_DONE', 'list_order_status': 'ALL_DONE', 'list_reject_reason': 'NONE', 'list_client_order_id': 'i8B7NXuB37QkJ2Vy8f5KHh', 'transaction_time': 1606946194409, 'objects': [{'symbol': 'ETHUSDT', 'order_id': 2175939815, 'client_order_id': 'electron_648187c31bda49b6a2e81d23ae0'}, {'symbol': 'ETHUSDT', 'order_id': 2175939816, 'client_order_id': '84wruoWCZdkBUqbqlKfpv6'}], 'unicorn_fied': ['binance.com', '" + self.unicorn_fy_version + "']}"
         self.assertEqual(str(self.unicorn_fy.binance_com_websocket(data)), asserted_result)
 
+    def test_bookTicker(self):
+        data = '{"stream":"btcusdt@bookTicker","data":{"u":400900217,"s":"BTCUSDT","b":"9302.1","B":"31.2","a":"9302.2","A":"40.6"}}'
+        asserted_result = "{'stream_type': 'btcusdt@bookTicker', 'order_book_update_id': 400900217, 'symbol': 'BTCUSDT', 'best_bid_price': '9302.1', 'best_bid_quantity': '31.2', 'best_ask_price': '9302.2', 'best_ask_quantity': '40.6', 'event_type': 'bookTicker', 'unicorn_fied': ['binance.com', '" + self.unicorn_fy_version + "']}"
+        self.assertEqual(str(self.unicorn_fy.binance_com_websocket(data)), asserted_result)
+
+    def test_depth5(self):
+        data = '{"stream":"btcusdt@depth5","data":{"lastUpdateId":160,"bids":[["0.0024","10"],["0.0023","5"]],"asks":[["0.0026","100"]]}}'
+        asserted_result = "{'stream_type': 'btcusdt@depth5', 'event_type': 'depth', 'symbol': 'BTCUSDT', 'last_update_id': 160, 'bids': [['0.0024', '10'], ['0.0023', '5']], 'asks': [['0.0026', '100']], 'unicorn_fied': ['binance.com', '" + self.unicorn_fy_version + "']}"
+        self.assertEqual(str(self.unicorn_fy.binance_com_websocket(data)), asserted_result)
+
+    def test_depthUpdate(self):
+        data = '{"stream":"btcusdt@depth","data":{"e":"depthUpdate","E":123456789,"s":"BTCUSDT","U":157,"u":160,"b":[["0.0024","10"]],"a":[["0.0026","100"]]}}'
+        asserted_result = "{'stream_type': 'btcusdt@depth', 'event_type': 'depthUpdate', 'event_time': 123456789, 'symbol': 'BTCUSDT', 'first_update_id_in_event': 157, 'final_update_id_in_event': 160, 'bids': [['0.0024', '10']], 'asks': [['0.0026', '100']], 'unicorn_fied': ['binance.com', '" + self.unicorn_fy_version + "']}"
+        self.assertEqual(str(self.unicorn_fy.binance_com_websocket(data)), asserted_result)
+
+    def test_outboundAccountPosition(self):
+        data = '{"e":"outboundAccountPosition","E":1564034571105,"u":1564034571073,"B":[{"a":"ETH","f":"10000.000000","l":"0.000000"}]}'
+        asserted_result = "{'stream_type': '!userData@arr', 'event_type': 'outboundAccountPosition', 'event_time': 1564034571105, 'last_update_time': 1564034571073, 'balances': [{'asset': 'ETH', 'free': '10000.000000', 'locked': '0.000000'}], 'unicorn_fied': ['binance.com', '" + self.unicorn_fy_version + "']}"
+        self.assertEqual(str(self.unicorn_fy.binance_com_websocket(data)), asserted_result)
+
+    def test_executionReport(self):
+        data = '{"e":"executionReport","E":1499405658658,"s":"ETHBTC","c":"mUvoqJxFIILMdfAW5iGSOW","S":"BUY","o":"LIMIT","f":"GTC","q":"1.00000000","p":"0.10264410","P":"0.00000000","F":"0.00000000","g":-1,"C":"","x":"NEW","X":"NEW","r":"NONE","i":4293153,"l":"0.00000000","z":"0.00000000","L":"0.00000000","n":"0","N":null,"T":1499405658657,"t":-1,"I":8641984,"w":true,"m":false,"M":false,"O":1499405658657,"Z":"0.00000000","Y":"0.00000000","Q":"0.00000000"}'
+        asserted_result = "{'stream_type': '!userData@arr', 'event_type': 'executionReport', 'event_time': 1499405658658, 'symbol': 'ETHBTC', 'client_order_id': 'mUvoqJxFIILMdfAW5iGSOW', 'side': 'BUY', 'order_type': 'LIMIT', 'time_in_force': 'GTC', 'order_quantity': '1.00000000', 'order_price': '0.10264410', 'stop_price': '0.00000000', 'iceberg_quantity': '0.00000000', 'ignore_g': -1, 'original_client_order_id': '', 'current_execution_type': 'NEW', 'current_order_status': 'NEW', 'order_reject_reason': 'NONE', 'order_id': 4293153, 'last_executed_quantity': '0.00000000', 'cumulative_filled_quantity': '0.00000000', 'last_executed_price': '0.00000000', 'commission_amount': '0', 'commission_asset': None, 'transaction_time': 1499405658657, 'trade_id': -1, 'ignore_I': 8641984, 'is_order_working': True, 'is_trade_maker_side': False, 'ignore_M': False, 'order_creation_time': 1499405658657, 'cumulative_quote_asset_transacted_quantity': '0.00000000', 'last_quote_asset_transacted_quantity': '0.00000000', 'unicorn_fied': ['binance.com', '" + self.unicorn_fy_version + "']}"
+        self.assertEqual(str(self.unicorn_fy.binance_com_websocket(data)), asserted_result)
+
+    def test_unknown_event_type(self):
+        data = '{"stream":"btcusdt@foo","data":{"e":"foo","E":1}}'
+        self.assertFalse(self.unicorn_fy.binance_com_websocket(data))
+
     def test_template(self):
         data = ''
         asserted_result = "" + self.unicorn_fy_version + "']}"
@@ -183,6 +258,27 @@ class TestBinanceComWebsocketFutures(unittest.TestCase):
         asserted_result = "{'stream_type': 'btcusdt@aggTrade', 'event_type': 'aggTrade', 'event_time': 1592584651517, 'symbol': 'BTCUSDT', 'aggregate_trade_id': 315753210, 'price': '9319.00000000', 'quantity': '0.01864900', 'first_trade_id': 343675554, 'last_trade_id': 343675554, 'trade_time': 1592584651516, 'is_market_maker': True, 'unicorn_fied': ['binance.com-futures', '" + self.unicorn_fy_version + "']}"
         self.assertEqual(str(self.unicorn_fy.binance_com_futures_websocket(data)), asserted_result)
 
+    def test_bookTicker(self):
+        data = '{"stream":"btcusdt@bookTicker","data":{"e":"bookTicker","u":400900217,"E":1568014460893,"T":1568014460891,"s":"BTCUSDT","b":"9302.1","B":"31.2","a":"9302.2","A":"40.6"}}'
+        asserted_result = "{'stream_type': 'btcusdt@bookTicker', 'order_book_update_id': 400900217, 'symbol': 'BTCUSDT', 'best_bid_price': '9302.1', 'best_bid_quantity': '31.2', 'best_ask_price': '9302.2', 'best_ask_quantity': '40.6', 'event_type': 'bookTicker', 'unicorn_fied': ['binance.com-futures', '" + self.unicorn_fy_version + "']}"
+        self.assertEqual(str(self.unicorn_fy.binance_com_futures_websocket(data)), asserted_result)
+
+    def test_depthUpdate(self):
+        data = '{"stream":"btcusdt@depth","data":{"e":"depthUpdate","E":123456789,"T":123456788,"s":"BTCUSDT","U":157,"u":160,"pu":149,"b":[["0.0024","10"]],"a":[["0.0026","100"]]}}'
+        asserted_result = "{'stream_type': 'btcusdt@depth', 'event_type': 'depthUpdate', 'event_time': 123456789, 'symbol': 'BTCUSDT', 'first_update_id_in_event': 157, 'final_update_id_in_event': 160, 'final_update_id_in_last_stream': 149, 'bids': [['0.0024', '10']], 'asks': [['0.0026', '100']], 'unicorn_fied': ['binance.com-futures', '" + self.unicorn_fy_version + "']}"
+        self.assertEqual(str(self.unicorn_fy.binance_com_futures_websocket(data)), asserted_result)
+
+    def test_depth(self):
+        data = '{"stream":"btcusdt@depth5","data":{"e":"depthUpdate","E":123456789,"T":123456788,"s":"BTCUSDT","U":157,"u":160,"pu":149,"b":[["0.0024","10"]],"a":[["0.0026","100"]]}}'
+        asserted_result = "{'stream_type': 'btcusdt@depth5', 'event_type': 'depth', 'event_time': 123456789, 'symbol': 'BTCUSDT', 'last_update_id': 160, 'final_update_id_in_last_stream': 149, 'bids': [['0.0024', '10']], 'asks': [['0.0026', '100']], 'unicorn_fied': ['binance.com-futures', '" + self.unicorn_fy_version + "']}"
+        self.assertEqual(str(self.unicorn_fy.binance_com_futures_websocket(data)), asserted_result)
+
+    def test_aggTrade_single_decoded(self):
+        data = '{"stream":"btcusdt@aggTrade","data":{"e":"aggTrade","E":1592584651517,"s":"BTCUSDT","a":315753210,"p":"9319.00000000","q":"0.01864900","f":343675554,"l":343675554,"T":1592584651516,"m":true,"M":true}}'
+        asserted_result = str(self.unicorn_fy.binance_com_futures_websocket(data))
+        self.assertEqual(str(self.unicorn_fy.unicorn_fy(json.loads(data), exchange="binance.com-futures")),
+                         asserted_result)
+
     def tearDown(self):
         del self.unicorn_fy
 
@@ -271,6 +367,992 @@ class TestBinanceOrgWebsocket(unittest.TestCase):
         del self.unicorn_fy
 
 
+class TestJsonBackends(unittest.TestCase):
+    def setUp(self):
+        self.unicorn_fy = UnicornFy(json_backend="json")
+        self.stream_data = ['{"result":null,"id":2}',
+                            '{"error":"blahblah"}',
+                            '{"stream":"btcusdt@trade","data":{"e":"trade","E":1592591955766,"s":"BTCUSDT","t":343719861,"p":"9302.00000000","q":"0.00101900","b":2517144287,"a":2517144235,"T":1592591955765,"m":false,"M":true}}',
+                            '{"stream":"btcusdt@kline_1m","data":{"e":"kline","E":1601630228469,"s":"BTCUSDT","k":{"t":1601630220000,"T":1601630279999,"s":"BTCUSDT","i":"1m","f":427033476,"L":427033658,"o":"10437.32000000","c":"10441.80000000","h":"10441.80000000","l":"10437.32000000","v":"20.63957400","n":183,"x":false,"q":"215452.69236872","V":"19.31210700","Q":"201593.99488069","B":"0"}}}',
+                            '[{"e":"24hrMiniTicker","E":1592594715455,"s":"ETHBTC","c":"0.02456700","o":"0.02459800","h":"0.02470900","l":"0.02438100","v":"163116.18600000","q":"4006.04936991"},{"e":"24hrMiniTicker","E":1592594715775,"s":"BTCUSDT","c":"9342.70000000","o":"9393.74000000","h":"9438.30000000","l":"9215.79000000","v":"47798.03832300","q":"446546826.58722200"}]',
+                            '{"e":"listStatus","E":1606946194410,"s":"ETHUSDT","g":10717037,"c":"OCO","l":"ALL_DONE","L":"ALL_DONE","r":"NONE","C":"i8B7NXuB37QkJ2Vy8f5KHh","T":1606946194409,"O":[{"s":"ETHUSDT","i":2175939815,"c":"electron_648187c31bda49b6a2e81d23ae0"},{"s":"ETHUSDT","i":2175939816,"c":"84wruoWCZdkBUqbqlKfpv6"}]}']
+
+    def test_select_backend(self):
+        self.assertEqual(self.unicorn_fy.get_json_backend(), "json")
+        self.assertIn(UnicornFy.get_json_backend(), UnicornFy.get_installed_json_backends())
+        self.assertRaises(ValueError, UnicornFy, json_backend="not_a_json_backend")
+
+    def test_identical_output(self):
+        for json_backend in UnicornFy.get_installed_json_backends():
+            unicorn_fy = UnicornFy(json_backend=json_backend)
+            for data in self.stream_data:
+                with self.subTest(json_backend=json_backend, data=data):
+                    self.assertEqual(str(unicorn_fy.binance_com_websocket(data)),
+                                     str(self.unicorn_fy.binance_com_websocket(data)))
+                    self.assertEqual(str(unicorn_fy.binance_com_websocket(data.encode())),
+                                     str(self.unicorn_fy.binance_com_websocket(data)))
+                    self.assertEqual(str(unicorn_fy.unicorn_fy(memoryview(data.encode()))),
+                                     str(self.unicorn_fy.binance_com_websocket(data)))
+
+    def tearDown(self):
+        del self.unicorn_fy
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self.unicorn_fy = UnicornFy()
+        self.trade = '{"stream":"btcusdt@trade","data":{"e":"trade","E":1592591955766,"s":"BTCUSDT","t":343719861,"p":"9302.00000000","q":"0.00101900","b":2517144287,"a":2517144235,"T":1592591955765,"m":false,"M":true}}'
+        self.agg_trade = '{"stream":"btcusdt@aggTrade","data":{"e":"aggTrade","E":1592584651517,"s":"BTCUSDT","a":315753210,"p":"9319.00000000","q":"0.01864900","f":343675554,"l":343675554,"T":1592584651516,"m":true,"M":true}}'
+
+    def test_binance_com_websocket_batch(self):
+        unicorn_fied_data, errors = self.unicorn_fy.binance_com_websocket_batch([self.trade,
+                                                                                 self.agg_trade.encode(),
+                                                                                 '{"id":',
+                                                                                 '{"stream":"btcusdt@foo","data":{"e":"foo"}}',
+                                                                                 json.loads(self.trade)])
+        self.assertEqual(unicorn_fied_data, [self.unicorn_fy.binance_com_websocket(self.trade),
+                                             self.unicorn_fy.binance_com_websocket(self.agg_trade),
+                                             self.unicorn_fy.binance_com_websocket(self.trade)])
+        self.assertEqual([error['index'] for error in errors], [2, 3])
+        self.assertEqual(errors[0]['stream_data'], '{"id":')
+        self.assertIsInstance(errors[0]['error'], ValueError)
+
+    def test_binance_com_futures_websocket_batch(self):
+        unicorn_fied_data, errors = self.unicorn_fy.binance_com_futures_websocket_batch(iter([self.agg_trade]))
+        self.assertEqual(unicorn_fied_data, [self.unicorn_fy.binance_com_futures_websocket(self.agg_trade)])
+        self.assertEqual(errors, [])
+
+    def test_missing_field(self):
+        unicorn_fied_data, errors = self.unicorn_fy.binance_us_websocket_batch(
+            ['{"stream":"btcusdt@trade","data":{"e":"trade"}}', self.trade])
+        self.assertEqual(len(unicorn_fied_data), 1)
+        self.assertIsInstance(errors[0]['error'], KeyError)
+
+    def tearDown(self):
+        del self.unicorn_fy
+
+
+class TestConverterSchemas(unittest.TestCase):
+    def setUp(self):
+        self.stream_data = ['{"stream":"btcusdt@kline_1m","data":{"e":"kline","E":1601630228469,"s":"BTCUSDT","k":{"t":1601630220000,"T":1601630279999,"s":"BTCUSDT","i":"1m","f":427033476,"L":427033658,"o":"10437.32000000","c":"10441.80000000","h":"10441.80000000","l":"10437.32000000","v":"20.63957400","n":183,"x":false,"q":"215452.69236872","V":"19.31210700","Q":"201593.99488069","B":"0"}}}',
+                            '{"stream":"btcusdt@miniTicker","data":{"e":"24hrMiniTicker","E":1601628771865,"s":"BTCUSDT","c":"10456.56000000","o":"10884.90000000","h":"10912.83000000","l":"10385.02000000","v":"64483.09756200","q":"685180788.34970800"}}',
+                            '{"data":{"e":"outboundAccountPosition","E":1564034571105,"u":1564034571073,"B":[{"a":"ETH","f":"10000.000000","l":"0.000000"}]}}',
+                            '{"data":{"e":"listStatus","E":1606946194410,"s":"ETHUSDT","g":10717037,"c":"OCO","l":"ALL_DONE","L":"ALL_DONE","r":"NONE","C":"i8B7NXuB37QkJ2Vy8f5KHh","T":1606946194409,"O":[{"s":"ETHUSDT","i":2175939815,"c":"electron_648187c31bda49b6a2e81d23ae0"}]}}']
+
+    def test_compiled_equals_schema(self):
+        for schemas, converters in ((BINANCE_SCHEMAS, BINANCE_CONVERTERS),
+                                    (BINANCE_FUTURES_SCHEMAS, BINANCE_FUTURES_CONVERTERS)):
+            for data in self.stream_data:
+                event_type = json.loads(data)['data']['e']
+                with self.subTest(event_type=event_type):
+                    self.assertEqual(converters[event_type](json.loads(data)),
+                                     schemas[event_type].convert(json.loads(data)))
+
+    def test_compiled_once(self):
+        self.assertIs(compile_converter(BINANCE_SCHEMAS['kline'], 'kline'), BINANCE_CONVERTERS['kline'])
+        self.assertIs(BINANCE_CONVERTERS['kline'], BINANCE_FUTURES_CONVERTERS['kline'])
+        self.assertIsNot(BINANCE_CONVERTERS['trade'], BINANCE_FUTURES_CONVERTERS['trade'])
+        self.assertNotIn("for name, source in", BINANCE_CONVERTERS['executionReport'].source_code)
+
+    def test_projection(self):
+        fields = {'kline': ['symbol', 'kline'], '24hrMiniTicker': ['symbol', 'close_price']}
+        kline = UnicornFy.binance_com_websocket(self.stream_data[0], fields=fields)
+        self.assertEqual(list(kline), ['symbol', 'kline', 'unicorn_fied'])
+        self.assertEqual(kline['kline']['close_price'], "10441.80000000")
+        mini_ticker = UnicornFy.binance_com_futures_websocket(self.stream_data[1], fields=fields)
+        self.assertEqual(mini_ticker['data'], [{'symbol': "BTCUSDT", 'close_price': "10456.56000000"}])
+        results, errors = UnicornFy.unicorn_fy_batch(self.stream_data, fields=fields)
+        self.assertEqual([len(data) for data in results], [3, 4, 6, 13])
+        self.assertIs(project_converters(BINANCE_CONVERTERS, fields)['kline'],
+                      project_converters(BINANCE_CONVERTERS, fields)['kline'])
+        with self.assertRaises(ValueError):
+            UnicornFy.binance_com_websocket(self.stream_data[0], fields={'kline': ['price']})
+
+    def test_projection_cached(self):
+        fields = {'kline': ['symbol', 'kline']}
+        unicorn_fy = UnicornFy(numeric="float")
+        converters = unicorn_fy.get_converters(fields=fields)
+        self.assertIs(unicorn_fy.get_converters(fields={'kline': ('symbol', 'kline')}), converters)
+        self.assertIsNot(unicorn_fy.get_converters(fields={'kline': ['kline']}), converters)
+        self.assertIsNot(unicorn_fy.get_converters(), converters)
+        self.assertEqual(unicorn_fy.binance_com_websocket(self.stream_data[0], fields=fields)['kline']['close_price'],
+                         10441.8)
+        self.assertEqual(UnicornFy(numeric="float").derived_converters, {})
+        self.assertIsNone(UnicornFy.derived_converters)
+
+
+class TestStream(unittest.TestCase):
+    def setUp(self):
+        self.trade = '{"stream":"btcusdt@trade","data":{"e":"trade","E":1592591955766,"s":"BTCUSDT","t":343719861,"p":"9302.00000000","q":"0.00101900","b":2517144287,"a":2517144235,"T":1592591955765,"m":false,"M":true}}'
+        self.agg_trade = '{"stream":"btcusdt@aggTrade","data":{"e":"aggTrade","E":1592584651517,"s":"BTCUSDT","a":315753210,"p":"9319.00000000","q":"0.01864900","f":343675554,"l":343675554,"T":1592584651516,"m":true,"M":true}}'
+
+    def test_iterable(self):
+        errors = []
+        stream = UnicornFy.stream([self.trade, '{"id":', self.agg_trade, self.trade],
+                                  errors=errors).filter(lambda data: data['event_type'] == "trade").map(
+            lambda data: data['price'])
+        self.assertEqual(list(stream), ['9302.00000000', '9302.00000000'])
+        self.assertEqual(errors[0]['index'], 1)
+
+    def test_callable(self):
+        buffer = [self.trade, False, None, self.agg_trade]
+        stream = UnicornFy().stream(lambda: buffer.pop(0) if buffer else False,
+                                    stop=lambda: not buffer,
+                                    max_idle_sleep=0.001)
+        self.assertEqual([data['event_type'] for data in stream], ["trade", "aggTrade"])
+
+    def test_stop_busy_source(self):
+        received = []
+        stream = UnicornFy.stream(lambda: self.trade, stop=lambda: len(received) == 3,
+                                  fields={'trade': ['symbol', 'price']})
+        for data in stream:
+            received.append(data)
+        self.assertEqual(len(received), 3)
+        self.assertEqual(list(received[0]), ['symbol', 'price', 'unicorn_fied'])
+
+
+class TestSniffer(unittest.TestCase):
+    def setUp(self):
+        self.trade = '{"stream":"btcusdt@trade","data":{"e":"trade","E":1592591955766,"s":"BTCUSDT","t":343719861,"p":"9302.00000000","q":"0.00101900","b":2517144287,"a":2517144235,"T":1592591955765,"m":false,"M":true}}'
+        self.eth_trade = self.trade.replace("btcusdt", "ethusdt").replace("BTCUSDT", "ETHUSDT")
+        self.depth5 = '{"stream":"btcusdt@depth5","data":{"lastUpdateId":4716432296,"bids":[["9319.00000000","1.00000000"]],"asks":[["9320.00000000","2.00000000"]]}}'
+        self.execution_report = '{"e":"executionReport","E":1499405658658,"s":"ETHBTC","c":"mUvoqJxFIILMdfAW5iGSOW","S":"BUY"}'
+
+    def test_sniff(self):
+        sniffer = UnicornFySniffer()
+        self.assertEqual(sniffer.sniff(self.trade), ("btcusdt@trade", "trade", "BTCUSDT"))
+        self.assertEqual(sniffer.sniff(self.depth5.encode()), ("btcusdt@depth5", "depth", "BTCUSDT"))
+        self.assertEqual(sniffer.sniff(memoryview(self.execution_report.encode())),
+                         (None, "executionReport", "ETHBTC"))
+        self.assertEqual(sniffer.sniff('{"result":null,"id":1}'), (None, None, None))
+
+    def test_accept(self):
+        sniffer = UnicornFySniffer(event_types=["trade", "depth"], symbols=["btcusdt"],
+                                   stream_patterns=["btcusdt@*"])
+        self.assertTrue(sniffer.accept(self.trade))
+        self.assertTrue(sniffer.accept(self.depth5))
+        self.assertTrue(sniffer.accept('{"result":null,"id":1}'))
+        self.assertFalse(sniffer.accept(self.eth_trade))
+        self.assertFalse(sniffer.accept(self.execution_report))
+        self.assertEqual(sniffer.get_stats(), {'passed': 3, 'skipped': 2, 'skipped_by_event_type': 1,
+                                               'skipped_by_symbol': 0, 'skipped_by_stream': 1})
+
+    def test_unicorn_fy(self):
+        sniffer = UnicornFySniffer(symbols=["BTCUSDT"])
+        unicorn_fy = UnicornFy(sniffer=sniffer)
+        self.assertIsNone(unicorn_fy.binance_com_websocket(self.eth_trade))
+        self.assertEqual(unicorn_fy.unicorn_fy(self.trade.encode())['symbol'], "BTCUSDT")
+        results, errors = unicorn_fy.unicorn_fy_batch([self.trade, self.eth_trade, self.depth5, self.eth_trade])
+        self.assertEqual([data['event_type'] for data in results], ["trade", "depth"])
+        self.assertEqual(errors, [])
+        self.assertEqual(sniffer.get_stats()['skipped_by_symbol'], 3)
+        self.assertIsNone(UnicornFy.sniffer)
+
+
+class TestViews(unittest.TestCase):
+    def setUp(self):
+        self.unicorn_fy = UnicornFy(output="view")
+        self.trade = '{"stream":"btcusdt@trade","data":{"e":"trade","E":1592591955766,"s":"BTCUSDT","t":343719861,"p":"9302.00000000","q":"0.00101900","b":2517144287,"a":2517144235,"T":1592591955765,"m":false,"M":true}}'
+        self.kline = '{"stream":"btcusdt@kline_1m","data":{"e":"kline","E":1601630228469,"s":"BTCUSDT","k":{"t":1601630220000,"T":1601630279999,"s":"BTCUSDT","i":"1m","f":427033476,"L":427033658,"o":"10437.32000000","c":"10441.80000000","h":"10441.80000000","l":"10437.32000000","v":"20.63957400","n":183,"x":false,"q":"215452.69236872","V":"19.31210700","Q":"201593.99488069","B":"0"}}}'
+        self.depth5 = '{"stream":"btcusdt@depth5","data":{"lastUpdateId":4716432296,"bids":[["9319.00000000","1.00000000"]],"asks":[["9320.00000000","2.00000000"]]}}'
+        self.mini_ticker = '{"stream":"btcusdt@miniTicker","data":{"e":"24hrMiniTicker","E":1601628771865,"s":"BTCUSDT","c":"10456.56000000","o":"10884.90000000","h":"10912.83000000","l":"10385.02000000","v":"64483.09756200","q":"685180788.34970800"}}'
+
+    def test_like_dict(self):
+        for stream_data in (self.trade, self.kline, self.depth5):
+            view = self.unicorn_fy.binance_com_websocket(stream_data)
+            unicorn_fied_data = UnicornFy.binance_com_websocket(stream_data)
+            self.assertIsInstance(view, UnicornFyView)
+            self.assertEqual(view, unicorn_fied_data)
+            self.assertEqual(list(view), list(unicorn_fied_data))
+            self.assertEqual(view.to_dict(), unicorn_fied_data)
+
+    def test_access(self):
+        view = self.unicorn_fy.unicorn_fy(self.trade)
+        self.assertEqual(view['price'], "9302.00000000")
+        self.assertEqual(view.get('event_time'), 1592591955766)
+        self.assertIsNone(view.get('best_bid_price'))
+        self.assertNotIn('best_bid_price', view)
+        self.assertEqual(view['unicorn_fied'], ["binance.com", UnicornFy.VERSION])
+        view['unicorn_fied'].append("changed")
+        self.assertEqual(self.unicorn_fy.unicorn_fy(self.trade)['unicorn_fied'], ["binance.com", UnicornFy.VERSION])
+        with self.assertRaises(TypeError):
+            view['price'] = "1"
+        kline = self.unicorn_fy.unicorn_fy(self.kline)
+        self.assertEqual(kline['kline']['close_price'], "10441.80000000")
+
+    def test_projection_and_tickers(self):
+        results, errors = self.unicorn_fy.unicorn_fy_batch([self.trade, self.mini_ticker],
+                                                           fields={'trade': ['symbol', 'price']})
+        self.assertEqual(dict(results[0]), {'symbol': "BTCUSDT", 'price': "9302.00000000",
+                                            'unicorn_fied': ["binance.com", UnicornFy.VERSION]})
+        self.assertEqual(results[1]['data'][0]['close_price'], "10456.56000000")
+        with self.assertRaises(ValueError):
+            UnicornFy(output="tuple")
+
+
+class TestRecords(unittest.TestCase):
+    def setUp(self):
+        self.unicorn_fy = UnicornFy(output="record")
+        self.trade = '{"stream":"btcusdt@trade","data":{"e":"trade","E":1592591955766,"s":"BTCUSDT","t":343719861,"p":"9302.00000000","q":"0.00101900","b":2517144287,"a":2517144235,"T":1592591955765,"m":false,"M":true}}'
+        self.kline = '{"stream":"btcusdt@kline_1m","data":{"e":"kline","E":1601630228469,"s":"BTCUSDT","k":{"t":1601630220000,"T":1601630279999,"s":"BTCUSDT","i":"1m","f":427033476,"L":427033658,"o":"10437.32000000","c":"10441.80000000","h":"10441.80000000","l":"10437.32000000","v":"20.63957400","n":183,"x":false,"q":"215452.69236872","V":"19.31210700","Q":"201593.99488069","B":"0"}}}'
+        self.mini_ticker = '{"stream":"btcusdt@miniTicker","data":{"e":"24hrMiniTicker","E":1601628771865,"s":"BTCUSDT","c":"10456.56000000","o":"10884.90000000","h":"10912.83000000","l":"10385.02000000","v":"64483.09756200","q":"685180788.34970800"}}'
+
+    def test_like_dict(self):
+        for stream_data in (self.trade, self.kline, self.mini_ticker):
+            record = self.unicorn_fy.binance_com_futures_websocket(stream_data)
+            self.assertIsInstance(record, UnicornFyRecord)
+            self.assertEqual(record.to_dict(), UnicornFy.binance_com_futures_websocket(stream_data))
+
+    def test_access(self):
+        record = self.unicorn_fy.unicorn_fy(self.trade)
+        self.assertEqual(record.price, "9302.00000000")
+        self.assertEqual(record.event_code, EVENT_CODES['trade'])
+        self.assertEqual(EVENT_TYPES[record.event_code], "trade")
+        self.assertEqual(record.unicorn_fied, ("binance.com", UnicornFy.VERSION))
+        self.assertFalse(hasattr(record, '__dict__'))
+        with self.assertRaises(AttributeError):
+            record.price = "1"
+        self.assertEqual(self.unicorn_fy.unicorn_fy(self.kline).kline.close_price, "10441.80000000")
+        self.assertEqual(self.unicorn_fy.unicorn_fy(self.mini_ticker).data[0].close_price, "10456.56000000")
+        projected = self.unicorn_fy.unicorn_fy(self.trade, fields={'trade': ['symbol', 'price']})
+        self.assertEqual(tuple(projected), ("BTCUSDT", "9302.00000000"))
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestColumns(unittest.TestCase):
+    def setUp(self):
+        self.trade = '{"stream":"btcusdt@trade","data":{"e":"trade","E":1592591955766,"s":"BTCUSDT","t":343719861,"p":"9302.00000000","q":"0.00101900","b":2517144287,"a":2517144235,"T":1592591955765,"m":false,"M":true}}'
+        self.agg_trade = '{"stream":"btcusdt@aggTrade","data":{"e":"aggTrade","E":1592584651517,"s":"BTCUSDT","a":315753210,"p":"9319.00000000","q":"0.01864900","f":343675554,"l":343675554,"T":1592584651516,"m":true,"M":true}}'
+        self.book_ticker = '{"stream":"btcusdt@bookTicker","data":{"u":400900217,"s":"BTCUSDT","b":"9302.1","B":"31.2","a":"9302.2","A":"40.6"}}'
+
+    def test_columns(self):
+        errors = []
+        columns = UnicornFy.unicorn_fy_columns([self.trade, self.agg_trade, self.trade.encode(), '{"id":'],
+                                               errors=errors)
+        self.assertEqual(columns['price'].dtype, numpy.float64)
+        self.assertEqual(columns['price'].tolist(), [9302.0, 9302.0])
+        self.assertEqual(columns['event_time'][0], numpy.datetime64(1592591955766, 'ms'))
+        self.assertEqual(columns['symbol'].tolist(), ["BTCUSDT", "BTCUSDT"])
+        self.assertEqual(columns['is_market_maker'].tolist(), [False, False])
+        self.assertNotIn('ignore', columns)
+        self.assertEqual(errors[0]['index'], 3)
+
+    def test_structured(self):
+        array = UnicornFy.unicorn_fy_columns([self.book_ticker] * 3, event_type="bookTicker", structured=True)
+        self.assertEqual(array.shape, (3, ))
+        self.assertEqual(array['best_ask_quantity'][2], 40.6)
+        empty = UnicornFy.unicorn_fy_columns([], event_type="aggTrade")
+        self.assertEqual(len(empty['aggregate_trade_id']), 0)
+        with self.assertRaises(ValueError):
+            UnicornFy.unicorn_fy_columns([], event_type="depthUpdate")
+
+
+class TestNumeric(unittest.TestCase):
+    def setUp(self):
+        self.trade = '{"stream":"btcusdt@trade","data":{"e":"trade","E":1592591955766,"s":"BTCUSDT","t":343719861,"p":"9302.00000000","q":"0.00101900","b":2517144287,"a":2517144235,"T":1592591955765,"m":false,"M":true}}'
+        self.depth_update = '{"stream":"btcusdt@depth","data":{"e":"depthUpdate","E":123456789,"s":"BTCUSDT","U":157,"u":160,"b":[["0.0024","10"]],"a":[["0.0026","100"]]}}'
+        self.mini_ticker = '{"stream":"btcusdt@miniTicker","data":{"e":"24hrMiniTicker","E":1601628771865,"s":"BTCUSDT","c":"10456.56000000","o":"10884.90000000","h":"10912.83000000","l":"10385.02000000","v":"64483.09756200","q":"685180788.34970800"}}'
+
+    def test_float(self):
+        unicorn_fy = UnicornFy(numeric="float")
+        trade = unicorn_fy.binance_com_websocket(self.trade)
+        self.assertEqual((trade['price'], trade['quantity'], trade['trade_id']), (9302.0, 0.001019, 343719861))
+        self.assertEqual(trade['symbol'], "BTCUSDT")
+        depth_update = unicorn_fy.binance_com_websocket(self.depth_update)
+        self.assertEqual(depth_update['bids'], [[0.0024, 10.0]])
+        self.assertEqual(UnicornFy.binance_com_websocket(self.trade)['price'], "9302.00000000")
+
+    def test_decimal(self):
+        unicorn_fy = UnicornFy(numeric="decimal", output="record")
+        mini_ticker = unicorn_fy.unicorn_fy(self.mini_ticker, fields={'24hrMiniTicker': ['close_price']})
+        self.assertEqual(mini_ticker.data[0].close_price, decimal.Decimal("10456.56000000"))
+        results, errors = unicorn_fy.unicorn_fy_batch([self.trade, self.depth_update])
+        self.assertEqual(results[0].price, decimal.Decimal("9302.00000000"))
+        self.assertEqual(results[1].asks, [[decimal.Decimal("0.0026"), decimal.Decimal("100")]])
+        with self.assertRaises(ValueError):
+            UnicornFy(numeric="int")
+
+
+class TestPrecision(unittest.TestCase):
+    def setUp(self):
+        self.exchange_info = {'symbols': [{'symbol': "BTCUSDT",
+                                           'filters': [{'filterType': "PRICE_FILTER", 'minPrice': "0.01000000",
+                                                        'maxPrice': "1000000.00000000", 'tickSize': "0.01000000"},
+                                                       {'filterType': "LOT_SIZE", 'minQty': "0.00000100",
+                                                        'maxQty': "9000.00000000", 'stepSize': "0.00000100"}]}]}
+        self.trade = '{"stream":"btcusdt@trade","data":{"e":"trade","E":1592591955766,"s":"BTCUSDT","t":343719861,"p":"9302.01000000","q":"0.00101900","b":2517144287,"a":2517144235,"T":1592591955765,"m":false,"M":true}}'
+        self.depth5 = '{"stream":"btcusdt@depth5","data":{"lastUpdateId":4716432296,"bids":[["9319.00000000","1.00000000"]],"asks":[["9320.50000000","2.00000100"]]}}'
+
+    def test_scale(self):
+        self.assertEqual(scale("9302.01000000", 2), 930201)
+        self.assertEqual(scale("-65.5", 2), -6550)
+        self.assertEqual(scale("10", 3), 10000)
+        with self.assertRaises(ValueError):
+            scale("0.001", 2)
+
+    def test_exchange_info_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "exchangeInfo.json")
+            with open(path, "w") as exchange_info_file:
+                json.dump(self.exchange_info, exchange_info_file)
+            precision = UnicornFyPrecision.from_exchange_info_file(path)
+        self.assertEqual(precision.get_decimals("BTCUSDT"), (2, 6))
+        unicorn_fy = UnicornFy(precision=precision)
+        trade = unicorn_fy.binance_com_websocket(self.trade)
+        self.assertEqual((trade['price'], trade['quantity']), (930201, 1019))
+        self.assertEqual(trade['event_time'], 1592591955766)
+        depth = unicorn_fy.binance_com_websocket(self.depth5)
+        self.assertEqual((depth['bids'], depth['asks']), ([[931900, 1000000]], [[932050, 2000001]]))
+        with self.assertRaises(ValueError):
+            precision.scale_price("ETHUSDT", "230.10")
+
+    def test_unknown_symbol(self):
+        precision = UnicornFyPrecision.from_exchange_info(self.exchange_info)
+        unicorn_fy = UnicornFy(precision=precision)
+        with self.assertLogs(level="WARNING") as logs:
+            trade = unicorn_fy.binance_com_websocket(self.trade.replace("BTCUSDT", "ETHUSDT"))
+            unicorn_fy.binance_com_websocket(self.trade.replace("BTCUSDT", "ETHUSDT"))
+        self.assertEqual(len(logs.records), 1)
+        self.assertEqual((trade['symbol'], trade['price'], trade['quantity']),
+                         ("ETHUSDT", "9302.01000000", "0.00101900"))
+        depth = unicorn_fy.binance_com_websocket(self.depth5.replace("btcusdt", "ethusdt"))
+        self.assertEqual(depth['bids'], [["9319.00000000", "1.00000000"]])
+        self.assertEqual(UnicornFy(precision=precision).binance_com_websocket(self.trade)['price'], 930201)
+
+
+class TestLevels(unittest.TestCase):
+    def setUp(self):
+        self.trade = '{"stream":"btcusdt@trade","data":{"e":"trade","E":1592591955766,"s":"BTCUSDT","t":343719861,"p":"9302.00000000","q":"0.00101900","b":2517144287,"a":2517144235,"T":1592591955765,"m":false,"M":true}}'
+        self.depth_update = '{"stream":"btcusdt@depth","data":{"e":"depthUpdate","E":1592591955766,"s":"BTCUSDT","U":4716432290,"u":4716432296,"b":[["9319.00000000","1.00000000"],["9318.50000000","0.00000000"]],"a":[]}}'
+        self.futures_depth_update = '{"stream":"btcusdt@depth","data":{"e":"depthUpdate","E":1592591955766,"T":1592591955765,"s":"BTCUSDT","U":4716432290,"u":4716432296,"pu":4716432289,"b":[["9319.00000000","1.00000000"]],"a":[["9320.50000000","2.00000100"]]}}'
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_numpy_levels(self):
+        unicorn_fy = UnicornFy(levels="numpy")
+        depth_update = unicorn_fy.binance_com_websocket(self.depth_update)
+        self.assertEqual(depth_update['bids'].dtype, numpy.float64)
+        self.assertEqual(depth_update['bids'].tolist(), [[9319.0, 1.0], [9318.5, 0.0]])
+        self.assertEqual(depth_update['asks'].shape, (0, 2))
+        self.assertEqual(depth_update['final_update_id_in_event'], 4716432296)
+        futures_depth_update = unicorn_fy.binance_com_futures_websocket(self.futures_depth_update)
+        self.assertEqual(futures_depth_update['bids'].tolist(), [[9319.0, 1.0]])
+        self.assertEqual(futures_depth_update['asks'].tolist(), [[9320.5, 2.000001]])
+        trade = unicorn_fy.binance_com_websocket(self.trade)
+        self.assertEqual(trade['price'], "9302.00000000")
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_numpy_scaled_levels(self):
+        precision = UnicornFyPrecision()
+        precision.add_symbol("BTCUSDT", "0.01000000", "0.00000100")
+        depth_update = UnicornFy(precision=precision, levels="numpy").binance_com_websocket(self.depth_update)
+        self.assertEqual(depth_update['bids'].dtype, numpy.int64)
+        self.assertEqual(depth_update['bids'].tolist(), [[931900, 1000000], [931850, 0]])
+
+    def test_unknown_levels(self):
+        with self.assertRaises(ValueError):
+            UnicornFy(levels="array")
+
+
+class TestDepthDiff(unittest.TestCase):
+    def depth5(self, bids, asks):
+        return json.dumps({'stream': "btcusdt@depth5", 'data': {'lastUpdateId': 1, 'bids': bids, 'asks': asks}})
+
+    def test_diff(self):
+        depth_diff = UnicornFyDepthDiff()
+        messages = [self.depth5([["9300.00", "1.0"], ["9299.00", "2.0"]], [["9301.00", "1.5"]]),
+                    self.depth5([["9300.00", "1.0"], ["9299.00", "2.0"]], [["9301.00", "1.5"]]),
+                    self.depth5([["9300.00", "0.5"], ["9298.00", "3.0"]], [["9301.00", "1.5"]]),
+                    '{"stream":"btcusdt@trade","data":{"e":"trade","E":1592591955766,"s":"BTCUSDT","t":343719861,"p":"9302.00000000","q":"0.00101900","b":2517144287,"a":2517144235,"T":1592591955765,"m":false,"M":true}}']
+        diffs = list(UnicornFy.stream(messages).map(depth_diff.update).filter(lambda data: data is not None))
+        self.assertEqual(len(diffs), 3)
+        self.assertTrue(diffs[0]['is_snapshot'])
+        self.assertEqual(diffs[0]['bids'], [["9300.00", "1.0"], ["9299.00", "2.0"]])
+        self.assertFalse(diffs[1]['is_snapshot'])
+        self.assertEqual(diffs[1]['bids'], [["9300.00", "0.5"], ["9298.00", "3.0"], ["9299.00", "0.00000000"]])
+        self.assertEqual(diffs[1]['asks'], [])
+        self.assertEqual(diffs[2]['event_type'], "trade")
+        self.assertEqual(depth_diff.get_stats(), {'emitted': 2, 'suppressed': 1})
+        depth_diff.reset("btcusdt@depth5")
+        self.assertTrue(depth_diff.update(UnicornFy.binance_com_websocket(messages[2]))['is_snapshot'])
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_numpy_levels(self):
+        depth_diff = UnicornFyDepthDiff()
+        unicorn_fy = UnicornFy(levels="numpy")
+        first = depth_diff.update(unicorn_fy.binance_com_websocket(self.depth5([["9300.00", "1.0"]], [])))
+        self.assertEqual((first['bids'], first['asks']), ([[9300.0, 1.0]], []))
+        self.assertIsNone(depth_diff.update(unicorn_fy.binance_com_websocket(self.depth5([["9300.00", "1.0"]], []))))
+        diff = depth_diff.update(unicorn_fy.binance_com_websocket(self.depth5([["9300.00", "2.0"]], [])))
+        self.assertEqual(diff['bids'], [[9300.0, 2.0]])
+
+    def test_records(self):
+        depth = UnicornFy(output="record").binance_com_websocket(self.depth5([["9300.00", "1.0"]], []))
+        with self.assertRaises(TypeError):
+            UnicornFyDepthDiff().update(depth)
+
+    def test_numeric_removed_quantity(self):
+        depth_diff = UnicornFyDepthDiff()
+        unicorn_fy = UnicornFy(numeric="decimal")
+        depth_diff.update(unicorn_fy.binance_com_websocket(self.depth5([["9300.00", "1.0"]], [])))
+        diff = depth_diff.update(unicorn_fy.binance_com_websocket(self.depth5([], [])))
+        self.assertEqual(diff['bids'], [[decimal.Decimal("9300.00"), decimal.Decimal(0)]])
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestTickerTable(unittest.TestCase):
+    def mini_ticker_arr(self, *tickers):
+        return json.dumps({'stream': "!miniTicker@arr",
+                           'data': [{'e': "24hrMiniTicker", 'E': event_time, 's': symbol, 'c': close_price,
+                                     'o': "9393.74000000", 'h': "9438.30000000", 'l': "9215.79000000",
+                                     'v': "47798.03832300", 'q': "446546826.58722200"}
+                                    for symbol, event_time, close_price in tickers]})
+
+    def test_update(self):
+        ticker_table = UnicornFyTickerTable("24hrMiniTicker", capacity=2)
+        close_prices = ticker_table.get_column('close_price')
+        self.assertEqual(ticker_table.update(self.mini_ticker_arr(("BTCUSDT", 1592594715775, "9342.70000000"),
+                                                                  ("ETHUSDT", 1592594715488, "229.47000000"))), 2)
+        self.assertEqual(close_prices.tolist(), [])
+        close_prices = ticker_table.get_column('close_price')
+        self.assertEqual(close_prices.tolist(), [9342.7, 229.47])
+        ticker_table.update(self.mini_ticker_arr(("ETHUSDT", 1592594716488, "230.00000000")))
+        self.assertEqual(close_prices.tolist(), [9342.7, 230.0])
+        self.assertEqual(ticker_table.get_value("ETHUSDT", 'event_time'), numpy.datetime64(1592594716488, 'ms'))
+        ticker_table.update(self.mini_ticker_arr(("LINKBTC", 1592594715714, "0.00043725")))
+        self.assertEqual(ticker_table.symbols, ["BTCUSDT", "ETHUSDT", "LINKBTC"])
+        self.assertEqual(ticker_table.get_row("LINKBTC"), 2)
+        self.assertEqual(ticker_table.get("BTCUSDT")['taker_by_base_asset_volume'], 47798.038323)
+        self.assertIsNone(ticker_table.get("TRXETH"))
+        self.assertEqual(ticker_table.update('{"stream":"btcusdt@trade","data":{"e":"trade"}}'), 0)
+        with self.assertRaises(ValueError):
+            UnicornFyTickerTable("trade")
+
+
+class TestTickerChanges(unittest.TestCase):
+    def ticker_arr(self, *tickers):
+        return json.dumps({'stream': "!miniTicker@arr",
+                           'data': [{'e': "24hrMiniTicker", 'E': event_time, 's': symbol, 'c': close_price,
+                                     'o': "9393.74000000", 'h': "9438.30000000", 'l': "9215.79000000",
+                                     'v': "47798.03832300", 'q': "446546826.58722200"}
+                                    for symbol, event_time, close_price in tickers]})
+
+    def test_ticker_changes(self):
+        for output in UnicornFy.OUTPUTS:
+            with self.subTest(output=output):
+                unicorn_fy = UnicornFy(output=output, ticker_changes=True)
+                tickers = unicorn_fy.binance_com_websocket(self.ticker_arr(("BTCUSDT", 1, "9342.70000000"),
+                                                                           ("ETHUSDT", 1, "229.47000000")))
+                tickers = tickers.to_dict() if output == "record" else tickers
+                self.assertEqual([data['symbol'] for data in tickers['data']], ["BTCUSDT", "ETHUSDT"])
+                tickers = unicorn_fy.binance_com_websocket(self.ticker_arr(("BTCUSDT", 2, "9342.70000000"),
+                                                                           ("ETHUSDT", 2, "230.00000000")))
+                tickers = tickers.to_dict() if output == "record" else tickers
+                self.assertEqual([data['close_price'] for data in tickers['data']], ["230.00000000"])
+                tickers = unicorn_fy.binance_com_websocket(self.ticker_arr(("BTCUSDT", 3, "9342.70000000")))
+                self.assertEqual(len(tickers.data if output == "record" else tickers['data']), 0)
+        tickers = UnicornFy.binance_com_websocket(self.ticker_arr(("BTCUSDT", 2, "9342.70000000")))
+        self.assertEqual(len(tickers['data']), 1)
+
+    def test_numeric_ticker_changes(self):
+        for numeric in UnicornFy.NUMERICS:
+            with self.subTest(numeric=numeric):
+                unicorn_fy = UnicornFy(numeric=numeric, ticker_changes=True)
+                tickers = unicorn_fy.binance_com_websocket(self.ticker_arr(("BTCUSDT", 1, "9342.70000000")))
+                self.assertEqual(len(tickers['data']), 1)
+                tickers = unicorn_fy.binance_com_websocket(self.ticker_arr(("BTCUSDT", 2, "9342.70000000")))
+                self.assertEqual(len(tickers['data']), 0)
+                tickers = unicorn_fy.binance_com_websocket(self.ticker_arr(("BTCUSDT", 3, "9342.80000000")))
+                self.assertEqual(str(tickers['data'][0]['close_price']), "9342.8" if numeric == "float"
+                                 else "9342.80000000")
+
+    def test_streams_compared_separately(self):
+        unicorn_fy = UnicornFy(ticker_changes=True)
+        ticker = json.loads(self.ticker_arr(("BTCUSDT", 1, "9342.70000000")))['data'][0]
+        self.assertEqual(len(unicorn_fy.binance_com_websocket(self.ticker_arr(("BTCUSDT", 1, "9342.70000000")))[
+            'data']), 1)
+        self.assertEqual([len(unicorn_fy.binance_com_websocket(json.dumps({'stream': "btcusdt@miniTicker",
+                                                                          'data': ticker}))['data'])
+                          for _ in range(2)], [1, 0])
+        self.assertEqual(len(unicorn_fy.ticker_fingerprints[("binance.com", None)]['24hrMiniTicker']), 2)
+        self.assertEqual(len(UnicornFy(ticker_changes=True).ticker_fingerprints), 0)
+        self.assertIsNone(UnicornFy.ticker_fingerprints)
+
+    def test_fields_compared_separately(self):
+        unicorn_fy = UnicornFy(ticker_changes=True)
+        fields = {'24hrMiniTicker': ['symbol', 'close_price']}
+        self.assertEqual(len(unicorn_fy.binance_com_websocket(self.ticker_arr(("BTCUSDT", 1, "9342.70000000")),
+                                                              fields=fields)['data']), 1)
+        # the projected table does not swallow the changes of the full one
+        tickers = unicorn_fy.binance_com_websocket(self.ticker_arr(("BTCUSDT", 1, "9342.70000000")))
+        self.assertEqual(list(tickers['data'][0])[:3], ['stream_type', 'event_type', 'event_time'])
+        self.assertEqual(len(unicorn_fy.binance_com_websocket(self.ticker_arr(("BTCUSDT", 2, "9342.70000000")),
+                                                              fields=fields)['data']), 0)
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestKlineStore(unittest.TestCase):
+    def kline(self, symbol, start_time, close_price, is_closed):
+        return UnicornFy.binance_com_websocket(json.dumps({
+            'stream': f"{symbol.lower()}@kline_1m",
+            'data': {'e': "kline", 'E': start_time + 1000, 's': symbol,
+                     'k': {'t': start_time, 'T': start_time + 59999, 's': symbol, 'i': "1m", 'f': 1, 'L': 2,
+                           'o': "10437.32000000", 'c': close_price, 'h': "10441.80000000", 'l': "10437.32000000",
+                           'v': "20.63957400", 'n': 183, 'x': is_closed, 'q': "215452.69236872",
+                           'V': "19.31210700", 'Q': "201593.99488069", 'B': "0"}}}))
+
+    def test_ring_buffer(self):
+        kline_store = UnicornFyKlineStore(capacity=3, max_series=1)
+        self.assertEqual(kline_store.update(self.kline("BTCUSDT", 0, "10438.00000000", False)), 0)
+        self.assertEqual(kline_store.get_forming("BTCUSDT", "1m")['close_price'], 10438.0)
+        self.assertEqual(kline_store.update(self.kline("BTCUSDT", 0, "10439.00000000", True)), 1)
+        self.assertIsNone(kline_store.get_forming("BTCUSDT", "1m"))
+        self.assertEqual(kline_store.update(self.kline("BTCUSDT", 0, "10440.00000000", True)), 0)
+        kline_store.update(self.kline("BTCUSDT", 60000, "10440.00000000", False))
+        # the final kline of the second candle is missing
+        self.assertEqual(kline_store.update(self.kline("BTCUSDT", 120000, "10441.00000000", True)), 2)
+        kline_store.update(self.kline("BTCUSDT", 180000, "10442.00000000", True))
+        candles = kline_store.get_last("BTCUSDT", "1m")
+        self.assertEqual(candles['kline_start_time'].tolist(), [60000, 120000, 180000])
+        self.assertEqual(candles['close_price'].tolist(), [10440.0, 10441.0, 10442.0])
+        self.assertEqual(kline_store.get_last("BTCUSDT", "1m", 2)['number_of_trades'].tolist(), [183, 183])
+        kline_store.update(self.kline("ETHUSDT", 0, "229.47000000", True))
+        self.assertIsNone(kline_store.get_last("BTCUSDT", "1m"))
+        self.assertEqual(kline_store.get_stats(), {'closed_candles': 5, 'evicted_series': 1, 'series': 1})
+
+
+class TestBarAggregator(unittest.TestCase):
+    def trade(self, trade_id, trade_time, price, quantity, is_market_maker=False):
+        return UnicornFy.binance_com_websocket(json.dumps({
+            'stream': "btcusdt@trade",
+            'data': {'e': "trade", 'E': trade_time, 's': "BTCUSDT", 't': trade_id, 'p': price, 'q': quantity,
+                     'b': 1, 'a': 2, 'T': trade_time, 'm': is_market_maker, 'M': True}}))
+
+    def test_bars(self):
+        bar_aggregator = UnicornFyBarAggregator(intervals=("1s", "1m"))
+        self.assertEqual(bar_aggregator.update(self.trade(1, 1000, "10.00000000", "1.00000000")), [])
+        self.assertEqual(bar_aggregator.update(self.trade(2, 1500, "12.00000000", "1.00000000", True)), [])
+        self.assertEqual(bar_aggregator.update(self.trade(3, 1900, "9.00000000", "2.00000000")), [])
+        closed_bars = bar_aggregator.update(self.trade(4, 2100, "11.00000000", "1.00000000"))
+        self.assertEqual(len(closed_bars), 1)
+        bar = closed_bars[0]
+        self.assertEqual((bar['event_type'], bar['stream_type']), ("kline", "btcusdt@bar_1s"))
+        self.assertEqual(bar['kline']['interval'], "1s")
+        self.assertEqual((bar['kline']['kline_start_time'], bar['kline']['kline_close_time']), (1000, 1999))
+        self.assertEqual((bar['kline']['open_price'], bar['kline']['high_price'], bar['kline']['low_price'],
+                          bar['kline']['close_price']), (10.0, 12.0, 9.0, 9.0))
+        self.assertEqual((bar['kline']['base_volume'], bar['kline']['quote'], bar['kline']['number_of_trades']),
+                         (4.0, 40.0, 3))
+        self.assertEqual(bar['kline']['volume_weighted_average_price'], 10.0)
+        self.assertEqual((bar['kline']['taker_by_base_asset_volume'], bar['kline']['first_trade_id'],
+                          bar['kline']['last_trade_id']), (3.0, 1, 3))
+        self.assertEqual(bar_aggregator.get_open_bar("BTCUSDT", "1m")['number_of_trades'], 4)
+        self.assertEqual(bar_aggregator.update(self.trade(5, 1999, "11.00000000", "1.00000000")), [])
+        self.assertEqual(bar_aggregator.get_open_bar("BTCUSDT", "1m")['number_of_trades'], 5)
+        closed_bars = bar_aggregator.flush(60000)
+        self.assertEqual([bar['kline']['interval'] for bar in closed_bars], ["1s", "1m"])
+        self.assertEqual(closed_bars[1]['kline']['number_of_trades'], 5)
+        self.assertEqual(bar_aggregator.get_stats(), {'trades': 5, 'late_trades': 1, 'closed_bars': 3})
+        with self.assertRaises(ValueError):
+            UnicornFyBarAggregator(intervals=("1x", ))
+
+    def test_agg_trades(self):
+        bar_aggregator = UnicornFyBarAggregator(intervals=("1s", ))
+        for first_trade_id, last_trade_id, trade_time in ((10, 14, 1000), (15, 15, 1500), (16, 18, 2000)):
+            closed_bars = bar_aggregator.update(UnicornFy.binance_com_websocket(json.dumps({
+                'stream': "btcusdt@aggTrade",
+                'data': {'e': "aggTrade", 'E': trade_time, 's': "BTCUSDT", 'a': 1, 'p': "10.00000000",
+                         'q': "1.00000000", 'f': first_trade_id, 'l': last_trade_id, 'T': trade_time, 'm': False,
+                         'M': True}})))
+        self.assertEqual(closed_bars[0]['kline']['number_of_trades'], 6)
+        self.assertEqual(bar_aggregator.get_open_bar("BTCUSDT", "1s")['number_of_trades'], 3)
+
+    def test_weeks_start_on_monday(self):
+        bar_aggregator = UnicornFyBarAggregator(intervals=("1w", ))
+        # sunday 2020-06-14 23:59:59 and monday 2020-06-15 00:00:00 UTC
+        bar_aggregator.update(self.trade(1, 1592179199000, "10.00000000", "1.00000000"))
+        closed_bars = bar_aggregator.update(self.trade(2, 1592179200000, "11.00000000", "1.00000000"))
+        self.assertEqual(closed_bars[0]['kline']['kline_start_time'], 1591574400000)
+        self.assertEqual(bar_aggregator.get_open_bar("BTCUSDT", "1w")['kline_start_time'], 1592179200000)
+
+    def test_trade_after_flush(self):
+        bar_aggregator = UnicornFyBarAggregator(intervals=("1s", "1m"))
+        bar_aggregator.update(self.trade(1, 1000, "10.00000000", "1.00000000"))
+        self.assertEqual(len(bar_aggregator.flush(2000)), 1)
+        self.assertEqual(bar_aggregator.update(self.trade(2, 1999, "11.00000000", "1.00000000")), [])
+        self.assertIsNone(bar_aggregator.get_open_bar("BTCUSDT", "1s"))
+        self.assertEqual(bar_aggregator.get_open_bar("BTCUSDT", "1m")['number_of_trades'], 2)
+        self.assertEqual(bar_aggregator.flush(2000), [])
+        self.assertEqual(bar_aggregator.get_stats()['late_trades'], 1)
+
+
+class TestPool(unittest.TestCase):
+    def test_pool(self):
+        messages = [json.dumps({'stream': f"{symbol.lower()}@trade",
+                                'data': {'e': "trade", 'E': trade_id, 's': symbol, 't': trade_id, 'p': "9302.00000000",
+                                         'q': "0.00101900", 'b': 1, 'a': 2, 'T': trade_id, 'm': False, 'M': True}},
+                               separators=(",", ":"))
+                    for trade_id in range(50) for symbol in ("BTCUSDT", "ETHUSDT", "BNBUSDT", "LTCUSDT")]
+        messages.append("{malformed")
+        with UnicornFyPool(processes=2, batch_size=16, unicorn_fy_options={'numeric': "float"}) as unicorn_fy_pool:
+            for index, message in enumerate(messages):
+                # memoryviews can not be pickled, the pool sends them as bytes
+                unicorn_fy_pool.put(memoryview(message.encode()) if index % 2 else message)
+            unicorn_fy_pool.flush()
+            unicorn_fied_data = []
+            while unicorn_fy_pool.get_pending_batches():
+                unicorn_fied_batch, errors = unicorn_fy_pool.get_batch(timeout=10)
+                unicorn_fied_data.extend(unicorn_fied_batch)
+        self.assertEqual(len(unicorn_fied_data), 200)
+        self.assertEqual(unicorn_fied_data[0]['price'], 9302.0)
+        for symbol in ("BTCUSDT", "ETHUSDT", "BNBUSDT", "LTCUSDT"):
+            trade_ids = [data['trade_id'] for data in unicorn_fied_data if data['symbol'] == symbol]
+            self.assertEqual(trade_ids, list(range(50)))
+        stats = unicorn_fy_pool.get_stats()
+        self.assertEqual(sum(worker_stats['messages'] for worker_stats in stats), 201)
+        self.assertTrue(all(worker_stats['messages'] for worker_stats in stats))
+        self.assertFalse(any(worker.is_alive() for worker in unicorn_fy_pool.workers))
+        with self.assertRaises(ValueError):
+            UnicornFyPool(processes=1, unicorn_fy_options={'output': "view"})
+
+    def test_dead_worker(self):
+        with UnicornFyPool(processes=2, batch_size=1) as unicorn_fy_pool:
+            self.assertEqual([unicorn_fy_pool.get_worker_id('{"result":null,"id":1}') for _ in range(3)], [0, 1, 0])
+            unicorn_fy_pool.workers[1].terminate()
+            unicorn_fy_pool.workers[1].join()
+            unicorn_fy_pool.put('{"result":null,"id":1}')
+            with self.assertRaises(RuntimeError):
+                unicorn_fy_pool.get_batch()
+        self.assertTrue(unicorn_fy_pool.is_closed)
+
+
+@unittest.skipIf(not hasattr(asyncio, "run"), "asyncio.run() requires python 3.7+")
+class TestAsync(unittest.TestCase):
+    def setUp(self):
+        self.trade = '{"stream":"btcusdt@trade","data":{"e":"trade","E":1592591955766,"s":"BTCUSDT","t":343719861,"p":"9302.00000000","q":"0.00101900","b":2517144287,"a":2517144235,"T":1592591955765,"m":false,"M":true}}'
+        self.ticker_arr = json.dumps({'stream': "!miniTicker@arr",
+                                      'data': [{'e': "24hrMiniTicker", 'E': 1592594715775, 's': f"SYMBOL{index}",
+                                                'c': "9342.70000000", 'o': "9393.74000000", 'h': "9438.30000000",
+                                                'l': "9215.79000000", 'v': "47798.03832300",
+                                                'q': "446546826.58722200"} for index in range(100)]})
+
+    def test_queue(self):
+        async def convert():
+            messages = asyncio.Queue()
+            for message in (self.trade, self.ticker_arr, self.trade.replace("btcusdt", "ethusdt"), None):
+                messages.put_nowait(message)
+            with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+                async_unicorn_fy = AsyncUnicornFy(executor=executor, offload_size=1000,
+                                                  sniffer=UnicornFySniffer(symbols=["BTCUSDT"]),
+                                                  unicorn_fy_options={'numeric': "float"})
+                return [data async for data in async_unicorn_fy.stream(messages)], async_unicorn_fy.get_stats()
+
+        unicorn_fied_data, stats = asyncio.run(convert())
+        self.assertEqual([data['event_type'] for data in unicorn_fied_data], ["trade", "24hrMiniTicker"])
+        self.assertEqual(unicorn_fied_data[0]['price'], 9302.0)
+        self.assertEqual(len(unicorn_fied_data[1]['data']), 100)
+        self.assertEqual(stats, {'inline': 1, 'offloaded': 1, 'dropped': 1})
+
+    def test_async_iterator(self):
+        async def messages():
+            for _ in range(3):
+                yield self.trade
+
+        async def convert():
+            return [data async for data in AsyncUnicornFy().stream(messages())]
+
+        self.assertEqual(len(asyncio.run(convert())), 3)
+
+    def test_own_instances(self):
+        async def convert(async_unicorn_fy, stream_data):
+            return await async_unicorn_fy.convert(stream_data)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            first, second = (AsyncUnicornFy(executor=executor, offload_size=1000,
+                                            unicorn_fy_options={'ticker_changes': True}) for _ in range(2))
+            self.assertIsNot(first.unicorn_fy, second.unicorn_fy)
+            self.assertEqual([len(asyncio.run(convert(second, stream_data))['data'])
+                              for stream_data in (self.ticker_arr, bytearray(self.ticker_arr.encode()),
+                                                  memoryview(self.ticker_arr.encode()))], [100, 0, 0])
+            self.assertEqual(len(asyncio.run(convert(first, self.ticker_arr))['data']), 100)
+            self.assertEqual(second.get_stats(), {'inline': 0, 'offloaded': 3, 'dropped': 0})
+        with concurrent.futures.ProcessPoolExecutor(max_workers=1) as executor:
+            with self.assertRaises(ValueError):
+                AsyncUnicornFy(executor=executor, unicorn_fy_options={'ticker_changes': True})
+
+
+def read_shared_ring_buffer(name, output_queue):
+    with UnicornFySharedRingBufferReader(name, from_start=True) as reader:
+        output_queue.put([record.to_dict() for record in reader.read()])
+
+
+class TestSharedRingBuffer(unittest.TestCase):
+    def setUp(self):
+        self.trade = '{"stream":"btcusdt@trade","data":{"e":"trade","E":1592591955766,"s":"BTCUSDT","t":343719861,"p":"9302.00000000","q":"0.00101900","b":2517144287,"a":2517144235,"T":1592591955765,"m":false,"M":true}}'
+        self.kline = '{"stream":"btcusdt@kline_1m","data":{"e":"kline","E":1601630228469,"s":"BTCUSDT","k":{"t":1601630220000,"T":1601630279999,"s":"BTCUSDT","i":"1m","f":427033476,"L":427033658,"o":"10437.32000000","c":"10441.80000000","h":"10441.80000000","l":"10437.32000000","v":"20.63957400","n":183,"x":false,"q":"215452.69236872","V":"19.31210700","Q":"201593.99488069","B":"0"}}}'
+
+    @unittest.skipIf(shared_memory is None, "multiprocessing.shared_memory is not available")
+    def test_other_process(self):
+        with UnicornFySharedRingBuffer(capacity=8) as ring_buffer:
+            self.assertTrue(ring_buffer.put(UnicornFy.binance_com_websocket(self.trade)))
+            self.assertTrue(ring_buffer.put(UnicornFy.binance_com_websocket(self.kline)))
+            self.assertFalse(ring_buffer.put({'event_type': "depthUpdate"}))
+            output_queue = multiprocessing.Queue()
+            reader_process = multiprocessing.Process(target=read_shared_ring_buffer,
+                                                     args=(ring_buffer.name, output_queue))
+            reader_process.start()
+            records = output_queue.get(timeout=10)
+            reader_process.join(10)
+        self.assertEqual(records[0]['symbol'], "BTCUSDT")
+        self.assertEqual((records[0]['price'], records[0]['trade_id']), (9302.0, 343719861))
+        self.assertEqual((records[1]['interval'], records[1]['number_of_trades']), ("1m", 183))
+        self.assertEqual(records[1]['close_price'], 10441.8)
+
+    @unittest.skipIf(shared_memory is None, "multiprocessing.shared_memory is not available")
+    def test_overrun(self):
+        with UnicornFySharedRingBuffer(capacity=4) as ring_buffer:
+            with UnicornFySharedRingBufferReader(ring_buffer.name) as reader:
+                trade = UnicornFy.binance_com_websocket(self.trade)
+                for trade_id in range(10):
+                    ring_buffer.put(dict(trade, trade_id=trade_id))
+                self.assertEqual(reader.get_lag(), 10)
+                self.assertEqual([record.trade_id for record in reader.read(max_records=2)], [6, 7])
+                self.assertEqual(reader.overruns, 6)
+                self.assertEqual([record.trade_id for record in reader.read()], [8, 9])
+                self.assertEqual(reader.read(), [])
+
+    @unittest.skipIf(shared_memory is None, "multiprocessing.shared_memory is not available")
+    def test_long_symbol(self):
+        with UnicornFySharedRingBuffer(capacity=4) as ring_buffer:
+            with UnicornFySharedRingBufferReader(ring_buffer.name) as reader:
+                trade = UnicornFy.binance_com_websocket(self.trade)
+                ring_buffer.put(trade)
+                with self.assertRaises(ValueError):
+                    ring_buffer.put(dict(trade, symbol="ABCDEFGHIJKLMNOPQ"))
+                self.assertEqual([record.symbol for record in reader.read()], ["BTCUSDT"])
+                self.assertEqual(reader.overruns, 0)
+
+
+class TestPipelineStage(unittest.TestCase):
+    def setUp(self):
+        self.trades = [json.dumps({'stream': "btcusdt@trade",
+                                   'data': {'e': "trade", 'E': trade_id, 's': "BTCUSDT", 't': trade_id,
+                                            'p': "9302.00000000", 'q': "0.00101900", 'b': 1, 'a': 2, 'T': trade_id,
+                                            'm': False, 'M': True}}) for trade_id in range(10)]
+
+    def test_micro_batches(self):
+        pipeline_stage = UnicornFyPipelineStage(max_batch_size=4, max_wait_us=1000)
+        for trade in self.trades:
+            pipeline_stage.put(trade)
+        self.assertEqual(pipeline_stage.get_queue_depth(), 10)
+        batch_sizes = [len(pipeline_stage.get_batch(timeout=1)[0]) for _ in range(3)]
+        self.assertEqual(batch_sizes, [4, 4, 2])
+        self.assertEqual(pipeline_stage.get_batch(timeout=0.01), ([], []))
+        stats = pipeline_stage.get_stats()
+        self.assertEqual((stats['batches'], stats['converted'], stats['max_queue_depth']), (3, 10, 10))
+
+    def test_max_wait_since_put(self):
+        pipeline_stage = UnicornFyPipelineStage(max_batch_size=4, max_wait_us=200000)
+        pipeline_stage.put(self.trades[0])
+        time.sleep(0.25)
+        # the message already waited longer than `max_wait_us` while nobody consumed
+        start_time = time.monotonic()
+        self.assertEqual(len(pipeline_stage.get_batch(timeout=1)[0]), 1)
+        self.assertLess(time.monotonic() - start_time, 0.1)
+
+    def test_overflow(self):
+        pipeline_stage = UnicornFyPipelineStage(max_queue_size=3, overflow="drop_oldest")
+        for trade in self.trades:
+            self.assertTrue(pipeline_stage.put(trade))
+        unicorn_fied_batch, errors = pipeline_stage.get_batch(timeout=1)
+        self.assertEqual([data['trade_id'] for data in unicorn_fied_batch], [7, 8, 9])
+        self.assertEqual(pipeline_stage.get_stats()['dropped'], 7)
+        overflows = []
+        pipeline_stage = UnicornFyPipelineStage(max_queue_size=3, overflow="callback", on_overflow=overflows.append)
+        for trade in self.trades:
+            pipeline_stage.put(trade)
+        self.assertEqual(overflows, self.trades[3:])
+        pipeline_stage = UnicornFyPipelineStage(max_queue_size=3, overflow="block")
+        for trade in self.trades[:3]:
+            pipeline_stage.put(trade)
+        self.assertFalse(pipeline_stage.put(self.trades[3], timeout=0.01))
+        self.assertEqual(pipeline_stage.get_stats()['blocked'], 1)
+
+    def test_handler_thread(self):
+        unicorn_fied_data = []
+        pipeline_stage = UnicornFyPipelineStage(handler=lambda batch, errors: unicorn_fied_data.extend(batch),
+                                                max_queue_size=2, max_batch_size=2, overflow="block")
+        pipeline_stage.start()
+        for trade in self.trades:
+            self.assertTrue(pipeline_stage.put(trade, timeout=10))
+        pipeline_stage.stop(timeout=10)
+        self.assertEqual([data['trade_id'] for data in unicorn_fied_data], list(range(10)))
+        self.assertFalse(pipeline_stage.put(self.trades[0]))
+        self.assertEqual((pipeline_stage.get_queue_depth(), pipeline_stage.get_stats()['dropped']), (0, 1))
+
+
+class TestConflationBuffer(unittest.TestCase):
+    def book_ticker(self, symbol, update_id):
+        return json.dumps({'stream': f"{symbol.lower()}@bookTicker",
+                           'data': {'u': update_id, 's': symbol, 'b': "9319.00000000", 'B': "1.00000000",
+                                    'a': "9320.50000000", 'A': "2.00000100"}}, separators=(",", ":"))
+
+    def test_conflation(self):
+        conflation_buffer = UnicornFyConflationBuffer()
+        for update_id in range(5):
+            self.assertTrue(conflation_buffer.put(self.book_ticker("BTCUSDT", update_id)))
+            self.assertTrue(conflation_buffer.put(self.book_ticker("ETHUSDT", update_id + 100)))
+        depth5 = UnicornFy.binance_com_websocket('{"stream":"btcusdt@depth5","data":{"lastUpdateId":1,"bids":[],"asks":[]}}')
+        self.assertTrue(conflation_buffer.put(depth5))
+        self.assertFalse(conflation_buffer.put('{"stream":"btcusdt@trade","data":{"e":"trade","s":"BTCUSDT"}}'))
+        self.assertEqual(len(conflation_buffer), 3)
+        unicorn_fied_data = conflation_buffer.get_all()
+        self.assertEqual([(data['event_type'], data['symbol']) for data in unicorn_fied_data],
+                         [("bookTicker", "BTCUSDT"), ("bookTicker", "ETHUSDT"), ("depth", "BTCUSDT")])
+        self.assertEqual([data.get('order_book_update_id') for data in unicorn_fied_data], [4, 104, None])
+        self.assertEqual(conflation_buffer.get_all(), [])
+        self.assertEqual(conflation_buffer.get_stats(), {'received': 11, 'conflated': 8, 'emitted': 3, 'errors': 0,
+                                                            'queued': 0})
+
+    def test_min_interval(self):
+        conflation_buffer = UnicornFyConflationBuffer(min_interval_ms=60000)
+        conflation_buffer.put(self.book_ticker("BTCUSDT", 1))
+        self.assertEqual(len(conflation_buffer.get_all()), 1)
+        conflation_buffer.put(self.book_ticker("BTCUSDT", 2))
+        conflation_buffer.put(self.book_ticker("ETHUSDT", 3))
+        self.assertEqual([data['symbol'] for data in conflation_buffer.get_all()], ["ETHUSDT"])
+        self.assertEqual(len(conflation_buffer), 1)
+
+    def test_raw_buffers(self):
+        conflation_buffer = UnicornFyConflationBuffer(min_interval_ms=20)
+        self.assertTrue(conflation_buffer.put(bytearray(self.book_ticker("BTCUSDT", 1).encode())))
+        self.assertTrue(conflation_buffer.put(memoryview(self.book_ticker("ETHUSDT", 2).encode())))
+        self.assertEqual([data['symbol'] for data in conflation_buffer.get_all()], ["BTCUSDT", "ETHUSDT"])
+        self.assertEqual(len(conflation_buffer.last_emit_times), 2)
+        time.sleep(0.03)
+        conflation_buffer.put(self.book_ticker("LTCUSDT", 3))
+        self.assertEqual(len(conflation_buffer.get_all()), 1)
+        # the emit times of the symbols without new events expired and got pruned
+        self.assertEqual(list(conflation_buffer.last_emit_times), [("bookTicker", "LTCUSDT")])
+
+    def test_wait_until_due(self):
+        conflation_buffer = UnicornFyConflationBuffer(min_interval_ms=50)
+        conflation_buffer.put(self.book_ticker("BTCUSDT", 1))
+        self.assertEqual(len(conflation_buffer.get_all()), 1)
+        conflation_buffer.put(self.book_ticker("BTCUSDT", 2))
+        start_time = time.monotonic()
+        self.assertEqual(conflation_buffer.get_all(timeout=0.01), [])
+        self.assertEqual([data['order_book_update_id'] for data in conflation_buffer.get_all(timeout=None)], [2])
+        self.assertGreater(time.monotonic() - start_time, 0.04)
+        threading.Timer(0.01, conflation_buffer.put, args=(self.book_ticker("ETHUSDT", 3), )).start()
+        conflation_buffer.put(self.book_ticker("BTCUSDT", 4))
+        start_time = time.monotonic()
+        self.assertEqual([data['symbol'] for data in conflation_buffer.get_all(timeout=None)], ["ETHUSDT"])
+        self.assertLess(time.monotonic() - start_time, 0.04)
+
+    def test_conversion_error(self):
+        conflation_buffer = UnicornFyConflationBuffer()
+        conflation_buffer.put(self.book_ticker("BTCUSDT", 1))
+        conflation_buffer.put('{"stream":"ethusdt@bookTicker","data":{"u":1}}')
+        conflation_buffer.put('{"stream":"bnbusdt@bookTicker","data":')
+        conflation_buffer.put(self.book_ticker("LTCUSDT", 2))
+        self.assertEqual([data['symbol'] for data in conflation_buffer.get_all()], ["BTCUSDT", "LTCUSDT"])
+        self.assertEqual(conflation_buffer.get_stats()['errors'], 2)
+
+
+class TestOrderBooks(unittest.TestCase):
+    def setUp(self):
+        self.snapshot = {'lastUpdateId': 100,
+                         'bids': [["9300.00", "1.0"], ["9299.50", "2.0"], ["9301.00", "0.5"]],
+                         'asks': [["9302.00", "1.5"], ["9303.00", "3.0"]]}
+
+    def depth_update(self, first_update_id, final_update_id, bids, asks):
+        return UnicornFy.binance_com_websocket(json.dumps({'stream': "btcusdt@depth",
+                                                           'data': {'e': "depthUpdate", 'E': 1, 's': "BTCUSDT",
+                                                                    'U': first_update_id, 'u': final_update_id,
+                                                                    'b': bids, 'a': asks}}))
+
+    def wait_for_snapshots(self, order_books):
+        while order_books.snapshots_in_flight:
+            time.sleep(0.001)
+
+    def test_snapshot_and_updates(self):
+        order_books = UnicornFyOrderBooks()
+        depth = UnicornFy.binance_com_websocket(json.dumps({'stream': "btcusdt@depth20", 'data': self.snapshot}))
+        order_book = order_books.update(depth)
+        self.assertEqual(order_book.get_best_bid(), ("9301.00", "0.5"))
+        self.assertEqual(order_book.get_best_ask(), ("9302.00", "1.5"))
+        order_books.update(self.depth_update(95, 99, [["9301.00", "0"]], []))
+        self.assertEqual(order_book.get_best_bid(), ("9301.00", "0.5"))
+        order_books.update(self.depth_update(99, 102, [["9301.00", "0"], ["9300.50", "4.0"]], [["9301.50", "0.1"]]))
+        self.assertEqual(order_book.get_top(2), {'bids': [("9300.50", "4.0"), ("9300.00", "1.0")],
+                                                 'asks': [("9301.50", "0.1"), ("9302.00", "1.5")]})
+        self.assertEqual(order_book.last_update_id, 102)
+        self.assertIs(order_books.get_order_book("BTCUSDT"), order_book)
+        # a partial depth event does not replace the levels of a synced book
+        order_books.update(UnicornFy.binance_com_websocket(json.dumps({'stream': "btcusdt@depth5",
+                                                                       'data': dict(self.snapshot, lastUpdateId=103,
+                                                                                    bids=[["9000.00", "1.0"]])})))
+        self.assertEqual(order_book.get_best_bid(), ("9300.50", "4.0"))
+        self.assertEqual(order_book.last_update_id, 102)
+
+    def test_partial_depth_with_snapshots(self):
+        order_books = UnicornFyOrderBooks(get_snapshot=lambda symbol: dict(self.snapshot, lastUpdateId=110))
+        depth = UnicornFy.binance_com_websocket(json.dumps({'stream': "btcusdt@depth20", 'data': self.snapshot}))
+        self.assertFalse(order_books.update(depth).is_synced)
+
+    def test_gap_and_resync(self):
+        snapshots = []
+
+        def get_snapshot(symbol):
+            snapshots.append(symbol)
+            return dict(self.snapshot, lastUpdateId=110)
+
+        order_books = UnicornFyOrderBooks(get_snapshot=get_snapshot, resync_interval=0.05)
+        order_book = order_books.update(self.depth_update(105, 108, [], []))
+        self.wait_for_snapshots(order_books)
+        self.assertEqual(snapshots, ["BTCUSDT"])
+        self.assertFalse(order_book.is_synced)
+        order_books.update(self.depth_update(111, 112, [["9301.00", "0"]], []))
+        self.assertTrue(order_book.is_synced)
+        self.assertEqual(order_book.get_best_bid(), ("9300.00", "1.0"))
+        order_books.update(self.depth_update(120, 121, [], []))
+        self.wait_for_snapshots(order_books)
+        self.assertEqual(snapshots, ["BTCUSDT", "BTCUSDT"])
+        self.assertFalse(order_book.is_synced)
+        # the failed resync backs off, the diffs get buffered meanwhile
+        order_books.update(self.depth_update(122, 123, [], []))
+        self.wait_for_snapshots(order_books)
+        self.assertEqual(snapshots, ["BTCUSDT", "BTCUSDT"])
+        self.assertEqual(len(order_books.buffers["BTCUSDT"]), 2)
+        time.sleep(0.06)
+        order_books.update(self.depth_update(124, 125, [], []))
+        self.wait_for_snapshots(order_books)
+        order_books.apply_snapshots()
+        self.assertEqual(snapshots, ["BTCUSDT", "BTCUSDT", "BTCUSDT"])
+        self.assertEqual(order_books.resync_failures["BTCUSDT"][0], 2)
+
+    def test_one_snapshot_in_flight(self):
+        snapshots = []
+        release = threading.Event()
+
+        def get_snapshot(symbol):
+            snapshots.append(symbol)
+            release.wait(5)
+            return dict(self.snapshot, lastUpdateId=110)
+
+        order_books = UnicornFyOrderBooks(get_snapshot=get_snapshot)
+        order_book = order_books.update(self.depth_update(105, 108, [], []))
+        # the diffs that arrive while the snapshot is downloaded get buffered without a further request
+        order_books.update(self.depth_update(109, 110, [], []))
+        order_books.update(self.depth_update(111, 112, [], []))
+        self.assertEqual(len(order_books.buffers["BTCUSDT"]), 3)
+        release.set()
+        self.wait_for_snapshots(order_books)
+        order_books.apply_snapshots()
+        self.assertEqual(snapshots, ["BTCUSDT"])
+        self.assertEqual(order_book.last_update_id, 112)
+
+
 class TestLiveBinanceCom(unittest.TestCase):
     def setUp(self):
         print("\n\rstarting live test binance.com")